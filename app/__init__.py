@@ -10,10 +10,22 @@ login_manager.login_message_category = 'info'
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    from app.user_cache import get_user_cache
+    cache = get_user_cache()
+    if cache is None:
+        return db.session.get(User, int(user_id))
+    return cache.load(int(user_id))
 
 def create_app(config_class=Config):
-    """Factory d'application Flask"""
+    """Factory d'application Flask
+
+    Aucun travail de schéma par défaut (voir SCHEMA_ON_STARTUP et
+    `flask db init-schema`) ; la durée de chaque étape est conservée dans
+    app.extensions['startup'].
+    """
+    from app.schema import StartupTimer, apply_startup_schema
+    timer = StartupTimer()
+    
     app = Flask(__name__)
     app.config.from_object(config_class)
     
@@ -22,11 +34,63 @@ def create_app(config_class=Config):
         os.makedirs(app.instance_path, exist_ok=True)
     except OSError:
         pass
+    timer.mark('config')
+    
+    # Profil du pool de connexions et mesure des emprunts (avant db.init_app)
+    from app.pool import init_pool_options
+    init_pool_options(app)
     
     # Initialisation des extensions
     db.init_app(app)
     login_manager.init_app(app)
     
+    # Compression des réponses : premier hook enregistré, donc exécuté après
+    # tous les autres after_request (en-têtes et corps définitifs)
+    from app.compression import init_compression
+    init_compression(app)
+    
+    # Profil de performance SQLite (optionnel)
+    from app.sqlite_tuning import init_sqlite_tuning
+    with app.app_context():
+        init_sqlite_tuning(app, db.engine)
+    
+    # Identifiant de requête (X-Request-ID) repris dans les journaux
+    from app.logging_setup import init_request_ids
+    init_request_ids(app)
+    
+    # Mesures par requête (optionnel) : Server-Timing, requêtes lentes, profilage
+    from app.instrumentation import init_instrumentation
+    with app.app_context():
+        init_instrumentation(app, db.engine)
+    
+    # Métriques Prometheus et sonde de santé de la base
+    from app.metrics import init_metrics, init_database_probe
+    with app.app_context():
+        init_metrics(app, db.engine)
+        init_database_probe(app, db.engine)
+    timer.mark('database')
+    
+    # Cache des utilisateurs chargés à chaque requête authentifiée
+    from app.user_cache import init_user_cache
+    init_user_cache(app)
+    
+    # Bus d'événements pour le flux SSE des tâches
+    from app.events import init_event_bus
+    init_event_bus(app)
+    
+    # Pool borné pour le hachage des mots de passe
+    from app.hashing import init_password_hasher
+    init_password_hasher(app)
+    
+    # Encodeur JSON rapide des listes de tâches (orjson si disponible)
+    from app.serialization import init_json_encoder
+    init_json_encoder(app)
+    
+    # Tâches de fond (rappels d'échéance, maintenance), démarrées par run.py ou `flask jobs worker`
+    from app.jobs import init_jobs
+    init_jobs(app)
+    timer.mark('extensions')
+    
     # Enregistrement des blueprints
     from app.routes import main_bp
     from app.auth import auth_bp
@@ -34,20 +98,21 @@ def create_app(config_class=Config):
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp, url_prefix='/auth')
     
-    # Création des tables avec gestion d'erreur
-    with app.app_context():
-        try:
-            db.create_all()
-            print(" Tables de base de données créées avec succès")
-        except Exception as e:
-            print(f" Erreur lors de la création des tables: {e}")
-            # Créer une base de données de secours
-            import sqlite3
-            backup_path = os.path.join(app.instance_path, 'backup_tasks.db')
-            conn = sqlite3.connect(backup_path)
-            conn.close()
-            app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{backup_path}'
-            db.create_all()
-            print("✅ Base de données de secours créée")
+    # Fichiers statiques fingerprintés (manifeste de `flask assets build`)
+    from app.assets import init_static_assets
+    init_static_assets(app)
+    
+    # Commandes CLI (flask tasks ..., flask db ..., flask assets ..., flask jobs ...)
+    from app.cli import tasks_cli, db_cli, assets_cli, jobs_cli
+    app.cli.add_command(tasks_cli)
+    app.cli.add_command(db_cli)
+    app.cli.add_command(assets_cli)
+    app.cli.add_command(jobs_cli)
+    timer.mark('blueprints')
+    
+    # Schéma : rien, vérification de la tête Alembic ou create_all (développement)
+    apply_startup_schema(app)
+    timer.mark('schema')
     
+    timer.finish(app)
     return app
\ No newline at end of file
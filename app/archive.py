@@ -0,0 +1,85 @@
+import logging
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, exists, insert, literal, select, union_all, update
+from app.models import db, ArchivedTask, Task, TaskStatus, User
+from app.revisions import bump_task_revision
+from app.jobs import job_handler, renew_current_lease
+
+logger = logging.getLogger(__name__)
+
+# Colonnes recopiées de `tasks` vers `archived_tasks`
+ARCHIVED_FIELDS = ['id', 'title', 'description', 'status', 'priority', 'due_date',
+                   'created_at', 'updated_at', 'revision', 'user_id']
+
+def archive_completed(cutoff, batch_size=1000, on_batch=None):
+    """Déplace vers archived_tasks les tâches terminées non modifiées depuis `cutoff`
+
+    Un lot par transaction (copie, suppression, révision des utilisateurs
+    concernés) : l'archivage peut être interrompu et repris à tout moment.
+    Les clients synchronisés des utilisateurs concernés rechargent leur liste
+    (tombstone_horizon), sans pierre tombale par tâche archivée. `tasks` est
+    en AUTOINCREMENT : l'identifiant d'une tâche archivée n'est jamais
+    réattribué. `on_batch` est appelé après chaque lot validé. Renvoie le
+    nombre de tâches archivées.
+    """
+    total = 0
+    while True:
+        # Parcours de l'index (status, updated_at)
+        rows = db.session.execute(
+            select(Task.id, Task.user_id)
+            .where(
+                Task.status == TaskStatus.COMPLETED,
+                Task.updated_at < cutoff,
+                # Identifiant réattribué avant le passage en AUTOINCREMENT : la
+                # tâche reste active plutôt que d'entrer en conflit
+                ~exists().where(ArchivedTask.id == Task.id)
+            )
+            .order_by(Task.updated_at)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return total
+
+        ids = [row.id for row in rows]
+        columns = [getattr(Task, field) for field in ARCHIVED_FIELDS]
+        db.session.execute(insert(ArchivedTask).from_select(
+            ARCHIVED_FIELDS + ['archived_at'],
+            select(*columns, literal(datetime.utcnow(), db.DateTime)).where(Task.id.in_(ids))
+        ))
+        db.session.execute(delete(Task).where(Task.id.in_(ids)), execution_options={'synchronize_session': False})
+        for user_id in sorted({row.user_id for row in rows}):
+            revision = bump_task_revision(user_id)
+            db.session.execute(
+                update(User).where(User.id == user_id).values(tombstone_horizon=revision),
+                execution_options={'synchronize_session': False}
+            )
+        db.session.commit()
+        if on_batch is not None:
+            on_batch()
+
+        total += len(rows)
+        if len(rows) < batch_size:
+            return total
+
+@job_handler('archive_tasks')
+def archive_tasks(state):
+    """Archive les tâches terminées depuis plus de ARCHIVE_AFTER_DAYS jours (None : jamais)"""
+    config = current_app.config
+    if config['ARCHIVE_AFTER_DAYS'] is None:
+        return
+    cutoff = datetime.utcnow() - timedelta(days=config['ARCHIVE_AFTER_DAYS'])
+    # Bail prolongé à chaque lot : un archivage long n'est pas repris par un autre processus
+    archived = archive_completed(cutoff, config['JOBS_BATCH_SIZE'], on_batch=renew_current_lease)
+    if archived:
+        logger.info('%d tâche(s) terminée(s) archivée(s)', archived)
+
+def with_archived(user_id, fields, status=None):
+    """Sous-requête UNION ALL des colonnes `fields` des tâches actives et archivées"""
+    selects = []
+    for model in (Task, ArchivedTask):
+        statement = select(*[getattr(model, field) for field in fields]).where(model.user_id == user_id)
+        if status is not None:
+            statement = statement.where(model.status == status)
+        selects.append(statement)
+    return union_all(*selects).subquery('all_tasks')
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+from flask import current_app, send_from_directory, url_for
+from app.compression import brotli, compress, negotiate
+
+MANIFEST_NAME = 'manifest.json'
+COMPRESSIBLE_EXTENSIONS = ('.js', '.css', '.svg', '.html', '.json', '.txt', '.map')
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+def build_assets(static_folder, dist='dist'):
+    """Copie les fichiers statiques sous un nom contenant leur empreinte
+
+    Écrit dans `static_folder/dist` chaque fichier en `nom.<sha256>.ext`,
+    ses variantes .gz et .br (si brotli est installé et qu'elles sont plus
+    petites) et un manifeste {chemin d'origine: chemin fingerprinté}.
+    """
+    output = os.path.join(static_folder, dist)
+    shutil.rmtree(output, ignore_errors=True)
+
+    manifest = {}
+    for root, dirs, files in os.walk(static_folder):
+        if root == static_folder and dist in dirs:
+            dirs.remove(dist)
+        for name in sorted(files):
+            source = os.path.join(root, name)
+            original = os.path.relpath(source, static_folder).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                data = f.read()
+
+            stem, ext = os.path.splitext(original)
+            hashed = f'{dist}/{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+            target = os.path.join(static_folder, *hashed.split('/'))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(data)
+
+            if ext in COMPRESSIBLE_EXTENSIONS:
+                encodings = ['gzip'] + (['br'] if brotli is not None else [])
+                for encoding in encodings:
+                    # Compression maximale : elle n'est payée qu'une fois, au build
+                    compressed = compress(data, encoding, gzip_level=9, brotli_quality=11)
+                    if len(compressed) < len(data):
+                        with open(target + SUFFIXES[encoding], 'wb') as f:
+                            f.write(compressed)
+            manifest[original] = hashed
+
+    os.makedirs(output, exist_ok=True)
+    with open(os.path.join(output, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+class StaticAssets:
+    """Résolution des noms fingerprintés et service des fichiers précompressés
+
+    Sans manifeste (build non lancé ou STATIC_FINGERPRINTS désactivé), les
+    templates pointent vers les fichiers d'origine, servis comme avant.
+    """
+
+    def __init__(self, static_folder, dist='dist', max_age=31536000):
+        self.static_folder = static_folder
+        self.dist = dist
+        self.max_age = max_age
+        self.manifest = {}
+        self.variants = {}
+
+    def load(self):
+        """(Re)lit le manifeste et recense les variantes compressées présentes"""
+        path = os.path.join(self.static_folder, self.dist, MANIFEST_NAME)
+        if not os.path.exists(path):
+            self.manifest, self.variants = {}, {}
+            return self.manifest
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        variants = {}
+        for hashed in manifest.values():
+            base = os.path.join(self.static_folder, *hashed.split('/'))
+            variants[hashed] = [
+                encoding for encoding in ('br', 'gzip')
+                if os.path.exists(base + SUFFIXES[encoding])
+            ]
+        self.manifest, self.variants = manifest, variants
+        return manifest
+
+    def url(self, filename):
+        return url_for('static', filename=self.manifest.get(filename, filename))
+
+    def serve(self, filename):
+        """Vue 'static' : un nom fingerprinté ne change jamais de contenu, d'où immutable"""
+        if filename not in self.variants:
+            return current_app.send_static_file(filename)
+
+        encodings = self.variants[filename]
+        encoding = negotiate(encodings) if encodings else None
+        response = send_from_directory(
+            self.static_folder,
+            filename + SUFFIXES[encoding] if encoding else filename,
+            mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if encodings:
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = f'public, max-age={self.max_age}, immutable'
+        return response
+
+def init_static_assets(app):
+    """Sert les fichiers fingerprintés du manifeste ; `asset_url()` dans les templates"""
+    assets = StaticAssets(
+        app.static_folder,
+        dist=app.config['STATIC_DIST_DIR'],
+        max_age=app.config['STATIC_IMMUTABLE_MAX_AGE']
+    )
+    if app.config.get('STATIC_FINGERPRINTS'):
+        assets.load()
+    app.view_functions['static'] = assets.serve
+    app.jinja_env.globals['asset_url'] = assets.url
+    app.extensions['static_assets'] = assets
+    return assets
@@ -1,10 +1,17 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, make_response
 from flask_login import login_user, logout_user, login_required, current_user
-from werkzeug.security import check_password_hash, generate_password_hash
 from app.models import db, User
+from app.hashing import get_password_hasher, HashingOverloaded
 
 auth_bp = Blueprint('auth', __name__)
 
+def overloaded(template):
+    """Réponse 503 lorsque le pool de hachage est saturé"""
+    flash('Service momentanément surchargé, veuillez réessayer.', 'warning')
+    response = make_response(render_template(template), 503)
+    response.headers['Retry-After'] = str(current_app.config['PASSWORD_HASH_RETRY_AFTER'])
+    return response
+
 @auth_bp.route('/login', methods=['GET', 'POST'])
 def login():
     """Page de connexion"""
@@ -17,8 +24,21 @@ def login():
         remember = bool(request.form.get('remember'))
         
         user = User.query.filter_by(username=username).first()
+        hasher = get_password_hasher()
+        
+        try:
+            valid = bool(user) and hasher.check(user.password_hash, password)
+        except HashingOverloaded:
+            return overloaded('login.html')
         
-        if user and check_password_hash(user.password_hash, password):
+        if valid:
+            # Mise à niveau des anciens hashs vers la méthode et le coût actuels
+            try:
+                if hasher.needs_rehash(user.password_hash):
+                    user.password_hash = hasher.hash(password)
+                    db.session.commit()
+            except HashingOverloaded:
+                pass  # reportée à la prochaine connexion
             login_user(user, remember=remember)
             next_page = request.args.get('next')
             flash('Connexion réussie!', 'success')
@@ -62,10 +82,15 @@ def register():
             return render_template('register.html')
         
         # Création utilisateur
+        try:
+            password_hash = get_password_hasher().hash(password)
+        except HashingOverloaded:
+            return overloaded('register.html')
+        
         user = User(
             username=username,
             email=email,
-            password_hash=generate_password_hash(password)
+            password_hash=password_hash
         )
         
         db.session.add(user)
@@ -0,0 +1,112 @@
+from datetime import datetime
+from sqlalchemy import insert, update, delete, select
+from app.models import db, Task
+from app.validation import task_values, TaskValidationError
+from app.revisions import bump_task_revision, record_deletions
+
+class BatchValidationError(ValueError):
+    """Lot rejeté ; `results` détaille l'erreur de chaque opération fautive"""
+
+    def __init__(self, results):
+        super().__init__('Lot invalide')
+        self.results = results
+
+def plan_batch(operations, user_id):
+    """Valide toutes les opérations avant toute écriture
+
+    Renvoie un plan {'create': [...], 'update': [...], 'delete': [...]} où chaque
+    entrée garde l'index de l'opération d'origine pour les résultats.
+    """
+    plan = {'create': [], 'update': [], 'delete': []}
+    errors = []
+
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            errors.append({'index': index, 'status': 400, 'error': 'Opération invalide'})
+            continue
+
+        op = operation.get('op')
+        task_id = operation.get('id')
+        try:
+            if op == 'create':
+                plan['create'].append((index, task_values(operation.get('data'))))
+            elif op in ('update', 'delete'):
+                # bool est une sous-classe d'int : `true` ne désigne pas la tâche 1
+                if isinstance(task_id, bool) or not isinstance(task_id, int):
+                    raise TaskValidationError('Identifiant de tâche requis')
+                if op == 'update':
+                    plan['update'].append((index, task_id, task_values(operation.get('data'), partial=True)))
+                else:
+                    plan['delete'].append((index, task_id))
+            else:
+                raise TaskValidationError('Opération inconnue')
+        except TaskValidationError as e:
+            errors.append({'index': index, 'status': 400, 'error': str(e)})
+
+    # Une tâche ne peut être ciblée qu'une fois par lot
+    targeted = [(index, task_id) for index, task_id, *_ in plan['update'] + plan['delete']]
+    seen = set()
+    for index, task_id in targeted:
+        if task_id in seen:
+            errors.append({'index': index, 'status': 400, 'error': 'Tâche ciblée plusieurs fois'})
+        seen.add(task_id)
+
+    # Vérifier l'appartenance de toutes les tâches ciblées en une requête
+    if seen:
+        owned = set(db.session.scalars(
+            select(Task.id).where(Task.user_id == user_id, Task.id.in_(seen))
+        ))
+        for index, task_id in targeted:
+            if task_id not in owned:
+                errors.append({'index': index, 'status': 404, 'error': 'Tâche non trouvée'})
+
+    if errors:
+        raise BatchValidationError(sorted(errors, key=lambda error: error['index']))
+
+    return plan
+
+def apply_batch(plan, user_id):
+    """Exécute un plan validé en une transaction et renvoie les résultats par opération"""
+    now = datetime.utcnow()
+    revision = bump_task_revision(user_id)
+    results = {}
+
+    if plan['create']:
+        rows = [dict(values, user_id=user_id, revision=revision) for _, values in plan['create']]
+        created_ids = db.session.scalars(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+        ).all()
+        for (index, _), task_id in zip(plan['create'], created_ids):
+            results[index] = {'index': index, 'status': 201, 'id': task_id}
+
+    if plan['update']:
+        # UPDATE groupés par clé primaire (un executemany par jeu de colonnes)
+        db.session.execute(
+            update(Task),
+            [dict(values, id=task_id, updated_at=now, revision=revision) for _, task_id, values in plan['update']]
+        )
+        for index, task_id, _ in plan['update']:
+            results[index] = {'index': index, 'status': 200, 'id': task_id}
+
+    if plan['delete']:
+        deleted_ids = [task_id for _, task_id in plan['delete']]
+        db.session.execute(
+            delete(Task).where(Task.user_id == user_id, Task.id.in_(deleted_ids)),
+            execution_options={'synchronize_session': False}
+        )
+        record_deletions(user_id, deleted_ids, revision)
+        for index, task_id in plan['delete']:
+            results[index] = {'index': index, 'status': 200, 'id': task_id, 'deleted': True}
+
+    db.session.commit()
+
+    # Relire en une requête les tâches créées ou modifiées pour la réponse
+    written = [result['id'] for result in results.values() if not result.get('deleted')]
+    if written:
+        tasks = Task.query.filter(Task.id.in_(written)).populate_existing().all()
+        by_id = {task.id: task.to_dict() for task in tasks}
+        for result in results.values():
+            if not result.get('deleted'):
+                result['task'] = by_id[result['id']]
+
+    return [results[index] for index in sorted(results)]
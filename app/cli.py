@@ -0,0 +1,136 @@
+import os
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.models import User
+from app.importer import IMPORT_FORMATS, decode_lines, detect_format, parse_records, import_tasks
+from app.stats import compare_stats, rebuild_stats
+from app.schema import init_schema, check_schema, migration_heads, upgrade_schema
+from app.assets import build_assets
+from app.jobs import enqueue
+from app.archive import archive_completed
+from app.models import db
+
+tasks_cli = AppGroup('tasks', help='Gestion des tâches en ligne de commande')
+db_cli = AppGroup('db', help='Schéma de la base de données')
+assets_cli = AppGroup('assets', help='Fichiers statiques')
+jobs_cli = AppGroup('jobs', help='Tâches de fond (rappels, maintenance)')
+
+@tasks_cli.command('import')
+@click.argument('source', type=click.File('rb'))
+@click.option('--user', 'username', required=True, help='Utilisateur propriétaire des tâches')
+@click.option('--format', 'import_format', type=click.Choice(IMPORT_FORMATS),
+              help='Format du fichier (déduit de l\'extension par défaut)')
+def import_command(source, username, import_format):
+    """Importe des tâches depuis un fichier NDJSON ou CSV ('-' pour stdin)"""
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        raise click.ClickException(f'Utilisateur inconnu: {username}')
+    
+    import_format = import_format or detect_format(source.name)
+    summary = import_tasks(
+        parse_records(decode_lines(source), import_format), user.id,
+        chunk_size=current_app.config['TASKS_IMPORT_CHUNK_SIZE']
+    )
+    
+    click.echo(f"✅ {summary['accepted']} tâche(s) importée(s), {summary['rejected']} rejetée(s)")
+    for error in summary['errors']:
+        click.echo(f"  ligne {error['line']}: {error['error']}", err=True)
+    if summary['errors_truncated']:
+        click.echo('  ... erreurs suivantes non affichées', err=True)
+    if 'aborted' in summary:
+        raise click.ClickException(f"import interrompu, {summary['aborted']['error']}")
+
+@tasks_cli.command('rebuild-stats')
+@click.option('--check', is_flag=True, help='Vérifier seulement, sans reconstruire')
+def rebuild_stats_command(check):
+    """Reconstruit les compteurs de statistiques et les compare à un GROUP BY complet"""
+    mismatches = compare_stats()
+    for (user_id, status, priority), (stored, actual) in sorted(mismatches.items()):
+        click.echo(f'  utilisateur {user_id}, {status or "?"}, priorité {priority}: '
+                   f'{stored} stocké(s), {actual} réel(s)', err=True)
+    
+    if check:
+        if mismatches:
+            raise click.ClickException(f'{len(mismatches)} compteur(s) incorrect(s)')
+        click.echo('✅ Compteurs cohérents')
+        return
+    
+    rows = rebuild_stats()
+    remaining = compare_stats()
+    if remaining:
+        raise click.ClickException(f'{len(remaining)} compteur(s) incorrect(s) après reconstruction')
+    click.echo(f'✅ {rows} compteur(s) reconstruit(s), {len(mismatches)} corrigé(s)')
+
+@tasks_cli.command('archive')
+@click.option('--days', type=int, help='Ancienneté minimale en jours (ARCHIVE_AFTER_DAYS par défaut)')
+@click.option('--batch-size', type=int, help='Tâches par transaction (JOBS_BATCH_SIZE par défaut)')
+def archive_command(days, batch_size):
+    """Déplace les tâches terminées anciennes vers la table d'archive"""
+    config = current_app.config
+    days = config['ARCHIVE_AFTER_DAYS'] if days is None else days
+    if days is None:
+        raise click.ClickException('Archivage désactivé (ARCHIVE_AFTER_DAYS) : préciser --days')
+    start = datetime.utcnow()
+    archived = archive_completed(start - timedelta(days=days), batch_size or config['JOBS_BATCH_SIZE'])
+    elapsed = (datetime.utcnow() - start).total_seconds()
+    click.echo(f'✅ {archived} tâche(s) terminée(s) archivée(s) en {elapsed:.1f}s')
+
+@db_cli.command('init-schema')
+def init_schema_command():
+    """Crée les tables manquantes et marque la base à la tête des migrations"""
+    init_schema()
+    click.echo(f"✅ Schéma créé (révision {', '.join(sorted(migration_heads()))})")
+
+@db_cli.command('upgrade')
+def upgrade_schema_command():
+    """Amène la base à la tête des migrations (à lancer avant chaque déploiement)"""
+    upgrade_schema()
+    click.echo(f"✅ Schéma à jour (révision {', '.join(sorted(migration_heads()))})")
+
+@db_cli.command('check')
+def check_schema_command():
+    """Vérifie que la base est à la tête des migrations Alembic"""
+    if not check_schema():
+        raise click.ClickException('Schéma non à jour')
+    click.echo('✅ Schéma à jour')
+
+@assets_cli.command('build')
+def build_assets_command():
+    """Fingerprinte et précompresse les fichiers statiques (relancer le serveur ensuite)"""
+    static_folder = current_app.static_folder
+    manifest = build_assets(static_folder, current_app.config['STATIC_DIST_DIR'])
+    for original, hashed in sorted(manifest.items()):
+        target = os.path.join(static_folder, *hashed.split('/'))
+        sizes = [f'{os.path.getsize(target)} o']
+        for suffix in ('.gz', '.br'):
+            if os.path.exists(target + suffix):
+                sizes.append(f'{suffix[1:]} {os.path.getsize(target + suffix)} o')
+        click.echo(f"  {original} -> {hashed} ({', '.join(sizes)})")
+    click.echo(f'✅ {len(manifest)} fichier(s) statique(s) construit(s)')
+
+@jobs_cli.command('worker')
+@click.option('--once', is_flag=True, help='Exécuter les tâches dues puis quitter')
+def jobs_worker_command(once):
+    """Exécute les tâches de fond (Ctrl-C pour arrêter)"""
+    runner = current_app.extensions['jobs']
+    if once:
+        click.echo(f'✅ {runner.run_pending()} tâche(s) de fond exécutée(s)')
+        return
+    click.echo(f'🔁 Tâches de fond, consultation toutes les {runner.poll_interval} s ({runner.owner})')
+    try:
+        runner.run_forever()
+    except KeyboardInterrupt:
+        runner.stop()
+
+@jobs_cli.command('enqueue')
+@click.argument('name')
+def jobs_enqueue_command(name):
+    """Planifie une exécution immédiate d'une tâche de fond (ex. vacuum)"""
+    try:
+        job = enqueue(name)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    db.session.commit()
+    click.echo(f'✅ Tâche de fond {name} planifiée (n° {job.id})')
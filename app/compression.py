@@ -0,0 +1,104 @@
+import gzip
+import threading
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle
+    brotli = None
+
+# Types compressibles : les images et archives sont déjà compressées
+DEFAULT_MIMETYPES = (
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript',
+    'application/javascript', 'application/json', 'application/x-ndjson', 'image/svg+xml',
+)
+
+def available_encodings():
+    """Encodages proposés, par ordre de préférence"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+def compress(data, encoding, gzip_level=6, brotli_quality=5):
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    # mtime=0 : même entrée, mêmes octets (ETag et fichiers précompressés stables)
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+def negotiate(encodings):
+    """Meilleur encodage accepté par le client parmi `encodings`, ou None (q=0 respecté)"""
+    return request.accept_encodings.best_match(encodings)
+
+class Compressor:
+    """Compression des réponses dynamiques dans un hook after_request
+
+    Ignore les réponses en flux (SSE, export), les fichiers envoyés tels quels
+    (send_file), les réponses déjà encodées, les types hors liste et les corps
+    plus petits que `min_size` octets.
+    """
+
+    def __init__(self, min_size=1024, mimetypes=DEFAULT_MIMETYPES, gzip_level=6, brotli_quality=5):
+        self.min_size = min_size
+        self.mimetypes = frozenset(mimetypes)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = available_encodings()
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._lock = threading.Lock()
+
+    def after_request(self, response):
+        if (response.status_code < 200 or response.status_code in (204, 206, 304)
+                or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in self.mimetypes):
+            return response
+
+        # La représentation dépend d'Accept-Encoding, même si ce client n'a rien demandé
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate(self.encodings)
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        compressed = compress(data, encoding, self.gzip_level, self.brotli_quality)
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        # Un ETag fort désigne des octets précis : la version compressée n'a plus
+        # que l'équivalence sémantique (If-None-Match compare en mode faible)
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+        with self._lock:
+            self.compressed += 1
+            self.bytes_in += len(data)
+            self.bytes_out += len(compressed)
+        return response
+
+    def stats(self):
+        with self._lock:
+            return {
+                'encodings': self.encodings,
+                'compressed': self.compressed,
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+            }
+
+def init_compression(app):
+    """Active la compression des réponses si COMPRESSION_ENABLED est vrai"""
+    if not app.config.get('COMPRESSION_ENABLED'):
+        app.extensions['compression'] = None
+        return None
+
+    mimetypes = app.config['COMPRESSION_MIMETYPES']
+    compressor = Compressor(
+        min_size=app.config['COMPRESSION_MIN_SIZE'],
+        mimetypes=DEFAULT_MIMETYPES if mimetypes is None else mimetypes,
+        gzip_level=app.config['COMPRESSION_GZIP_LEVEL'],
+        brotli_quality=app.config['COMPRESSION_BROTLI_QUALITY']
+    )
+    app.after_request(compressor.after_request)
+    app.extensions['compression'] = compressor
+    return compressor
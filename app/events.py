@@ -0,0 +1,141 @@
+import json
+import queue
+import threading
+import time
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+class StreamCapacityError(RuntimeError):
+    """Nombre maximal de flux SSE simultanés atteint"""
+
+class Subscription:
+    """Abonnement d'un client aux changements des tâches d'un utilisateur"""
+
+    def __init__(self, user_id, maxsize):
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def get(self, timeout):
+        """Prochain événement, ou None après `timeout` secondes (battement de cœur)"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class TaskEventBus:
+    """Bus publish/subscribe en mémoire, propre au processus
+
+    Les files par abonné sont bornées : un client lent perd des notifications
+    plutôt que de bloquer les écritures (chaque notification déclenche de
+    toute façon une synchronisation différentielle complète côté client).
+    """
+
+    def __init__(self, max_subscribers=8, queue_size=16):
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, user_id):
+        with self._lock:
+            if self.active() >= self.max_subscribers:
+                raise StreamCapacityError(self.max_subscribers)
+            subscription = Subscription(user_id, self.queue_size)
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def active(self):
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, user_id, payload):
+        """Diffuse un événement aux abonnés de l'utilisateur sans jamais bloquer"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+            self.published += 1
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(payload)
+            except queue.Full:
+                subscription.dropped += 1
+                with self._lock:
+                    self.dropped += 1
+
+def init_event_bus(app):
+    """Crée le bus d'événements de l'application"""
+    bus = TaskEventBus(
+        max_subscribers=app.config['SSE_MAX_STREAMS'],
+        queue_size=app.config['SSE_QUEUE_SIZE']
+    )
+    app.extensions['task_events'] = bus
+    return bus
+
+def get_event_bus():
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('task_events')
+
+def sse_message(payload, event_name='tasks'):
+    """Formate un événement Server-Sent Events"""
+    return f"id: {payload['revision']}\nevent: {event_name}\ndata: {json.dumps(payload)}\n\n"
+
+def event_stream(bus, subscription, current_revision, last_event_id, heartbeat, timeout, retry_ms,
+                 poll=None, poll_interval=None):
+    """Générateur SSE : rattrapage, événements, battements de cœur
+
+    Le flux se termine après `timeout` secondes ; EventSource se reconnecte
+    seul (avec Last-Event-ID), ce qui libère régulièrement le thread Waitress.
+    Avec `poll` (plusieurs processus), la révision est aussi relue toutes les
+    `poll_interval` secondes pour les écritures des autres processus.
+    """
+    try:
+        yield f'retry: {retry_ms}\n\n'
+        # Changements survenus pendant la reconnexion
+        if last_event_id is not None and current_revision > last_event_id:
+            yield sse_message({'revision': current_revision})
+
+        revision = current_revision
+        wait = heartbeat if poll is None else min(heartbeat, poll_interval)
+        deadline = time.monotonic() + timeout
+        next_heartbeat = time.monotonic() + heartbeat
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            payload = subscription.get(min(wait, remaining))
+            if payload is None and poll is not None:
+                latest = poll()
+                if latest > revision:
+                    payload = {'revision': latest}
+            if payload is not None:
+                revision = max(revision, payload['revision'])
+                yield sse_message(payload)
+            elif time.monotonic() >= next_heartbeat:
+                next_heartbeat = time.monotonic() + heartbeat
+                yield ': heartbeat\n\n'
+    finally:
+        bus.unsubscribe(subscription)
+
+@event.listens_for(Session, 'after_commit')
+def publish_task_revisions(session):
+    """Publie les révisions de tâches une fois la transaction validée"""
+    revisions = session.info.pop('task_revisions', None)
+    bus = get_event_bus()
+    if revisions and bus is not None:
+        for user_id, revision in revisions.items():
+            bus.publish(user_id, {'revision': revision})
+
+@event.listens_for(Session, 'after_rollback')
+def discard_task_revisions(session):
+    session.info.pop('task_revisions', None)
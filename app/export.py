@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+import zlib
+from sqlalchemy import select
+from app.models import db, Task
+from app.serialization import TASK_FIELDS, TASK_COLUMNS, row_to_dict
+from app.archive import with_archived
+
+def export_query(user_id, status=None, batch_size=1000, include_archived=False):
+    """Colonnes exportées des tâches d'un utilisateur, lues par lots via un curseur côté serveur
+
+    Sélectionne des tuples plutôt que des objets Task : pas d'hydratation ORM
+    ni d'identity map pour des centaines de milliers de lignes.
+    """
+    if include_archived:
+        rows = with_archived(user_id, TASK_FIELDS, status)
+        statement = select(*[rows.c[field] for field in TASK_FIELDS]).order_by(rows.c.id)
+    else:
+        statement = select(*TASK_COLUMNS).where(Task.user_id == user_id)
+        if status is not None:
+            statement = statement.where(Task.status == status)
+        statement = statement.order_by(Task.id)
+    statement = statement.execution_options(yield_per=batch_size)
+    return db.session.execute(statement)
+
+def _batched(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row_to_dict(row))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def ndjson_chunks(rows, batch_size=1000):
+    """Une ligne JSON par tâche, émise par blocs de `batch_size` lignes"""
+    for batch in _batched(rows, batch_size):
+        yield ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in batch).encode('utf-8')
+
+def csv_chunks(rows, batch_size=1000):
+    """CSV avec en-tête, émis par blocs de `batch_size` lignes"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=TASK_FIELDS)
+    writer.writeheader()
+    yield buffer.getvalue().encode('utf-8')
+    for batch in _batched(rows, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+
+def gzip_chunks(chunks, level=6):
+    """Compresse un flux de blocs au format gzip sans le matérialiser"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+EXPORT_FORMATS = {
+    'ndjson': (ndjson_chunks, 'application/x-ndjson', 'ndjson'),
+    'csv': (csv_chunks, 'text/csv', 'csv'),
+}
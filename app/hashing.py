@@ -0,0 +1,100 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+class HashingOverloaded(RuntimeError):
+    """File d'attente du hachage pleine (ou délai dépassé) : répondre 503"""
+
+class PasswordHasher:
+    """Hachage des mots de passe dans un pool de threads borné
+
+    Le calcul (scrypt/pbkdf2, qui libèrent le GIL) tourne dans `workers`
+    threads dédiés ; au plus `max_pending` demandes attendent en plus. Au-delà,
+    HashingOverloaded est levée immédiatement plutôt que d'immobiliser tous
+    les threads Waitress derrière une rafale de connexions.
+    Avec workers=0, le hachage s'exécute dans le thread de la requête.
+    """
+
+    def __init__(self, method='scrypt', workers=2, max_pending=4, timeout=10.0):
+        self.method = method
+        self.timeout = timeout
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        if workers > 0:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._lock = threading.Lock()
+        self._method_prefix = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _run(self, func, *args):
+        if self._executor is None:
+            return func(*args)
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingOverloaded('file de hachage pleine')
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Le calcul se poursuit et libérera sa place en terminant
+            with self._lock:
+                self.timeouts += 1
+            raise HashingOverloaded('délai de hachage dépassé')
+
+    def _done(self, future):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+        self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def check(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """Vrai si le hash n'utilise pas la méthode et le coût configurés"""
+        if self._method_prefix is None:
+            # Forme normalisée par Werkzeug (ex. 'scrypt' -> 'scrypt:32768:8:1')
+            self._method_prefix = self.hash('').split('$', 1)[0]
+        return pwhash.split('$', 1)[0] != self._method_prefix
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'in_flight': self.in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts
+            }
+
+def init_password_hasher(app):
+    """Crée le pool de hachage de l'application"""
+    hasher = PasswordHasher(
+        method=app.config['PASSWORD_HASH_METHOD'],
+        workers=app.config['PASSWORD_HASH_WORKERS'],
+        max_pending=app.config['PASSWORD_HASH_MAX_PENDING'],
+        timeout=app.config['PASSWORD_HASH_TIMEOUT']
+    )
+    app.extensions['password_hasher'] = hasher
+    return hasher
+
+def get_password_hasher():
+    return current_app.extensions['password_hasher']
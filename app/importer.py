@@ -0,0 +1,127 @@
+import csv
+import json
+from sqlalchemy import insert
+from app.models import db, Task
+from app.validation import task_values, TaskValidationError
+from app.revisions import bump_task_revision
+
+IMPORT_FORMATS = ('ndjson', 'csv')
+
+class ImportAborted(ValueError):
+    """Erreur qui arrête l'import à la ligne `line` (fichier illisible au-delà)"""
+
+    def __init__(self, line, message):
+        super().__init__(message)
+        self.line = line
+
+class ImportEncodingError(ImportAborted):
+    """Ligne du fichier qui n'est pas de l'UTF-8 valide"""
+
+    def __init__(self, line):
+        super().__init__(line, f'Encodage invalide à la ligne {line} (UTF-8 attendu)')
+
+def detect_format(filename, default='ndjson'):
+    """Déduit le format d'import de l'extension du fichier"""
+    if filename and filename.lower().endswith('.csv'):
+        return 'csv'
+    if filename and filename.lower().endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    return default
+
+def decode_lines(stream, encoding='utf-8'):
+    """Lignes d'un flux binaire décodées une à une
+
+    Lève ImportEncodingError avec le numéro exact de la ligne fautive (un
+    TextIOWrapper décode par blocs et ne le connaît pas).
+    """
+    for line_number, raw in enumerate(stream, start=1):
+        try:
+            yield raw.decode(encoding)
+        except UnicodeDecodeError:
+            raise ImportEncodingError(line_number)
+
+def ndjson_records(lines):
+    """(numéro de ligne, enregistrement ou exception) pour chaque ligne non vide"""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, TaskValidationError('JSON invalide')
+
+def csv_records(lines):
+    """(numéro de ligne, enregistrement) pour chaque ligne CSV ; l'en-tête nomme les champs
+
+    Une erreur du lecteur CSV (champ au-delà de csv.field_size_limit(),
+    guillemets incohérents) lève ImportAborted : la suite ne peut plus être
+    découpée en lignes de façon fiable.
+    """
+    reader = csv.DictReader(lines)
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # DictReader.line_num n'avance qu'après une ligne lue sans erreur
+            line = reader.reader.line_num
+            raise ImportAborted(line, f'CSV invalide à la ligne {line} ({e})')
+        # Les cellules vides valent « champ absent », la priorité est numérique
+        record = {key: value for key, value in row.items() if key and value not in (None, '')}
+        if 'priority' in record:
+            try:
+                record['priority'] = int(record['priority'])
+            except ValueError:
+                yield reader.line_num, TaskValidationError('Priorité invalide')
+                continue
+        yield reader.line_num, record
+
+def parse_records(lines, import_format):
+    if import_format == 'csv':
+        return csv_records(lines)
+    return ndjson_records(lines)
+
+def import_tasks(records, user_id, chunk_size=1000, max_errors=100):
+    """Valide et insère les enregistrements par lots, un commit par lot
+
+    Les lignes invalides sont écartées et signalées avec leur numéro ; les
+    lignes valides sont insérées par executemany. Renvoie un résumé. Une
+    erreur de lecture du fichier (ImportAborted : encodage, CSV illisible)
+    arrête l'import : les lignes valides qui la précèdent sont importées,
+    rien au-delà, et le résumé porte 'aborted': {'line': ..., 'error': ...}.
+    """
+    summary = {'accepted': 0, 'rejected': 0, 'errors': [], 'errors_truncated': False}
+    chunk = []
+
+    def flush():
+        revision = bump_task_revision(user_id)
+        db.session.execute(insert(Task), [dict(values, revision=revision) for values in chunk])
+        db.session.commit()
+        summary['accepted'] += len(chunk)
+        chunk.clear()
+
+    try:
+        for line_number, record in records:
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                values = task_values(record)
+            except TaskValidationError as e:
+                summary['rejected'] += 1
+                if len(summary['errors']) < max_errors:
+                    summary['errors'].append({'line': line_number, 'error': str(e)})
+                else:
+                    summary['errors_truncated'] = True
+                continue
+
+            values['user_id'] = user_id
+            chunk.append(values)
+            if len(chunk) >= chunk_size:
+                flush()
+    except ImportAborted as e:
+        summary['aborted'] = {'line': e.line, 'error': str(e)}
+
+    if chunk:
+        flush()
+    return summary
@@ -0,0 +1,184 @@
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from flask import g, request, has_request_context, template_rendered, before_render_template
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Requêtes SQL conservées par requête HTTP pour le journal des requêtes lentes
+MAX_LOGGED_QUERIES = 50
+
+class RequestTiming:
+    """Mesures d'une requête HTTP : SQL, sérialisation, rendu Jinja"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.queries = []
+        self.sections = {}
+
+    def add_query(self, statement, duration):
+        self.sql_count += 1
+        self.sql_time += duration
+        if len(self.queries) < MAX_LOGGED_QUERIES:
+            self.queries.append((statement, duration))
+
+    def add_section(self, name, duration):
+        self.sections[name] = self.sections.get(name, 0.0) + duration
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def server_timing(self, total):
+        """Valeur de l'en-tête Server-Timing (durées en millisecondes)"""
+        metrics = [
+            f'app;dur={total * 1000:.1f}',
+            f'db;dur={self.sql_time * 1000:.1f};desc="{self.sql_count} SQL"',
+        ]
+        metrics += [f'{name};dur={duration * 1000:.1f}' for name, duration in self.sections.items()]
+        return ', '.join(metrics)
+
+class Instrumentation:
+    """Temps par endpoint, journal des requêtes lentes et profilage échantillonné"""
+
+    def __init__(self, slow_threshold_ms=500, profile_rate=0.0, profile_dir=None):
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.profile_rate = profile_rate
+        self.profile_dir = profile_dir
+        self._lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, endpoint, total):
+        """Cumule nombre d'appels, temps total et maximal par endpoint"""
+        with self._lock:
+            count, total_time, max_time = self.endpoints.get(endpoint, (0, 0.0, 0.0))
+            self.endpoints[endpoint] = (count + 1, total_time + total, max(max_time, total))
+
+    def stats(self):
+        with self._lock:
+            return {
+                endpoint: {'count': count, 'total_ms': round(total * 1000, 1), 'max_ms': round(longest * 1000, 1)}
+                for endpoint, (count, total, longest) in self.endpoints.items()
+            }
+
+    def before_request(self):
+        g.request_timing = RequestTiming()
+        if self.profile_rate and random.random() < self.profile_rate:
+            import cProfile
+            g.request_profiler = cProfile.Profile()
+            g.request_profiler.enable()
+
+    def after_request(self, response):
+        timing = g.pop('request_timing', None)
+        if timing is None:
+            return response
+        profiler = g.pop('request_profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            self.dump_profile(profiler)
+
+        total = timing.elapsed()
+        endpoint = request.endpoint or 'unknown'
+        self.record(endpoint, total)
+        response.headers['Server-Timing'] = timing.server_timing(total)
+
+        if total >= self.slow_threshold:
+            queries = '\n'.join(f'  {duration * 1000:8.1f} ms  {statement}' for statement, duration in timing.queries)
+            logger.warning(
+                'Requête lente %s %s (%s): %.1f ms, %d requêtes SQL en %.1f ms\n%s',
+                request.method, request.path, endpoint, total * 1000,
+                timing.sql_count, timing.sql_time * 1000, queries
+            )
+        return response
+
+    def dump_profile(self, profiler):
+        """Écrit le profil cProfile de la requête dans un fichier .pstats"""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        name = f"{request.endpoint or 'unknown'}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{threading.get_ident()}.pstats"
+        path = os.path.join(self.profile_dir, name)
+        profiler.dump_stats(path)
+        logger.info('Profil écrit: %s', path)
+
+def current_timing():
+    if not has_request_context():
+        return None
+    return g.get('request_timing')
+
+@contextmanager
+def timed(section):
+    """Mesure un bloc (ex. sérialisation) pour l'en-tête Server-Timing ; sans effet si inactif"""
+    timing = current_timing()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add_section(section, time.perf_counter() - start)
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Provider JSON de Flask dont l'encodage compte dans la section « serialize »"""
+
+    def dumps(self, obj, **kwargs):
+        with timed('serialize'):
+            return super().dumps(obj, **kwargs)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info['query_start'].pop()
+    timing = current_timing()
+    if timing is not None:
+        timing.add_query(statement, time.perf_counter() - start)
+
+def _handle_error(context):
+    # after_cursor_execute n'est pas appelé en cas d'erreur
+    if context.connection is not None and context.connection.info.get('query_start'):
+        context.connection.info['query_start'].pop()
+
+def _before_render(sender, template, context, **extra):
+    if current_timing() is not None:
+        g.render_start = time.perf_counter()
+
+def _after_render(sender, template, context, **extra):
+    timing = current_timing()
+    start = g.pop('render_start', None)
+    if timing is not None and start is not None:
+        timing.add_section('render', time.perf_counter() - start)
+
+def init_instrumentation(app, engine):
+    """Active l'instrumentation des requêtes si INSTRUMENTATION_ENABLED est vrai
+
+    Ajoute l'en-tête Server-Timing (app, db, serialize, render), journalise
+    les requêtes plus lentes que SLOW_REQUEST_THRESHOLD_MS avec leurs requêtes
+    SQL, et profile une fraction PROFILE_SAMPLE_RATE des requêtes.
+    """
+    if not app.config.get('INSTRUMENTATION_ENABLED'):
+        app.extensions['instrumentation'] = None
+        return None
+
+    instrumentation = Instrumentation(
+        slow_threshold_ms=app.config['SLOW_REQUEST_THRESHOLD_MS'],
+        profile_rate=app.config['PROFILE_SAMPLE_RATE'],
+        profile_dir=app.config.get('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+    )
+    app.before_request(instrumentation.before_request)
+    app.after_request(instrumentation.after_request)
+    app.json = TimedJSONProvider(app)
+
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+
+    app.extensions['instrumentation'] = instrumentation
+    return instrumentation
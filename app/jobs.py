@@ -0,0 +1,400 @@
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app, g
+from sqlalchemy import and_, delete, insert, or_, select, text, update
+from sqlalchemy.exc import IntegrityError
+from app.models import db, Job, Task, TaskReminder, TaskStatus, TaskTombstone, User
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+# Délai maximal entre deux tentatives d'une tâche en échec (secondes)
+MAX_RETRY_DELAY = 3600
+
+def job_handler(name):
+    """Déclare la fonction exécutée pour les tâches de fond `name`
+
+    Elle reçoit l'état (dict) de la tâche, dans un contexte d'application, et
+    peut renvoyer un nouvel état, conservé pour l'exécution suivante.
+    """
+    def register(function):
+        HANDLERS[name] = function
+        return function
+    return register
+
+def enqueue(name, payload=None, run_at=None):
+    """Planifie une exécution ponctuelle (dans la transaction en cours)"""
+    if name not in HANDLERS:
+        raise ValueError(f'Tâche de fond inconnue: {name}')
+    job = Job(name=name, payload=json.dumps(payload or {}), run_at=run_at or datetime.utcnow(),
+              max_attempts=current_app.config['JOBS_MAX_ATTEMPTS'])
+    db.session.add(job)
+    db.session.flush()
+    return job
+
+def schedule_periodic(schedule):
+    """Crée ou met à jour les tâches périodiques {nom: intervalle en secondes}
+
+    Un intervalle nul ou None supprime la tâche. L'état et la prochaine
+    échéance d'une tâche existante sont conservés ; plusieurs processus
+    peuvent appeler cette fonction en même temps.
+    """
+    for name, interval in schedule.items():
+        if name not in HANDLERS:
+            raise ValueError(f'Tâche de fond inconnue: {name}')
+        if not interval:
+            db.session.execute(delete(Job).where(Job.key == name))
+            continue
+        updated = db.session.execute(
+            update(Job).where(Job.key == name).values(interval=interval),
+            execution_options={'synchronize_session': False}
+        ).rowcount
+        if updated:
+            continue
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(Job).values(
+                    name=name, key=name, payload='{}', interval=interval, status='pending',
+                    run_at=datetime.utcnow(), attempts=0, max_attempts=current_app.config['JOBS_MAX_ATTEMPTS']
+                ))
+        except IntegrityError:
+            pass  # créée entre-temps par un autre processus
+    db.session.commit()
+
+class LeaseLost(RuntimeError):
+    """Bail repris par un autre processus pendant l'exécution (expiré entre-temps)"""
+
+def renew_current_lease():
+    """Prolonge le bail de la tâche de fond en cours d'exécution (sans effet ailleurs)
+
+    À appeler entre deux lots d'une exécution longue : le bail ne doit plus
+    alors dépasser que la durée d'un lot. Lève LeaseLost si la tâche a déjà
+    été reprise par un autre processus.
+    """
+    current = g.get('job_lease')
+    if current is not None:
+        runner, job = current
+        runner.renew_lease(job)
+
+class JobRunner:
+    """Exécute les tâches de fond dues, dans un thread ou au premier plan
+
+    Chaque tâche est réservée par un UPDATE atomique qui pose un bail de
+    `lease_seconds` : deux processus (workers run.py, `flask jobs worker`) ne
+    réservent jamais la même tâche. Un bail expiré (processus arrêté pendant
+    l'exécution) rend la tâche disponible et compte une tentative, jusqu'à
+    max_attempts : au-delà, elle est traitée comme un échec (processus tué à
+    chaque tentative). Le bail doit donc dépasser la plus longue exécution,
+    ou l'intervalle entre deux appels à renew_current_lease. Un échec est
+    retenté après JOBS_RETRY_BACKOFF secondes, doublées à chaque tentative.
+    """
+
+    def __init__(self, app, owner=None):
+        self.app = app
+        self.owner = owner or f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self.poll_interval = app.config['JOBS_POLL_INTERVAL']
+        self.lease_seconds = app.config['JOBS_LEASE_SECONDS']
+        self.retry_backoff = app.config['JOBS_RETRY_BACKOFF']
+        self.succeeded = 0
+        self.failed = 0
+        self._scheduled = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def claim(self, now=None):
+        """Réserve la tâche due la plus ancienne ; None s'il n'y en a pas"""
+        now = now or datetime.utcnow()
+        self._abandon_expired(now)
+        available = (
+            Job.status.in_(('pending', 'running')),
+            Job.run_at <= now,
+            or_(Job.lease_expires_at.is_(None), Job.lease_expires_at < now),
+            # Bail expiré à la dernière tentative : voir _abandon_expired
+            or_(Job.status == 'pending', Job.attempts < Job.max_attempts),
+        )
+        due = select(Job.id).where(*available).order_by(Job.run_at, Job.id).limit(1).scalar_subquery()
+        # Conditions répétées : sans effet si un autre processus a pris la tâche entre-temps
+        job = db.session.execute(
+            update(Job).where(Job.id == due, *available)
+            .values(status='running', lease_owner=self.owner, attempts=Job.attempts + 1,
+                    lease_expires_at=now + timedelta(seconds=self.lease_seconds))
+            .returning(Job.id, Job.name, Job.payload, Job.interval, Job.attempts, Job.max_attempts),
+            execution_options={'synchronize_session': False}
+        ).one_or_none()
+        db.session.commit()
+        return job
+
+    def _abandon_expired(self, now):
+        """Traite comme un échec les tâches dont le bail a expiré à la dernière tentative"""
+        expired = db.session.execute(
+            select(Job.id, Job.name, Job.interval, Job.attempts, Job.max_attempts, Job.lease_owner)
+            .where(Job.status == 'running', Job.lease_expires_at < now, Job.attempts >= Job.max_attempts)
+        ).all()
+        for job in expired:
+            logger.error('Tâche de fond %s (%s) abandonnée : bail expiré à la tentative %s/%s',
+                         job.name, job.id, job.attempts, job.max_attempts)
+            error = LeaseLost(f'bail de {job.lease_owner} expiré')
+            db.session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.lease_owner == job.lease_owner, Job.lease_expires_at < now)
+                .values(lease_owner=None, lease_expires_at=None, **self._failure_values(job, error)),
+                execution_options={'synchronize_session': False}
+            )
+        if expired:
+            db.session.commit()
+
+    def renew_lease(self, job):
+        """Repousse l'expiration du bail de `job` ; lève LeaseLost s'il a été repris"""
+        renewed = db.session.execute(
+            update(Job).where(Job.id == job.id, Job.lease_owner == self.owner)
+            .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds)),
+            execution_options={'synchronize_session': False}
+        ).rowcount
+        db.session.commit()
+        if not renewed:
+            raise LeaseLost(f'Tâche de fond {job.name} ({job.id}) reprise par un autre processus')
+
+    def execute(self, job):
+        """Exécute une tâche réservée puis la replanifie, la supprime ou la marque en échec"""
+        state = json.loads(job.payload)
+        g.job_lease = (self, job)
+        try:
+            handler = HANDLERS.get(job.name)
+            if handler is None:
+                raise LookupError(f'Tâche de fond inconnue: {job.name}')
+            result = handler(state)
+        except Exception as e:
+            db.session.rollback()
+            logger.error('Tâche de fond %s (%s) en échec, tentative %s/%s', job.name, job.id,
+                         job.attempts, job.max_attempts, exc_info=e)
+            self.failed += 1
+            self._release(job, self._failure_values(job, e))
+            return False
+        finally:
+            g.pop('job_lease', None)
+        self.succeeded += 1
+        if job.interval:
+            self._release(job, {'status': 'pending', 'attempts': 0, 'last_error': None,
+                                'run_at': datetime.utcnow() + timedelta(seconds=job.interval),
+                                'payload': json.dumps(result if result is not None else state)})
+        else:
+            self._release(job, None)
+        return True
+
+    def _failure_values(self, job, error):
+        now = datetime.utcnow()
+        values = {'last_error': f'{type(error).__name__}: {error}'[:1000]}
+        if job.attempts < job.max_attempts:
+            delay = min(self.retry_backoff * 2 ** (job.attempts - 1), MAX_RETRY_DELAY)
+            values.update(status='pending', run_at=now + timedelta(seconds=delay))
+        elif job.interval:
+            # Une tâche périodique reprend à l'intervalle suivant
+            values.update(status='pending', attempts=0, run_at=now + timedelta(seconds=job.interval))
+        else:
+            values.update(status='failed')
+        return values
+
+    def _release(self, job, values):
+        """Rend la tâche (values None : supprime la tâche ponctuelle terminée)"""
+        mine = (Job.id == job.id, Job.lease_owner == self.owner)
+        if values is None:
+            statement = delete(Job).where(*mine)
+        else:
+            statement = update(Job).where(*mine).values(lease_owner=None, lease_expires_at=None, **values)
+        if db.session.execute(statement, execution_options={'synchronize_session': False}).rowcount == 0:
+            logger.warning('Bail de la tâche de fond %s (%s) perdu : exécution plus longue que '
+                           'JOBS_LEASE_SECONDS ?', job.name, job.id)
+        db.session.commit()
+
+    def run_pending(self, limit=None):
+        """Exécute les tâches dues jusqu'à épuisement (ou `limit`) ; renvoie leur nombre"""
+        count = 0
+        while (limit is None or count < limit) and not self._stop.is_set():
+            with self.app.app_context():
+                if not self._scheduled:
+                    schedule_periodic(self.app.config['JOBS_SCHEDULE'])
+                    self._scheduled = True
+                job = self.claim()
+                if job is None:
+                    break
+                self.execute(job)
+            count += 1
+        return count
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            try:
+                self.run_pending()
+            except Exception:
+                # Base verrouillée ou indisponible : nouvel essai au prochain tour
+                logger.exception('Boucle des tâches de fond')
+            self._stop.wait(self.poll_interval)
+
+    def start(self):
+        """Exécute les tâches dans un thread de fond (daemon) du processus"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name='jobs', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {'succeeded': self.succeeded, 'failed': self.failed}
+
+def _remind(kind, lower, upper, batch_size, now):
+    """Rappels `kind` des tâches non terminées dues dans ]lower, upper], lot par lot"""
+    total = 0
+    due, task_id = lower, None
+    while True:
+        # Curseur (échéance, id) sur l'index ix_tasks_due
+        after = Task.due_date > due if task_id is None else and_(
+            Task.due_date >= due, or_(Task.due_date > due, Task.id > task_id))
+        rows = db.session.execute(
+            select(Task.id, Task.user_id, Task.due_date)
+            .where(after, Task.due_date <= upper, Task.status.is_distinct_from(TaskStatus.COMPLETED))
+            .order_by(Task.due_date, Task.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return total
+        existing = set(db.session.execute(
+            select(TaskReminder.task_id, TaskReminder.due_date)
+            .where(TaskReminder.kind == kind, TaskReminder.task_id.in_([row.id for row in rows]))
+        ).all())
+        reminders = [
+            {'task_id': row.id, 'user_id': row.user_id, 'kind': kind, 'due_date': row.due_date, 'created_at': now}
+            for row in rows if (row.id, row.due_date) not in existing
+        ]
+        if reminders:
+            db.session.execute(insert(TaskReminder), reminders)
+            db.session.commit()
+        total += len(reminders)
+        if len(rows) < batch_size:
+            return total
+        due, task_id = rows[-1].due_date, rows[-1].id
+
+@job_handler('due_reminders')
+def due_reminders(state):
+    """Rappels des tâches bientôt dues ou en retard, par lots de JOBS_BATCH_SIZE
+
+    Les tâches dues dans les REMINDER_DUE_SOON secondes sont relues à chaque
+    passage (plage bornée de l'index sur due_date, rappels existants écartés) ;
+    pour les retards, seule la plage écoulée depuis le passage précédent est
+    lue (borne conservée dans l'état). Une tâche créée déjà en retard n'est
+    pas rappelée.
+    """
+    config = current_app.config
+    batch_size = config['JOBS_BATCH_SIZE']
+    now = datetime.utcnow()
+    since = datetime.fromisoformat(state['overdue_since']) if 'overdue_since' in state else now
+    total = _remind('due_soon', now, now + timedelta(seconds=config['REMINDER_DUE_SOON']), batch_size, now)
+    total += _remind('overdue', since, now, batch_size, now)
+    if total:
+        logger.info('%d rappel(s) d\'échéance émis', total)
+    return {'overdue_since': now.isoformat()}
+
+def _delete_in_batches(model, condition, batch_size):
+    total = 0
+    while True:
+        ids = list(db.session.scalars(select(model.id).where(condition).limit(batch_size)))
+        if ids:
+            db.session.execute(delete(model).where(model.id.in_(ids)))
+            db.session.commit()
+        total += len(ids)
+        if len(ids) < batch_size:
+            return total
+
+@job_handler('purge_tombstones')
+def purge_tombstones(state):
+    """Purge les pierres tombales, rappels et échecs plus anciens que TOMBSTONE_RETENTION_DAYS
+
+    Avance tombstone_horizon de chaque utilisateur concerné dans la même
+    transaction que le lot supprimé : un jeton de synchronisation antérieur à
+    une suppression purgée reçoit {'resync': true}.
+    """
+    config = current_app.config
+    batch_size = config['JOBS_BATCH_SIZE']
+    cutoff = datetime.utcnow() - timedelta(days=config['TOMBSTONE_RETENTION_DAYS'])
+    purged = 0
+    while True:
+        rows = db.session.execute(
+            select(TaskTombstone.id, TaskTombstone.user_id, TaskTombstone.revision)
+            .where(TaskTombstone.deleted_at < cutoff)
+            .order_by(TaskTombstone.deleted_at)
+            .limit(batch_size)
+        ).all()
+        horizons = {}
+        for row in rows:
+            horizons[row.user_id] = max(horizons.get(row.user_id, 0), row.revision)
+        for user_id, revision in horizons.items():
+            db.session.execute(
+                update(User)
+                .where(User.id == user_id, User.tombstone_horizon < revision)
+                .values(tombstone_horizon=revision),
+                execution_options={'synchronize_session': False}
+            )
+        if rows:
+            db.session.execute(delete(TaskTombstone).where(TaskTombstone.id.in_([row.id for row in rows])))
+            db.session.commit()
+        purged += len(rows)
+        if len(rows) < batch_size:
+            break
+    reminders = _delete_in_batches(TaskReminder, TaskReminder.created_at < cutoff, batch_size)
+    failed = _delete_in_batches(Job, and_(Job.status == 'failed', Job.created_at < cutoff), batch_size)
+    logger.info('Purge : %d pierre(s) tombale(s), %d rappel(s), %d tâche(s) de fond en échec',
+                purged, reminders, failed)
+
+@job_handler('analyze')
+def analyze(state):
+    """Met à jour les statistiques du planificateur de requêtes"""
+    with db.engine.connect() as connection:
+        if connection.dialect.name == 'sqlite':
+            # Échantillonnage borné : quelques millisecondes même sur des millions de lignes
+            connection.execute(text('PRAGMA analysis_limit = 1000'))
+        connection.execute(text('ANALYZE'))
+        connection.commit()
+
+@job_handler('vacuum')
+def vacuum(state):
+    """Reconstruit la base pour rendre l'espace libéré par les suppressions
+
+    Verrouille la base pendant toute la reconstruction : désactivée par défaut
+    dans JOBS_SCHEDULE, à planifier en heures creuses ou via `flask jobs enqueue vacuum`.
+    """
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        connection.execute(text('VACUUM'))
+
+def recent_reminders(user_id, limit):
+    """Derniers rappels encore valables (tâche existante, même échéance, non terminée)"""
+    rows = db.session.execute(
+        select(TaskReminder.task_id, TaskReminder.kind, TaskReminder.due_date,
+               TaskReminder.created_at, Task.title)
+        .join(Task, and_(Task.id == TaskReminder.task_id, Task.user_id == TaskReminder.user_id,
+                         Task.due_date == TaskReminder.due_date))
+        .where(TaskReminder.user_id == user_id, Task.status.is_distinct_from(TaskStatus.COMPLETED))
+        .order_by(TaskReminder.created_at.desc(), TaskReminder.id.desc())
+        .limit(limit)
+    ).all()
+    return [{
+        'task_id': row.task_id,
+        'title': row.title,
+        'kind': row.kind,
+        'due_date': row.due_date.isoformat(),
+        'created_at': row.created_at.isoformat(),
+    } for row in rows]
+
+def init_jobs(app):
+    """Prépare l'exécuteur des tâches de fond ; run.py le démarre si JOBS_IN_PROCESS"""
+    runner = JobRunner(app)
+    app.extensions['jobs'] = runner
+    return runner
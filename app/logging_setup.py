@@ -0,0 +1,133 @@
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import uuid
+from datetime import datetime, timezone
+from flask import g, request, has_request_context
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s'
+
+_listener = None
+_queue_handler = None
+
+class RequestIdFilter(logging.Filter):
+    """Ajoute l'identifiant de la requête HTTP courante à chaque enregistrement
+
+    Appliqué dans le thread de la requête, avant la mise en file : le thread
+    d'écriture n'a pas accès au contexte Flask.
+    """
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = g.get('request_id', '-') if has_request_context() else '-'
+        return True
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler qui abandonne l'enregistrement si la file est pleine
+
+    Les threads de requête ne font qu'un put_nowait : une écriture disque
+    lente ne peut jamais bloquer le traitement d'une requête.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par enregistrement"""
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+            'thread': record.threadName,
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+def file_handler(config):
+    """Fichier journal avec rotation par taille ('size') ou par période ('time')"""
+    if config['LOG_ROTATION'] == 'time':
+        return logging.handlers.TimedRotatingFileHandler(
+            config['LOG_FILE'], when=config['LOG_ROTATE_WHEN'],
+            backupCount=config['LOG_BACKUP_COUNT'], encoding='utf-8'
+        )
+    return logging.handlers.RotatingFileHandler(
+        config['LOG_FILE'], maxBytes=config['LOG_MAX_BYTES'],
+        backupCount=config['LOG_BACKUP_COUNT'], encoding='utf-8'
+    )
+
+def configure_logging(config):
+    """Installe la journalisation asynchrone sur le logger racine
+
+    Les threads de requête déposent les enregistrements dans une file bornée
+    (QueueHandler) ; un QueueListener les écrit sur la console et dans un
+    fichier à rotation, en JSON si LOG_FORMAT vaut 'json'. Un nouvel appel
+    remplace la configuration précédente. Renvoie le listener démarré.
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(TEXT_FORMAT))
+    handlers = [console]
+    if config.get('LOG_FILE'):
+        output = file_handler(config)
+        output.setFormatter(JsonFormatter() if config['LOG_FORMAT'] == 'json' else logging.Formatter(TEXT_FORMAT))
+        handlers.append(output)
+
+    _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=config['LOG_QUEUE_SIZE']))
+    _queue_handler.addFilter(RequestIdFilter())
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.setLevel(config['LOG_LEVEL'])
+    root.addHandler(_queue_handler)
+    _listener.start()
+    return _listener
+
+def shutdown_logging():
+    """Vide la file et retire le QueueHandler installé par configure_logging"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
+def dropped_log_records():
+    """Nombre d'enregistrements abandonnés faute de place dans la file"""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+def init_request_ids(app):
+    """Attribue un identifiant à chaque requête (repris de X-Request-ID s'il est fourni)"""
+
+    @app.before_request
+    def assign_request_id():
+        incoming = request.headers.get('X-Request-ID', '')
+        g.request_id = incoming[:64] if incoming else uuid.uuid4().hex
+
+    @app.after_request
+    def expose_request_id(response):
+        if 'request_id' in g:
+            response.headers['X-Request-ID'] = g.request_id
+        return response
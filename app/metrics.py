@@ -0,0 +1,283 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import g, request
+from sqlalchemy import event, text
+from app.logging_setup import dropped_log_records
+
+logger = logging.getLogger(__name__)
+
+# Bornes des histogrammes de latence (secondes)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+def _labels(names, values):
+    if not names:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Compteur Prometheus étiqueté"""
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, labels, value) for labels, value in sorted(self._values.items())]
+
+class Gauge(Counter):
+    """Jauge Prometheus étiquetée"""
+    kind = 'gauge'
+
+    def set(self, *labels, value):
+        with self._lock:
+            self._values[labels] = value
+
+class Histogram:
+    """Histogramme Prometheus étiqueté à bornes fixes"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=REQUEST_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            counts, total = self._values.get(labels, (None, 0.0))
+            if counts is None:
+                counts = [0] * len(self.buckets)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._values[labels] = (counts, total + value)
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                samples.append((f'{self.name}_bucket', labels + (_number(bound),), cumulative))
+            samples.append((f'{self.name}_sum', labels, total))
+            samples.append((f'{self.name}_count', labels, cumulative))
+        return samples
+
+class MetricsRegistry:
+    """Collecteurs en mémoire du processus, exposés au format texte Prometheus"""
+
+    def __init__(self):
+        self.requests = Counter('http_requests_total', 'Requêtes HTTP traitées',
+                                ('endpoint', 'method', 'status'))
+        self.latency = Histogram('http_request_duration_seconds', 'Durée des requêtes HTTP',
+                                 ('endpoint',), REQUEST_BUCKETS)
+        self.in_flight = Gauge('http_requests_in_flight', 'Requêtes HTTP en cours')
+        self.queries = Histogram('db_query_duration_seconds', 'Durée des requêtes SQL',
+                                 buckets=QUERY_BUCKETS)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.collectors = [self.requests, self.latency, self.in_flight, self.queries]
+        # Fonctions appelées à chaque collecte :
+        # [(nom, type, aide, noms d'étiquettes, [(étiquettes, valeur)])]
+        self.callbacks = []
+
+    def request_started(self):
+        with self._lock:
+            self._in_flight += 1
+            self.in_flight.set(value=self._in_flight)
+
+    def request_finished(self):
+        with self._lock:
+            self._in_flight -= 1
+            self.in_flight.set(value=self._in_flight)
+
+    def render(self):
+        """Exposition au format texte Prometheus 0.0.4"""
+        lines = []
+        for collector in self.collectors:
+            lines.append(f'# HELP {collector.name} {collector.documentation}')
+            lines.append(f'# TYPE {collector.name} {collector.kind}')
+            names = collector.labelnames + (('le',) if collector.kind == 'histogram' else ())
+            for name, labels, value in collector.samples():
+                sample_names = names if name.endswith('_bucket') else collector.labelnames
+                lines.append(f'{name}{_labels(sample_names, labels)} {_number(value)}')
+        for callback in self.callbacks:
+            for name, kind, documentation, labelnames, samples in callback():
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_labels(labelnames, labels)} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+def pool_metrics(engine):
+    """Occupation du pool de connexions SQLAlchemy (QueuePool ; autres pools partiels)"""
+    pool = engine.pool
+    samples = []
+    for name, attribute, documentation in (
+        ('db_pool_size', 'size', 'Taille du pool de connexions'),
+        ('db_pool_checked_out', 'checkedout', 'Connexions empruntées'),
+        ('db_pool_checked_in', 'checkedin', 'Connexions disponibles dans le pool'),
+        ('db_pool_overflow', 'overflow', 'Connexions en débordement'),
+    ):
+        method = getattr(pool, attribute, None)
+        if method is not None:
+            samples.append((name, 'gauge', documentation, (), [((), method())]))
+    return samples
+
+def pool_stats_metrics(stats):
+    """Emprunts de connexions lents ou en échec (voir app.pool.PoolStats)"""
+    counters = stats.stats()
+    return [
+        ('db_pool_checkouts_total', 'counter', 'Connexions empruntées au pool', (), [((), counters['checkouts'])]),
+        ('db_pool_slow_checkouts_total', 'counter', 'Emprunts au-delà de DB_POOL_WAIT_WARNING_MS', (),
+         [((), counters['slow'])]),
+        ('db_pool_exhausted_total', 'counter', 'Emprunts abandonnés après DB_POOL_TIMEOUT (pool épuisé)', (),
+         [((), counters['exhausted'])]),
+    ]
+
+def app_metrics(app):
+    """Compteurs des composants internes (cache, SSE, hachage, compression, tâches de fond, journaux)"""
+    samples = []
+    cache = app.extensions.get('user_cache')
+    if cache is not None:
+        stats = cache.stats()
+        samples.append(('user_cache_requests_total', 'counter', 'Consultations du cache utilisateurs',
+                        ('result',), [(('hit',), stats['hits']), (('miss',), stats['misses'])]))
+        samples.append(('user_cache_size', 'gauge', 'Entrées du cache utilisateurs', (), [((), stats['size'])]))
+    bus = app.extensions.get('task_events')
+    if bus is not None:
+        samples.append(('sse_streams_active', 'gauge', 'Flux SSE ouverts', (), [((), bus.active())]))
+        samples.append(('sse_events_dropped_total', 'counter', 'Notifications SSE perdues', (), [((), bus.dropped)]))
+    hasher = app.extensions.get('password_hasher')
+    if hasher is not None:
+        stats = hasher.stats()
+        samples.append(('password_hash_in_flight', 'gauge', 'Hachages en cours ou en attente', (),
+                        [((), stats['in_flight'])]))
+        samples.append(('password_hash_rejected_total', 'counter', 'Hachages refusés (503)', (),
+                        [((), stats['rejected'] + stats['timeouts'])]))
+    compressor = app.extensions.get('compression')
+    if compressor is not None:
+        stats = compressor.stats()
+        samples.append(('http_responses_compressed_total', 'counter', 'Réponses compressées', (),
+                        [((), stats['compressed'])]))
+        samples.append(('http_compression_bytes_total', 'counter', 'Octets avant et après compression',
+                        ('stage',), [(('in',), stats['bytes_in']), (('out',), stats['bytes_out'])]))
+    jobs = app.extensions.get('jobs')
+    if jobs is not None:
+        stats = jobs.stats()
+        samples.append(('background_jobs_total', 'counter', 'Tâches de fond exécutées par ce processus',
+                        ('result',), [(('succeeded',), stats['succeeded']), (('failed',), stats['failed'])]))
+    samples.append(('log_records_dropped_total', 'counter', 'Enregistrements de journal abandonnés (file pleine)',
+                    (), [((), dropped_log_records())]))
+    return samples
+
+def init_metrics(app, engine):
+    """Collecte les métriques de requêtes et de SQL si METRICS_ENABLED est vrai"""
+    if not app.config.get('METRICS_ENABLED'):
+        app.extensions['metrics'] = None
+        return None
+
+    registry = MetricsRegistry()
+    registry.callbacks.append(lambda: pool_metrics(engine))
+    registry.callbacks.append(lambda: app_metrics(app))
+    pool_stats = app.extensions.get('db_pool')
+    if pool_stats is not None:
+        registry.collectors.append(pool_stats.wait)
+        registry.callbacks.append(lambda: pool_stats_metrics(pool_stats))
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_start = time.perf_counter()
+        g.metrics_in_flight = True
+        registry.request_started()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = g.pop('metrics_start', None)
+        if start is not None:
+            endpoint = request.endpoint or 'unknown'
+            registry.latency.observe(time.perf_counter() - start, endpoint)
+            registry.requests.inc(endpoint, request.method, str(response.status_code))
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exception=None):
+        # Les contextes de requête sans dispatch (test_request_context) passent aussi ici
+        if g.pop('metrics_in_flight', False):
+            registry.request_finished()
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_query_metrics(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def record_query_metrics(conn, cursor, statement, parameters, context, executemany):
+        registry.queries.observe(time.perf_counter() - conn.info['metrics_query_start'].pop())
+
+    @event.listens_for(engine, 'handle_error')
+    def discard_query_metrics(context):
+        if context.connection is not None and context.connection.info.get('metrics_query_start'):
+            context.connection.info['metrics_query_start'].pop()
+
+    app.extensions['metrics'] = registry
+    return registry
+
+class DatabaseProbe:
+    """`SELECT 1` chronométré avec une échéance, pour /health
+
+    La requête s'exécute dans un thread dédié : si la base ne répond pas avant
+    l'échéance, /health répond sans attendre (la sonde suivante attend la fin
+    de celle en cours, d'où un seul thread bloqué au plus).
+    """
+
+    def __init__(self, engine, timeout):
+        self.engine = engine
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='health-probe')
+
+    def _select_one(self):
+        with self.engine.connect() as connection:
+            connection.execute(text('SELECT 1')).scalar()
+
+    def check(self):
+        """(ok, latence en ms, erreur ou None) ; un échec est journalisé"""
+        start = time.perf_counter()
+        future = self._executor.submit(self._select_one)
+        try:
+            future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            error = 'délai dépassé'
+        except Exception as e:
+            error = str(e)
+        else:
+            return True, round((time.perf_counter() - start) * 1000, 2), None
+        logger.error('Sonde de santé : base de données indisponible (%s)', error)
+        return False, round((time.perf_counter() - start) * 1000, 2), error
+
+def init_database_probe(app, engine):
+    probe = DatabaseProbe(engine, app.config['HEALTH_DB_TIMEOUT'])
+    app.extensions['database_probe'] = probe
+    return probe
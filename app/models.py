@@ -1,5 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy import DDL, event
 from datetime import datetime
 import enum
 
@@ -20,6 +21,11 @@ class User(UserMixin, db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
+    # Compteur incrémenté à chaque écriture sur les tâches (ETag, synchronisation)
+    task_revision = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Révision jusqu'à laquelle les pierres tombales ont été purgées : un jeton
+    # de synchronisation antérieur impose un rechargement complet
+    tombstone_horizon = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relation avec les tâches
     tasks = db.relationship('Task', backref='author', lazy=True)
@@ -39,10 +45,29 @@ class Task(db.Model):
     due_date = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Révision de l'utilisateur lors de la dernière écriture (synchronisation différentielle)
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Clé étrangère
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     
+    # Index composites alignés sur les accès de l'API (filtre user_id [+ status],
+    # tri priority DESC, created_at DESC, id DESC) ; l'id est porté implicitement
+    # en fin d'index par SQLite (rowid)
+    __table_args__ = (
+        db.Index('ix_tasks_user_priority_created', 'user_id', 'priority', 'created_at'),
+        db.Index('ix_tasks_user_status_priority_created', 'user_id', 'status', 'priority', 'created_at'),
+        db.Index('ix_tasks_user_revision', 'user_id', 'revision'),
+        db.Index('ix_tasks_user_due', 'user_id', 'due_date'),
+        # Parcours des échéances tous utilisateurs confondus (rappels)
+        db.Index('ix_tasks_due', 'due_date'),
+        # Sélection des tâches terminées à archiver
+        db.Index('ix_tasks_status_updated', 'status', 'updated_at'),
+        # Identifiants jamais réattribués (sinon max(rowid)+1 après suppression
+        # de la plus récente) : ceux des tâches archivées restent uniques
+        {'sqlite_autoincrement': True},
+    )
+    
     def to_dict(self):
         """Convertit la tâche en dictionnaire pour l'API"""
         return {
@@ -57,4 +82,207 @@ class Task(db.Model):
         }
     
     def __repr__(self):
-        return f'<Task {self.title}>'
\ No newline at end of file
+        return f'<Task {self.title}>'
+
+# Index plein texte SQLite (FTS5) sur le titre et la description des tâches.
+# Table à contenu externe : le texte reste dans `tasks`, les triggers tiennent
+# l'index à jour pour toutes les écritures, y compris les INSERT/UPDATE en masse.
+TASKS_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, description,
+        content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+]
+
+# Compteurs par utilisateur, statut et priorité, tenus à jour par triggers
+# (toutes les écritures, y compris les INSERT/UPDATE/DELETE en masse)
+TASK_STATS_DDL = [
+    """CREATE TRIGGER IF NOT EXISTS task_stats_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO task_stats(user_id, status, priority, count)
+        VALUES (new.user_id, IFNULL(new.status, ''), IFNULL(new.priority, 0), 1)
+        ON CONFLICT(user_id, status, priority) DO UPDATE SET count = count + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_stats_delete AFTER DELETE ON tasks BEGIN
+        UPDATE task_stats SET count = count - 1
+        WHERE user_id = old.user_id AND status = IFNULL(old.status, '') AND priority = IFNULL(old.priority, 0);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_stats_update AFTER UPDATE OF user_id, status, priority ON tasks
+    WHEN old.user_id IS NOT new.user_id OR old.status IS NOT new.status OR old.priority IS NOT new.priority
+    BEGIN
+        UPDATE task_stats SET count = count - 1
+        WHERE user_id = old.user_id AND status = IFNULL(old.status, '') AND priority = IFNULL(old.priority, 0);
+        INSERT INTO task_stats(user_id, status, priority, count)
+        VALUES (new.user_id, IFNULL(new.status, ''), IFNULL(new.priority, 0), 1)
+        ON CONFLICT(user_id, status, priority) DO UPDATE SET count = count + 1;
+    END""",
+]
+
+for statement in TASKS_FTS_DDL + TASK_STATS_DDL:
+    event.listen(Task.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+event.listen(Task.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS tasks_fts').execute_if(dialect='sqlite'))
+
+class ArchivedTask(db.Model):
+    """Tâche terminée déplacée hors de `tasks` (voir app.archive), en lecture seule
+
+    Conserve l'identifiant de la tâche d'origine ; les compteurs task_stats
+    incluent les tâches archivées.
+    """
+    __tablename__ = 'archived_tasks'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    status = db.Column(db.Enum(TaskStatus))
+    priority = db.Column(db.Integer)
+    due_date = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Même ordre que la liste des tâches (pagination par curseur, include_archived)
+    __table_args__ = (
+        db.Index('ix_archived_tasks_user_priority_created', 'user_id', 'priority', 'created_at'),
+    )
+    
+    def to_dict(self):
+        """Représentation de Task.to_dict, plus la date d'archivage"""
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'status': self.status.value,
+            'priority': self.priority,
+            'due_date': self.due_date.isoformat() if self.due_date else None,
+            'created_at': self.created_at.isoformat(),
+            'user_id': self.user_id,
+            'archived_at': self.archived_at.isoformat()
+        }
+    
+    def __repr__(self):
+        return f'<ArchivedTask {self.title}>'
+
+# Index plein texte et compteurs des tâches archivées : mêmes règles que pour
+# `tasks` (les lignes archivées ne sont jamais modifiées, seulement insérées ou
+# supprimées)
+ARCHIVED_TASKS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS archived_tasks_fts USING fts5(
+        title, description,
+        content='archived_tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS archived_tasks_insert AFTER INSERT ON archived_tasks BEGIN
+        INSERT INTO archived_tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+        INSERT INTO task_stats(user_id, status, priority, count)
+        VALUES (new.user_id, IFNULL(new.status, ''), IFNULL(new.priority, 0), 1)
+        ON CONFLICT(user_id, status, priority) DO UPDATE SET count = count + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS archived_tasks_delete AFTER DELETE ON archived_tasks BEGIN
+        INSERT INTO archived_tasks_fts(archived_tasks_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        UPDATE task_stats SET count = count - 1
+        WHERE user_id = old.user_id AND status = IFNULL(old.status, '') AND priority = IFNULL(old.priority, 0);
+    END""",
+]
+
+for statement in ARCHIVED_TASKS_DDL:
+    event.listen(ArchivedTask.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+event.listen(ArchivedTask.__table__, 'before_drop',
+             DDL('DROP TABLE IF EXISTS archived_tasks_fts').execute_if(dialect='sqlite'))
+
+class TaskStat(db.Model):
+    """Nombre de tâches par utilisateur, statut et priorité (maintenu par triggers)"""
+    __tablename__ = 'task_stats'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    status = db.Column(db.String(11), primary_key=True)  # nom du TaskStatus, '' si NULL
+    priority = db.Column(db.Integer, primary_key=True)  # 0 si NULL
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<TaskStat {self.user_id} {self.status} {self.priority}: {self.count}>'
+
+class TaskTombstone(db.Model):
+    """Trace d'une tâche supprimée, pour la synchronisation différentielle"""
+    __tablename__ = 'task_tombstones'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    revision = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_task_tombstones_user_revision', 'user_id', 'revision'),
+        db.Index('ix_task_tombstones_deleted_at', 'deleted_at'),
+    )
+    
+    def __repr__(self):
+        return f'<TaskTombstone {self.task_id}>'
+
+class Job(db.Model):
+    """Tâche de fond persistante (voir app.jobs)
+
+    `interval` non nul : tâche périodique, replanifiée après chaque exécution.
+    Un bail (lease_owner, lease_expires_at) réserve la tâche à un processus.
+    """
+    __tablename__ = 'jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(80), nullable=False)
+    # Identifiant unique des tâches périodiques, NULL pour les tâches ponctuelles
+    key = db.Column(db.String(80), unique=True)
+    payload = db.Column(db.Text, nullable=False, default='{}')  # JSON, état conservé entre exécutions
+    interval = db.Column(db.Integer)  # secondes
+    status = db.Column(db.String(10), nullable=False, default='pending')  # pending, running, failed
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    lease_owner = db.Column(db.String(80))
+    lease_expires_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_jobs_status_run_at', 'status', 'run_at'),
+    )
+    
+    def __repr__(self):
+        return f'<Job {self.name} {self.status}>'
+
+class TaskReminder(db.Model):
+    """Rappel d'échéance émis par la tâche de fond `due_reminders`
+
+    Unique par tâche, type et échéance : une échéance modifiée donne un
+    nouveau rappel, un nouveau parcours n'en duplique aucun.
+    """
+    __tablename__ = 'task_reminders'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    kind = db.Column(db.String(10), nullable=False)  # due_soon, overdue
+    due_date = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('task_id', 'kind', 'due_date', name='uq_task_reminders_task_kind_due'),
+        db.Index('ix_task_reminders_user_created', 'user_id', 'created_at'),
+    )
+    
+    def __repr__(self):
+        return f'<TaskReminder {self.task_id} {self.kind}>'
@@ -0,0 +1,44 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from sqlalchemy import tuple_
+from app.models import Task
+
+class InvalidCursor(ValueError):
+    """Curseur de pagination illisible ou corrompu"""
+
+def encode_cursor(task):
+    """Encode la position (priority, created_at, id) d'une tâche en curseur opaque"""
+    payload = [
+        task.priority,
+        task.created_at.isoformat() if task.created_at else None,
+        task.id
+    ]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """Décode un curseur opaque en tuple (priority, created_at, id)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        priority, created_at, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        if created_at is not None:
+            created_at = datetime.fromisoformat(created_at)
+        if not isinstance(task_id, int) or (priority is not None and not isinstance(priority, int)):
+            raise InvalidCursor(cursor)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    return priority, created_at, task_id
+
+def keyset_filter(priority, created_at, task_id, columns=None):
+    """Condition « après le curseur » pour l'ordre priority DESC, created_at DESC, id DESC
+
+    La comparaison de tuple permet à la base de reprendre directement après
+    la dernière ligne servie au lieu de relire les pages précédentes.
+    `columns` remplace (Task.priority, Task.created_at, Task.id), par exemple
+    pour les tâches archivées.
+    """
+    if columns is None:
+        columns = (Task.priority, Task.created_at, Task.id)
+    return tuple_(*columns) < tuple_(priority, created_at, task_id)
@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, SingletonThreadPool, StaticPool
+from app.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+POOL_CLASSES = {
+    'queue': QueuePool,
+    'thread': SingletonThreadPool,
+    'static': StaticPool,
+}
+
+# Bornes de l'histogramme d'attente d'une connexion (secondes)
+CHECKOUT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# Intervalle minimal entre deux avertissements du pool (secondes)
+WARNING_INTERVAL = 10.0
+
+class PoolStats:
+    """Attentes et saturations du pool de connexions
+
+    L'attente mesurée couvre tout l'emprunt : file d'attente du pool, ouverture
+    d'une nouvelle connexion et pre-ping éventuel. Les avertissements (attente
+    au-delà de `warning_ms`, pool épuisé) sont limités à un par WARNING_INTERVAL.
+    """
+
+    def __init__(self, warning_ms=100):
+        self.warning_ms = warning_ms
+        self.wait = Histogram('db_pool_checkout_wait_seconds', 'Attente d\'une connexion du pool',
+                              buckets=CHECKOUT_BUCKETS)
+        self.checkouts = 0
+        self.slow = 0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+        self._last_warning = float('-inf')
+        self._suppressed = 0
+
+    def record(self, duration, pool):
+        self.wait.observe(duration)
+        with self._lock:
+            self.checkouts += 1
+            if duration * 1000 >= self.warning_ms:
+                self.slow += 1
+                slow = True
+            else:
+                slow = False
+        if slow:
+            self._warn('Attente de %.0f ms pour une connexion du pool (%s)', duration * 1000, pool.status())
+
+    def timeout(self, duration, pool):
+        self.wait.observe(duration)
+        with self._lock:
+            self.exhausted += 1
+        self._warn('Pool de connexions épuisé après %.0f ms d\'attente (%s)', duration * 1000, pool.status())
+
+    def _warn(self, message, *args):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_warning < WARNING_INTERVAL:
+                self._suppressed += 1
+                return
+            self._last_warning = now
+            suppressed, self._suppressed = self._suppressed, 0
+        if suppressed:
+            message += ' ; %d avertissement(s) précédent(s) non journalisé(s)'
+            args += (suppressed,)
+        logger.warning(message, *args)
+
+    def stats(self):
+        with self._lock:
+            return {'checkouts': self.checkouts, 'slow': self.slow, 'exhausted': self.exhausted}
+
+def timed_pool_class(base, stats):
+    """Sous-classe de `base` qui mesure chaque emprunt de connexion
+
+    La classe est conservée par Pool.recreate() (engine.dispose()), les
+    compteurs survivent donc au remplacement du pool.
+    """
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = base.connect(self)
+        except exc.TimeoutError:
+            stats.timeout(time.perf_counter() - start, self)
+            raise
+        stats.record(time.perf_counter() - start, self)
+        return connection
+    return type(f'Timed{base.__name__}', (base,), {'connect': connect})
+
+def engine_options(config, stats=None):
+    """Options du moteur SQLAlchemy pour le profil DB_POOL_PROFILE
+
+    'queue' borne les connexions (DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW), avec
+    une attente d'au plus DB_POOL_TIMEOUT ; 'thread' garde une connexion
+    SQLite par thread ; 'static' partage une seule connexion. Une base SQLite
+    en mémoire reste en StaticPool, imposé par Flask-SQLAlchemy (aucune
+    option, emprunts non mesurés). Le pre-ping n'est activé par défaut que
+    pour les bases serveur.
+    """
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    sqlite = url.get_backend_name() == 'sqlite'
+    profile = config['DB_POOL_PROFILE']
+    if profile not in POOL_CLASSES:
+        raise ValueError(f'Profil de pool inconnu: {profile}')
+    if sqlite and url.database in (None, '', ':memory:'):
+        return {}
+
+    pool_class = POOL_CLASSES[profile]
+    options = {'poolclass': timed_pool_class(pool_class, stats) if stats is not None else pool_class}
+    if sqlite and profile != 'queue':
+        # La connexion peut être utilisée ou refermée depuis un autre thread
+        options['connect_args'] = {'check_same_thread': False}
+    if profile == 'static':
+        return options
+
+    pre_ping = config['DB_POOL_PRE_PING']
+    options['pool_pre_ping'] = not sqlite if pre_ping is None else pre_ping
+    options['pool_recycle'] = config['DB_POOL_RECYCLE']
+    if profile == 'queue':
+        options['pool_size'] = config['DB_POOL_SIZE']
+        options['max_overflow'] = config['DB_POOL_MAX_OVERFLOW']
+        options['pool_timeout'] = config['DB_POOL_TIMEOUT']
+    else:
+        # Nombre de threads qui gardent leur connexion ; au-delà, elles sont refermées
+        options['pool_size'] = config['DB_POOL_SIZE']
+    return options
+
+def pool_capacity(config):
+    """Connexions simultanées possibles sans attente (None : illimité)"""
+    options = engine_options(config)
+    if options.get('poolclass') is QueuePool:
+        return options['pool_size'] + max(options['max_overflow'], 0)
+    return None
+
+def check_pool_capacity(config, threads):
+    """Avertit si les threads du serveur peuvent attendre une connexion"""
+    capacity = pool_capacity(config)
+    if capacity is not None and capacity < threads:
+        logger.warning('%d threads pour %d connexions au plus (DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW) : '
+                       'des requêtes attendront une connexion', threads, capacity)
+        return False
+    return True
+
+def init_pool_options(app):
+    """Applique le profil de pool avant db.init_app
+
+    Les clés présentes dans SQLALCHEMY_ENGINE_OPTIONS restent prioritaires.
+    """
+    stats = PoolStats(warning_ms=app.config['DB_POOL_WAIT_WARNING_MS'])
+    options = engine_options(app.config, stats)
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    app.extensions['db_pool'] = stats
+    return stats
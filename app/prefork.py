@@ -0,0 +1,198 @@
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+
+logger = logging.getLogger(__name__)
+
+# Signaux traités par le maître (bloqués puis lus avec sigtimedwait)
+MASTER_SIGNALS = (signal.SIGCHLD, signal.SIGTERM, signal.SIGINT, signal.SIGHUP)
+
+def listen_socket(host, port, backlog=2048):
+    """Socket d'écoute créée par le maître et héritée par les workers au fork"""
+    return socket.create_server((host, port), backlog=backlog)
+
+class WorkerProcess:
+    def __init__(self, pid, slot, generation):
+        self.pid = pid
+        self.slot = slot
+        self.generation = generation
+        self.started = time.monotonic()
+        self.retiring_since = None
+
+class Supervisor:
+    """Processus maître du mode multi-processus (Linux)
+
+    Forke `workers` processus qui exécutent `run_worker(slot)`, avec `slot`
+    de 0 à workers - 1 (un remplaçant reprend le numéro). Le maître ne
+    construit jamais l'application : chaque worker a son propre moteur
+    SQLAlchemy, ses pools et ses threads. Un worker qui s'arrête est relancé,
+    avec un délai croissant s'il meurt moins de `min_uptime` secondes après
+    son démarrage. SIGHUP remplace tous les workers sans interrompre le
+    service (la socket reste ouverte) ; SIGTERM/SIGINT arrête les workers en
+    leur laissant `graceful_timeout` secondes pour finir leurs requêtes.
+    """
+
+    def __init__(self, run_worker, workers=2, graceful_timeout=30.0, min_uptime=2.0, max_backoff=30.0):
+        self.run_worker = run_worker
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.min_uptime = min_uptime
+        self.max_backoff = max_backoff
+        self.children = {}
+        self.generation = 0
+        self.backoff = 0.0
+        self.next_spawn = 0.0
+        self.restarts = 0
+
+    def run(self):
+        signal.pthread_sigmask(signal.SIG_BLOCK, MASTER_SIGNALS)
+        try:
+            while True:
+                self.spawn_missing()
+                timeout = max(0.05, min(1.0, self.next_spawn - time.monotonic()))
+                info = signal.sigtimedwait(MASTER_SIGNALS, timeout)
+                if info is not None and info.si_signo in (signal.SIGTERM, signal.SIGINT):
+                    logger.info('Arrêt demandé (signal %s)', info.si_signo)
+                    break
+                if info is not None and info.si_signo == signal.SIGHUP:
+                    self.reload()
+                self.reap()
+                self.kill_overdue()
+            self.stop()
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, MASTER_SIGNALS)
+
+    def active(self):
+        return [worker for worker in self.children.values() if worker.retiring_since is None]
+
+    def spawn(self, slot):
+        # Sinon le tampon non vidé serait écrit une fois par processus
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, MASTER_SIGNALS)
+                # Ctrl-C atteint tout le groupe : c'est le maître qui arrête les workers
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                signal.signal(signal.SIGHUP, signal.SIG_IGN)
+                self.run_worker(slot)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        self.children[pid] = WorkerProcess(pid, slot, self.generation)
+        logger.info('Worker %s démarré (n° %s, génération %s)', pid, slot, self.generation)
+        return pid
+
+    def spawn_missing(self):
+        if time.monotonic() < self.next_spawn:
+            return
+        used = {worker.slot for worker in self.active()}
+        for slot in range(self.workers):
+            if slot not in used:
+                self.spawn(slot)
+
+    def reap(self):
+        """Récupère les workers terminés et programme la relance des workers actifs"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            worker = self.children.pop(pid, None)
+            if worker is None or worker.retiring_since is not None:
+                continue
+
+            uptime = time.monotonic() - worker.started
+            self.restarts += 1
+            # Mort au démarrage (import, configuration) : éviter de boucler
+            if uptime < self.min_uptime:
+                self.backoff = min(max(self.backoff * 2, 0.5), self.max_backoff)
+            else:
+                self.backoff = 0.0
+            self.next_spawn = time.monotonic() + self.backoff
+            logger.warning('Worker %s arrêté (code %s) après %.1f s, relance dans %.1f s',
+                           pid, os.waitstatus_to_exitcode(status), uptime, self.backoff)
+
+    def reload(self):
+        """Démarre une nouvelle génération puis arrête en douceur l'ancienne"""
+        self.generation += 1
+        retiring = self.active()
+        logger.info('Rechargement : génération %s', self.generation)
+        for worker in retiring:
+            self.spawn(worker.slot)
+        for worker in retiring:
+            self.retire(worker)
+
+    def retire(self, worker):
+        worker.retiring_since = time.monotonic()
+        try:
+            os.kill(worker.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def kill_overdue(self):
+        now = time.monotonic()
+        for worker in list(self.children.values()):
+            if worker.retiring_since is not None and now - worker.retiring_since > self.graceful_timeout:
+                logger.warning('Worker %s toujours actif après %s s, arrêt forcé', worker.pid, self.graceful_timeout)
+                try:
+                    os.kill(worker.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+    def stop(self):
+        for worker in self.active():
+            self.retire(worker)
+        while self.children:
+            self.reap()
+            self.kill_overdue()
+            if self.children:
+                signal.sigtimedwait((signal.SIGCHLD,), 0.1)
+
+def serve_waitress(app, sock, graceful_timeout=30.0, on_exit=None, **adjustments):
+    """Sert la socket partagée avec Waitress dans un worker
+
+    Sur SIGTERM (ou si le maître disparaît), le worker cesse d'accepter des
+    connexions (les autres workers prennent le relais sur la même socket),
+    attend la fin des requêtes en cours, au plus `graceful_timeout` secondes,
+    puis quitte après `on_exit()`.
+    """
+    from waitress.server import create_server
+
+    server = create_server(app, sockets=[sock], **adjustments)
+    dispatcher = server.task_dispatcher
+    master = os.getppid()
+    stopping = threading.Event()
+
+    def handle_term(signum, frame):
+        # Exécuté dans le thread principal, celui de la boucle asyncore
+        server.accepting = False
+        stopping.set()
+
+    def drain():
+        while not stopping.wait(1.0):
+            if os.getppid() != master:
+                os.kill(os.getpid(), signal.SIGTERM)
+        deadline = time.monotonic() + graceful_timeout
+        while time.monotonic() < deadline and (dispatcher.active_count > 0 or dispatcher.queue):
+            time.sleep(0.05)
+        if on_exit is not None:
+            on_exit()
+        os._exit(0)
+
+    signal.signal(signal.SIGTERM, handle_term)
+    threading.Thread(target=drain, name='prefork-drain', daemon=True).start()
+    server.run()
@@ -0,0 +1,86 @@
+import re
+from flask import request, Response
+from sqlalchemy import insert, select, update
+from app.models import db, User, TaskTombstone
+
+ETAG_PATTERN = re.compile(r'u(\d+)-r(\d+)')
+
+class PreconditionFailed(ValueError):
+    """If-Match ne désigne pas les tâches de l'utilisateur"""
+
+def bump_task_revision(user_id):
+    """Incrémente le compteur de modifications des tâches d'un utilisateur
+
+    À appeler dans la transaction de chaque écriture sur les tâches ; renvoie
+    la nouvelle révision. Elle est publiée aux flux SSE après le commit.
+    """
+    revision = db.session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(task_revision=User.task_revision + 1)
+        .returning(User.task_revision),
+        execution_options={'synchronize_session': False}
+    ).scalar_one()
+    db.session.info.setdefault('task_revisions', {})[user_id] = revision
+    return revision
+
+def record_deletions(user_id, task_ids, revision):
+    """Enregistre les pierres tombales des tâches supprimées à cette révision"""
+    if task_ids:
+        db.session.execute(insert(TaskTombstone), [
+            {'task_id': task_id, 'user_id': user_id, 'revision': revision}
+            for task_id in task_ids
+        ])
+
+def current_task_revision(user_id):
+    """Révision courante des tâches d'un utilisateur (une lecture par clé primaire)"""
+    return db.session.scalar(select(User.task_revision).where(User.id == user_id)) or 0
+
+def revision_poller(engine, user_id):
+    """Lecture de la révision hors session, utilisable après la fin de la requête"""
+    statement = select(User.task_revision).where(User.id == user_id)
+    
+    def poll():
+        with engine.connect() as connection:
+            return connection.scalar(statement) or 0
+    return poll
+
+def task_etag(user_id, revision=None):
+    """ETag fort des lectures de tâches : change à chaque écriture de l'utilisateur"""
+    if revision is None:
+        revision = current_task_revision(user_id)
+    return f'u{user_id}-r{revision}'
+
+def if_match_revision(user_id):
+    """Révision désignée par If-Match, ou None sans en-tête (ou avec '*')
+
+    Une tâche n'a pas changé depuis une lecture à la révision R si sa colonne
+    `revision` vaut au plus R : l'ETag de la liste suffit, sans version propre
+    à chaque tâche. Les ETags faibles (réponses compressées) sont acceptés ;
+    lève PreconditionFailed si aucun ETag ne correspond à l'utilisateur.
+    """
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+    revisions = []
+    for etag in if_match.as_set(include_weak=True):
+        match = ETAG_PATTERN.fullmatch(etag)
+        if match and int(match.group(1)) == user_id:
+            revisions.append(int(match.group(2)))
+    if not revisions:
+        raise PreconditionFailed(if_match.to_header())
+    return max(revisions)
+
+def not_modified(etag):
+    """Réponse 304 si le client possède déjà la version courante, sinon None"""
+    # Comparaison faible (RFC 9110) : la version compressée porte W/"..."
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        return with_etag(response, etag)
+    return None
+
+def with_etag(response, etag):
+    """Ajoute l'ETag et force la revalidation par le navigateur"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -1,10 +1,39 @@
-from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for
+from flask import (Blueprint, Response, render_template, request, jsonify, flash, redirect, url_for,
+                   current_app, stream_with_context, abort)
 from flask_login import login_required, current_user
-from app.models import db, Task, TaskStatus
+from app.models import db, ArchivedTask, Task, TaskStatus
+from app.pagination import encode_cursor, decode_cursor, keyset_filter, InvalidCursor
+from app.validation import task_values, TaskValidationError
+from app.batch import plan_batch, apply_batch, BatchValidationError
+from app.revisions import (bump_task_revision, record_deletions, current_task_revision,
+                           task_etag, not_modified, with_etag, if_match_revision, PreconditionFailed,
+                           revision_poller)
+from app.sync import changes_since
+from app.events import event_stream, StreamCapacityError
+from app.export import EXPORT_FORMATS, export_query, gzip_chunks
+from app.importer import IMPORT_FORMATS, decode_lines, detect_format, parse_records, import_tasks
+from app.search import search_tasks
+from app.archive import with_archived
+from app.stats import user_stats
+from app.jobs import recent_reminders
+from app.instrumentation import timed
+from app.serialization import TASK_FIELDS, TASK_COLUMNS, row_to_dict, json_response
+from sqlalchemy import select, update
 from datetime import datetime
 
 main_bp = Blueprint('main', __name__)
 
+def include_archived():
+    """Paramètre `include_archived` (1, true ou yes) : tâches archivées comprises"""
+    return request.args.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+def page_limit():
+    """Paramètre `limit` borné à TASKS_MAX_PAGE_SIZE, ou None s'il est invalide"""
+    limit = request.args.get('limit', current_app.config['TASKS_PAGE_SIZE'], type=int)
+    if limit is None or limit < 1:
+        return None
+    return min(limit, current_app.config['TASKS_MAX_PAGE_SIZE'])
+
 @main_bp.route('/')
 def index():
     """Page d'accueil"""
@@ -21,15 +50,290 @@ def tasks():
 @main_bp.route('/api/tasks', methods=['GET'])
 @login_required
 def get_tasks():
-    """API: Récupérer les tâches de l'utilisateur"""
+    """API: Récupérer les tâches de l'utilisateur
+
+    Sans `limit` ni `cursor`, renvoie la liste complète (comportement historique).
+    Avec l'un des deux, renvoie une page {'tasks': [...], 'next_cursor': ...,
+    'sync_token': ...} ; le jeton sert ensuite à /api/tasks/changes.
+    Les tâches archivées n'apparaissent qu'avec `include_archived=1`.
+    Répond 304 sans lire les tâches si l'ETag envoyé est toujours valable.
+    """
+    # Lire la révision avant les lignes : l'ETag n'est jamais plus récent que le contenu
+    revision = current_task_revision(current_user.id)
+    etag = task_etag(current_user.id, revision)
+    unchanged = not_modified(etag)
+    if unchanged:
+        return unchanged
+    
+    status_filter = request.args.get('status')
+    status = TaskStatus(status_filter) if status_filter else None
+    
+    if include_archived():
+        # UNION ALL fusionné par SQLite : deux parcours d'index, sans tri
+        combined = with_archived(current_user.id, TASK_FIELDS, status)
+        columns = (combined.c.priority, combined.c.created_at, combined.c.id)
+        query = db.session.query(*[combined.c[field] for field in TASK_FIELDS])
+    else:
+        columns = (Task.priority, Task.created_at, Task.id)
+        query = Task.query.filter_by(user_id=current_user.id)
+        if status is not None:
+            query = query.filter_by(status=status)
+        # Lecture des seules colonnes sérialisées : ni objets Task ni identity map
+        query = query.with_entities(*TASK_COLUMNS)
+    
+    ordering = [column.desc() for column in columns]
+    
+    if 'limit' not in request.args and 'cursor' not in request.args:
+        rows = query.order_by(*ordering).all()
+        with timed('serialize'):
+            payload = [row_to_dict(row) for row in rows]
+        return with_etag(json_response(payload), etag)
+    
+    # Pagination par curseur (keyset)
+    limit = page_limit()
+    if limit is None:
+        return jsonify({'error': 'Paramètre limit invalide'}), 400
+    
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            query = query.filter(keyset_filter(*decode_cursor(cursor), columns=columns))
+        except InvalidCursor:
+            return jsonify({'error': 'Curseur invalide'}), 400
+    
+    # Une ligne de plus pour savoir s'il reste une page
+    rows = query.order_by(*ordering).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    with timed('serialize'):
+        payload = [row_to_dict(row) for row in rows[:limit]]
+    
+    return with_etag(json_response({
+        'tasks': payload,
+        'next_cursor': next_cursor,
+        'sync_token': str(revision)
+    }), etag)
+
+@main_bp.route('/api/tasks/changes', methods=['GET'])
+@login_required
+def get_task_changes():
+    """API: Tâches créées, modifiées ou supprimées depuis un jeton de synchronisation
+
+    Renvoie {'changed': [...], 'deleted': [ids], 'token': ...} ; si trop de
+    changements se sont accumulés ou si le jeton précède des suppressions
+    purgées (TOMBSTONE_RETENTION_DAYS), renvoie {'resync': true, 'token': ...}
+    et le client doit recharger la liste complète.
+    """
+    try:
+        since = int(request.args.get('since', ''))
+        if since < 0:
+            raise ValueError(since)
+    except ValueError:
+        return jsonify({'error': 'Jeton de synchronisation invalide'}), 400
+    
+    changes = changes_since(current_user.id, since, current_app.config['TASKS_SYNC_MAX_CHANGES'])
+    if changes is None:
+        return jsonify({'error': 'Jeton de synchronisation invalide'}), 400
+    # ETag de la liste à la révision du jeton, utilisable dans If-Match
+    return with_etag(jsonify(changes), task_etag(current_user.id, int(changes['token'])))
+
+@main_bp.route('/api/tasks/reminders', methods=['GET'])
+@login_required
+def get_task_reminders():
+    """API: Derniers rappels d'échéance (tâches bientôt dues ou en retard)
+
+    Émis par la tâche de fond `due_reminders` ; un rappel disparaît quand la
+    tâche est terminée, supprimée ou que son échéance change.
+    """
+    return jsonify({'reminders': recent_reminders(current_user.id, current_app.config['TASKS_PAGE_SIZE'])})
+
+@main_bp.route('/api/tasks/stats', methods=['GET'])
+@login_required
+def get_task_stats():
+    """API: Statistiques des tâches (par statut, par priorité, en retard)"""
+    return jsonify(user_stats(current_user.id))
+
+@main_bp.route('/api/tasks/search', methods=['GET'])
+@login_required
+def search_tasks_endpoint():
+    """API: Recherche plein texte dans les titres et descriptions
+
+    Les mots saisis sont cherchés par préfixe et les résultats classés par
+    pertinence (bm25), limités aux tâches de l'utilisateur.
+    """
+    raw_query = request.args.get('q', '').strip()
+    if not raw_query:
+        return jsonify({'error': 'Paramètre q requis'}), 400
+    
+    limit = page_limit()
+    if limit is None:
+        return jsonify({'error': 'Paramètre limit invalide'}), 400
+    
+    tasks = search_tasks(current_user.id, raw_query, limit)
+    with timed('serialize'):
+        payload = [task.to_dict() for task in tasks]
+    return jsonify(payload)
+
+@main_bp.route('/api/tasks/archive', methods=['GET'])
+@login_required
+def get_archived_tasks():
+    """API: Tâches terminées archivées (lecture seule)
+
+    Renvoie une page {'tasks': [...], 'next_cursor': ...} dans l'ordre de la
+    liste des tâches, ou avec `q` les tâches archivées correspondant à la
+    recherche plein texte, les plus pertinentes d'abord (sans page suivante).
+    """
+    limit = page_limit()
+    if limit is None:
+        return jsonify({'error': 'Paramètre limit invalide'}), 400
+    
+    raw_query = request.args.get('q', '').strip()
+    if raw_query:
+        tasks = search_tasks(current_user.id, raw_query, limit, model=ArchivedTask)
+        return jsonify({'tasks': [task.to_dict() for task in tasks], 'next_cursor': None})
+    
+    columns = (ArchivedTask.priority, ArchivedTask.created_at, ArchivedTask.id)
+    query = ArchivedTask.query.filter_by(user_id=current_user.id)
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            query = query.filter(keyset_filter(*decode_cursor(cursor), columns=columns))
+        except InvalidCursor:
+            return jsonify({'error': 'Curseur invalide'}), 400
+    
+    tasks = query.order_by(*[column.desc() for column in columns]).limit(limit + 1).all()
+    next_cursor = encode_cursor(tasks[limit - 1]) if len(tasks) > limit else None
+    with timed('serialize'):
+        payload = [task.to_dict() for task in tasks[:limit]]
+    return jsonify({'tasks': payload, 'next_cursor': next_cursor})
+
+@main_bp.route('/api/tasks/archive/<int:task_id>', methods=['GET'])
+@login_required
+def get_archived_task(task_id):
+    """API: Récupérer une tâche archivée"""
+    task = ArchivedTask.query.filter_by(id=task_id, user_id=current_user.id).first_or_404()
+    return jsonify(task.to_dict())
+
+@main_bp.route('/api/tasks/export', methods=['GET'])
+@login_required
+def export_tasks():
+    """API: Export en flux (NDJSON ou CSV) des tâches de l'utilisateur
+
+    Les lignes sont lues par lots via un curseur côté serveur et envoyées au
+    fil de l'eau : la mémoire reste constante quel que soit le volume.
+    Compressé en gzip si le client l'accepte ; `include_archived=1` ajoute
+    les tâches archivées.
+    """
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': 'Format d\'export invalide'}), 400
+    
     status_filter = request.args.get('status')
-    query = Task.query.filter_by(user_id=current_user.id)
+    try:
+        status = TaskStatus(status_filter) if status_filter else None
+    except ValueError:
+        return jsonify({'error': 'Statut invalide'}), 400
     
-    if status_filter:
-        query = query.filter_by(status=TaskStatus(status_filter))
+    serializer, mimetype, extension = EXPORT_FORMATS[export_format]
+    batch_size = current_app.config['TASKS_EXPORT_BATCH_SIZE']
+    rows = export_query(current_user.id, status, batch_size, include_archived=include_archived())
+    chunks = serializer(rows, batch_size)
     
-    tasks = query.order_by(Task.priority.desc(), Task.created_at.desc()).all()
-    return jsonify([task.to_dict() for task in tasks])
+    headers = {'Content-Disposition': f'attachment; filename=tasks.{extension}'}
+    if 'gzip' in request.accept_encodings:
+        chunks = gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+    
+    # Le contexte de requête (et la session) reste actif pendant la diffusion
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+@main_bp.route('/api/tasks/import', methods=['POST'])
+@login_required
+def import_tasks_endpoint():
+    """API: Import en masse depuis un fichier NDJSON ou CSV
+
+    Accepte un fichier multipart (champ `file`) ou le corps brut de la requête.
+    Le fichier est lu ligne à ligne et inséré par lots ; la réponse résume les
+    lignes acceptées et rejetées (avec leur numéro). Une ligne qui n'est pas
+    de l'UTF-8 arrête l'import (400) : les lots précédents restent
+    enregistrés, le résumé donne leur nombre et la ligne fautive.
+    """
+    upload = request.files.get('file')
+    if upload is not None:
+        stream, filename = upload.stream, upload.filename
+    else:
+        stream, filename = request.stream, None
+    
+    import_format = request.args.get('format') or detect_format(filename, default=None)
+    if import_format is None:
+        import_format = 'csv' if request.mimetype == 'text/csv' else 'ndjson'
+    if import_format not in IMPORT_FORMATS:
+        return jsonify({'error': 'Format d\'import invalide'}), 400
+    
+    summary = import_tasks(
+        parse_records(decode_lines(stream), import_format), current_user.id,
+        chunk_size=current_app.config['TASKS_IMPORT_CHUNK_SIZE']
+    )
+    if 'aborted' in summary:
+        # Import partiel : le résumé indique les lignes déjà enregistrées
+        return jsonify(dict(summary, error=f"Import interrompu : {summary['aborted']['error']}")), 400
+    
+    return jsonify(summary)
+
+@main_bp.route('/api/tasks/stream', methods=['GET'])
+@login_required
+def stream_task_events():
+    """API: Flux Server-Sent Events des changements de tâches
+
+    Chaque événement porte la nouvelle révision ; le client appelle alors
+    /api/tasks/changes. Le nombre de flux simultanés est borné pour préserver
+    les threads Waitress de l'API.
+    """
+    bus = current_app.extensions['task_events']
+    try:
+        subscription = bus.subscribe(current_user.id)
+    except StreamCapacityError:
+        response = jsonify({'error': 'Trop de flux ouverts'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(current_app.config['SSE_RETRY_AFTER'])
+        return response
+    
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
+    
+    config = current_app.config
+    # Plusieurs workers : le bus ne voit que les écritures de ce processus
+    poll = revision_poller(db.engine, current_user.id) if config['WEB_WORKERS'] > 1 else None
+    stream = event_stream(
+        bus, subscription,
+        current_revision=current_task_revision(current_user.id),
+        last_event_id=last_event_id,
+        heartbeat=config['SSE_HEARTBEAT'],
+        timeout=config['SSE_STREAM_TIMEOUT'],
+        retry_ms=config['SSE_RETRY_AFTER'] * 1000,
+        poll=poll,
+        poll_interval=config['SSE_POLL_INTERVAL']
+    )
+    # Le générateur n'utilise pas la base : la session est libérée à la fin
+    # de la requête, avant la diffusion du flux
+    return Response(stream, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@main_bp.route('/api/tasks/<int:task_id>', methods=['GET'])
+@login_required
+def get_task(task_id):
+    """API: Récupérer une tâche"""
+    etag = task_etag(current_user.id)
+    unchanged = not_modified(etag)
+    if unchanged:
+        return unchanged
+    
+    task = Task.query.filter_by(id=task_id, user_id=current_user.id).first_or_404()
+    return with_etag(jsonify(task.to_dict()), etag)
 
 @main_bp.route('/api/tasks', methods=['POST'])
 @login_required
@@ -40,21 +344,13 @@ def create_task():
     if not data or not data.get('title'):
         return jsonify({'error': 'Le titre est requis'}), 400
     
-    # Gestion de la date d'échéance
-    due_date = None
-    if data.get('due_date'):
-        try:
-            due_date = datetime.fromisoformat(data['due_date'].replace('Z', '+00:00'))
-        except ValueError:
-            return jsonify({'error': 'Format de date invalide'}), 400
-    
-    task = Task(
-        title=data['title'],
-        description=data.get('description', ''),
-        priority=data.get('priority', 1),
-        due_date=due_date,
-        user_id=current_user.id
-    )
+    try:
+        values = task_values(data)
+    except TaskValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    task = Task(user_id=current_user.id, **values)
+    task.revision = bump_task_revision(current_user.id)
     
     db.session.add(task)
     db.session.commit()
@@ -68,25 +364,64 @@ def update_task(task_id):
     task = Task.query.filter_by(id=task_id, user_id=current_user.id).first_or_404()
     data = request.get_json()
     
-    if 'title' in data:
-        task.title = data['title']
-    if 'description' in data:
-        task.description = data['description']
-    if 'priority' in data:
-        task.priority = data['priority']
-    if 'status' in data:
-        task.status = TaskStatus(data['status'])
-    if 'due_date' in data:
-        if data['due_date']:
-            task.due_date = datetime.fromisoformat(data['due_date'].replace('Z', '+00:00'))
-        else:
-            task.due_date = None
+    try:
+        values = task_values(data, partial=True)
+    except TaskValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    for field, value in values.items():
+        setattr(task, field, value)
     
     task.updated_at = datetime.utcnow()
+    task.revision = bump_task_revision(current_user.id)
     db.session.commit()
     
     return jsonify(task.to_dict())
 
+@main_bp.route('/api/tasks/<int:task_id>', methods=['PATCH'])
+@login_required
+def patch_task(task_id):
+    """API: Modifier les champs fournis d'une tâche, sans la lire au préalable
+
+    Une seule requête UPDATE ... RETURNING sur la tâche, en plus de l'incrément
+    de la révision. Avec If-Match (ETag d'une lecture de la liste ou d'une
+    écriture précédente), répond 412 si la tâche a été modifiée depuis.
+    """
+    try:
+        values = task_values(request.get_json(silent=True), partial=True)
+        seen = if_match_revision(current_user.id)
+    except TaskValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except PreconditionFailed:
+        return jsonify({'error': 'ETag If-Match invalide'}), 412
+    
+    if not values:
+        return jsonify({'error': 'Aucun champ à modifier'}), 400
+    
+    revision = bump_task_revision(current_user.id)
+    conditions = [Task.id == task_id, Task.user_id == current_user.id]
+    if seen is not None:
+        conditions.append(Task.revision <= seen)
+    row = db.session.execute(
+        update(Task)
+        .where(*conditions)
+        .values(updated_at=datetime.utcnow(), revision=revision, **values)
+        .returning(*TASK_COLUMNS),
+        execution_options={'synchronize_session': False}
+    ).first()
+    
+    if row is None:
+        db.session.rollback()
+        # Distinguer une tâche absente d'une tâche modifiée entre-temps
+        if seen is not None and db.session.scalar(
+            select(Task.id).where(Task.id == task_id, Task.user_id == current_user.id)
+        ):
+            return jsonify({'error': 'La tâche a été modifiée entre-temps'}), 412
+        abort(404)
+    
+    db.session.commit()
+    return with_etag(jsonify(row_to_dict(row)), task_etag(current_user.id, revision))
+
 @main_bp.route('/api/tasks/<int:task_id>', methods=['DELETE'])
 @login_required
 def delete_task(task_id):
@@ -94,15 +429,84 @@ def delete_task(task_id):
     task = Task.query.filter_by(id=task_id, user_id=current_user.id).first_or_404()
     
     db.session.delete(task)
+    record_deletions(current_user.id, [task.id], bump_task_revision(current_user.id))
     db.session.commit()
     
     return jsonify({'message': 'Tâche supprimée avec succès'})
 
+@main_bp.route('/api/tasks/batch', methods=['POST'])
+@login_required
+def batch_tasks():
+    """API: Créer, modifier et supprimer des tâches en une seule transaction
+
+    Corps: {"operations": [{"op": "create", "data": {...}},
+                           {"op": "update", "id": 1, "data": {...}},
+                           {"op": "delete", "id": 2}]}
+    Toutes les opérations sont validées avant écriture : une seule erreur
+    annule le lot entier (400) avec le détail par opération.
+    """
+    data = request.get_json(silent=True)
+    operations = data.get('operations') if isinstance(data, dict) else None
+    
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'error': 'Liste d\'opérations requise'}), 400
+    if len(operations) > current_app.config['TASKS_BATCH_MAX_OPERATIONS']:
+        return jsonify({'error': 'Trop d\'opérations dans le lot'}), 400
+    
+    try:
+        plan = plan_batch(operations, current_user.id)
+    except BatchValidationError as e:
+        return jsonify({'error': 'Lot invalide', 'results': e.results}), 400
+    
+    results = apply_batch(plan, current_user.id)
+    return jsonify({'results': results})
+
 @main_bp.route('/health')
 def health_check():
-    """Endpoint de santé pour le monitoring"""
-    return jsonify({
-        'status': 'healthy',
+    """Endpoint de santé pour le monitoring
+
+    Exécute un `SELECT 1` chronométré ; répond 503 si la base ne répond pas
+    avant HEALTH_DB_TIMEOUT secondes. Public : ni message d'erreur de la
+    base (journalisé par la sonde) ni statistiques internes, voir /health/details.
+    """
+    database_ok = current_app.extensions['database_probe'].check()[0]
+    payload = {
+        'status': 'healthy' if database_ok else 'unhealthy',
         'timestamp': datetime.utcnow().isoformat(),
-        'database': 'connected' if db.engine else 'disconnected'
-    })
\ No newline at end of file
+        'database': 'connected' if database_ok else 'disconnected'
+    }
+    if not database_ok:
+        payload['error'] = 'Base de données indisponible'
+    return jsonify(payload), 200 if database_ok else 503
+
+@main_bp.route('/health/details')
+def health_details():
+    """Santé détaillée (latence, erreur de la base, caches, hachage, pool)
+
+    Désactivé par défaut (HEALTH_DETAILS_ENABLED) : à n'activer que derrière
+    un accès interne, comme /metrics.
+    """
+    if not current_app.config['HEALTH_DETAILS_ENABLED']:
+        return jsonify({'error': 'Détails de santé désactivés'}), 404
+    user_cache = current_app.extensions.get('user_cache')
+    pool_stats = current_app.extensions.get('db_pool')
+    database_ok, latency_ms, error = current_app.extensions['database_probe'].check()
+    response = jsonify({
+        'status': 'healthy' if database_ok else 'unhealthy',
+        'timestamp': datetime.utcnow().isoformat(),
+        'database': 'connected' if database_ok else 'disconnected',
+        'database_latency_ms': latency_ms,
+        'database_error': error,
+        'user_cache': user_cache.stats() if user_cache else None,
+        'password_hasher': current_app.extensions['password_hasher'].stats(),
+        'db_pool': dict(pool_stats.stats(), status=db.engine.pool.status()) if pool_stats else None
+    })
+    return response, 200 if database_ok else 503
+
+@main_bp.route('/metrics')
+def metrics():
+    """Métriques du processus au format texte Prometheus"""
+    registry = current_app.extensions.get('metrics')
+    if registry is None:
+        return jsonify({'error': 'Métriques désactivées'}), 404
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
\ No newline at end of file
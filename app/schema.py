@@ -0,0 +1,116 @@
+import glob
+import logging
+import os
+import re
+import time
+from sqlalchemy import inspect, text
+from app.models import db
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+SCHEMA_MODES = ('skip', 'check', 'create')
+
+REVISION_PATTERN = re.compile(r"^(down_revision|revision)\s*=\s*(.+)$", re.MULTILINE)
+
+class SchemaOutOfDate(RuntimeError):
+    """La base n'est pas à la tête des migrations Alembic"""
+
+def migration_heads():
+    """Révisions Alembic de tête des scripts de migration
+
+    Lit les identifiants `revision` / `down_revision` des fichiers sans
+    importer Alembic (plus de 100 ms au démarrage d'un worker).
+    """
+    revisions, parents = set(), set()
+    for path in glob.glob(os.path.join(MIGRATIONS_DIR, 'versions', '*.py')):
+        with open(path, encoding='utf-8') as f:
+            for name, value in REVISION_PATTERN.findall(f.read()):
+                identifiers = re.findall(r"['\"]([0-9a-zA-Z_]+)['\"]", value)
+                (revisions if name == 'revision' else parents).update(identifiers)
+    return revisions - parents
+
+def database_revisions(connection):
+    """Révisions Alembic enregistrées dans la base (vide si jamais migrée)"""
+    if not inspect(connection).has_table('alembic_version'):
+        return set()
+    return set(connection.execute(text('SELECT version_num FROM alembic_version')).scalars())
+
+def init_schema():
+    """Crée toutes les tables (triggers compris) et marque la base à la tête Alembic"""
+    # Import différé : Alembic n'est chargé que par cette commande
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+    db.create_all()
+    with db.engine.begin() as connection:
+        MigrationContext.configure(connection).stamp(ScriptDirectory(MIGRATIONS_DIR), 'heads')
+
+def upgrade_schema():
+    """Amène la base à la tête Alembic : init_schema si elle est vierge, sinon upgrade
+
+    Les migrations s'exécutent sur la connexion de l'application (même base
+    que le serveur, quelle que soit la configuration lue par alembic.ini).
+    """
+    from alembic import command
+    from alembic.config import Config as AlembicConfig
+    with db.engine.connect() as connection:
+        empty = not inspect(connection).get_table_names()
+    if empty:
+        init_schema()
+        return
+    alembic_config = AlembicConfig(os.path.join(MIGRATIONS_DIR, 'alembic.ini'))
+    with db.engine.begin() as connection:
+        alembic_config.attributes['connection'] = connection
+        command.upgrade(alembic_config, 'heads')
+
+def check_schema():
+    """Vrai si la base est à la tête Alembic ; journalise l'écart sinon"""
+    heads = migration_heads()
+    with db.engine.connect() as connection:
+        current = database_revisions(connection)
+    if current != heads:
+        logger.warning('Schéma non à jour: base %s, migrations %s '
+                       '(flask db upgrade)',
+                       ', '.join(sorted(current)) or 'vide', ', '.join(sorted(heads)))
+        return False
+    return True
+
+def apply_startup_schema(app):
+    """Travail de schéma au démarrage selon SCHEMA_ON_STARTUP
+
+    'skip' (défaut) : aucun accès à la base ; 'check' : compare la révision
+    Alembic de la base à la tête des migrations et lève SchemaOutOfDate en
+    cas d'écart, plutôt que de servir des requêtes sur des tables ou colonnes
+    absentes ; 'create' : create_all, pratique en développement.
+    """
+    mode = app.config.get('SCHEMA_ON_STARTUP', 'skip')
+    if mode not in SCHEMA_MODES:
+        raise ValueError(f'SCHEMA_ON_STARTUP invalide: {mode}')
+    if mode == 'skip':
+        return
+    with app.app_context():
+        if mode == 'create':
+            db.create_all()
+            logger.info('Tables de base de données créées')
+        elif not check_schema():
+            raise SchemaOutOfDate('Schéma non à jour : lancer run.upgrade_database() '
+                                  '(ou flask db upgrade) avant de démarrer')
+
+class StartupTimer:
+    """Durée de chaque étape de create_app, consultable dans app.extensions['startup']"""
+
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.phases = {}
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self.last) * 1000, 2)
+        self.last = now
+
+    def finish(self, app):
+        total = round((self.last - self.start) * 1000, 2)
+        app.extensions['startup'] = {'total_ms': total, 'phases_ms': self.phases}
+        logger.info('Application prête en %.1f ms (%s)', total,
+                    ', '.join(f'{phase} {duration:.1f}' for phase, duration in self.phases.items()))
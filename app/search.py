@@ -0,0 +1,57 @@
+import re
+from sqlalchemy import text
+from app.models import db, Task
+
+# Poids bm25 des colonnes (title, description) : le titre compte davantage
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+def fts_query(raw_query):
+    """Transforme la saisie utilisateur en requête FTS5 sûre avec préfixes
+
+    Chaque mot devient un terme entre guillemets suivi de `*` (recherche par
+    préfixe) ; les opérateurs FTS5 saisis sont ainsi neutralisés.
+    """
+    terms = re.findall(r'\w+', raw_query)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def search_tasks(user_id, raw_query, limit, model=Task):
+    """Tâches de l'utilisateur correspondant à la recherche, les plus pertinentes d'abord
+
+    `model` vaut Task ou ArchivedTask (index plein texte `<table>_fts`).
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return like_search(user_id, raw_query, limit, model)
+    
+    match = fts_query(raw_query)
+    if not match:
+        return []
+    
+    table = model.__tablename__
+    ranked = db.session.execute(text(
+        f'SELECT {table}_fts.rowid FROM {table}_fts '
+        f'JOIN {table} ON {table}.id = {table}_fts.rowid '
+        f'WHERE {table}_fts MATCH :match AND {table}.user_id = :user_id '
+        f'ORDER BY bm25({table}_fts, :title_weight, :description_weight) '
+        'LIMIT :limit'
+    ), {
+        'match': match,
+        'user_id': user_id,
+        'title_weight': TITLE_WEIGHT,
+        'description_weight': DESCRIPTION_WEIGHT,
+        'limit': limit
+    }).scalars().all()
+    
+    tasks = {task.id: task for task in model.query.filter(model.id.in_(ranked))} if ranked else {}
+    return [tasks[task_id] for task_id in ranked if task_id in tasks]
+
+def like_search(user_id, raw_query, limit, model=Task):
+    """Repli sans FTS5 (autres bases) : tous les mots doivent apparaître"""
+    query = model.query.filter_by(user_id=user_id)
+    terms = re.findall(r'\w+', raw_query)
+    if not terms:
+        return []
+    for term in terms:
+        pattern = f'%{term}%'
+        query = query.filter(db.or_(model.title.ilike(pattern), model.description.ilike(pattern)))
+    return query.order_by(model.priority.desc(), model.created_at.desc()).limit(limit).all()
@@ -0,0 +1,84 @@
+import json
+import re
+from flask import current_app
+from app.models import Task
+from app.instrumentation import timed
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle
+    orjson = None
+
+# Champs de Task.to_dict, dans le même ordre
+TASK_FIELDS = ['id', 'title', 'description', 'status', 'priority', 'due_date', 'created_at', 'user_id']
+TASK_COLUMNS = [getattr(Task, field) for field in TASK_FIELDS]
+
+def row_to_dict(row):
+    """Même représentation que Task.to_dict à partir d'un tuple de colonnes"""
+    task_id, title, description, status, priority, due_date, created_at, user_id = row
+    return {
+        'id': task_id,
+        'title': title,
+        'description': description,
+        'status': status.value,
+        'priority': priority,
+        'due_date': due_date.isoformat() if due_date else None,
+        'created_at': created_at.isoformat(),
+        'user_id': user_id
+    }
+
+class StdlibEncoder:
+    """Encodage identique au provider JSON par défaut de Flask (mode compact)"""
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj, ensure_ascii=True, sort_keys=True, separators=(',', ':')).encode('ascii')
+
+# orjson écrit l'UTF-8 tel quel ; le module json échappe tout ce qui sort de ' '..'~'
+_NON_ASCII = re.compile('[\x7f-\U0010ffff]')
+
+def _escape(match):
+    code = ord(match.group())
+    if code > 0xFFFF:
+        code -= 0x10000
+        return '\\u{0:04x}\\u{1:04x}'.format(0xD800 | (code >> 10), 0xDC00 | (code & 0x3FF))
+    return '\\u{0:04x}'.format(code)
+
+class OrjsonEncoder:
+    """orjson avec clés triées et échappement ASCII : mêmes octets que StdlibEncoder"""
+    name = 'orjson'
+
+    def dumps(self, obj):
+        data = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        if data.isascii() and b'\x7f' not in data:
+            return data
+        return _NON_ASCII.sub(_escape, data.decode('utf-8')).encode('ascii')
+
+def make_encoder(name='auto'):
+    """Encodeur JSON : 'orjson', 'json' ou 'auto' (orjson s'il est installé)"""
+    if name == 'orjson' or (name == 'auto' and orjson is not None):
+        if orjson is None:
+            raise RuntimeError('orjson n\'est pas installé')
+        return OrjsonEncoder()
+    if name not in ('json', 'auto'):
+        raise ValueError(f'Encodeur JSON inconnu: {name}')
+    return StdlibEncoder()
+
+def init_json_encoder(app):
+    encoder = make_encoder(app.config['JSON_ENCODER'])
+    app.extensions['json_encoder'] = encoder
+    return encoder
+
+def json_response(payload):
+    """Réponse JSON via l'encodeur rapide, octet pour octet comme jsonify
+
+    Si le provider de Flask est configuré autrement (sortie indentée en
+    debug, clés non triées, UTF-8 brut), lui délègue la réponse.
+    """
+    provider = current_app.json
+    indented = (provider.compact is None and current_app.debug) or provider.compact is False
+    if indented or not provider.sort_keys or not provider.ensure_ascii:
+        return provider.response(payload)
+    with timed('serialize'):
+        body = current_app.extensions['json_encoder'].dumps(payload) + b'\n'
+    return current_app.response_class(body, mimetype=provider.mimetype)
@@ -0,0 +1,44 @@
+import logging
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+def sqlite_pragmas(config):
+    """Construit la liste des PRAGMA à appliquer à partir de la configuration"""
+    pragmas = [
+        ('busy_timeout', int(config['SQLITE_BUSY_TIMEOUT'])),
+        ('journal_mode', config['SQLITE_JOURNAL_MODE']),
+        ('synchronous', config['SQLITE_SYNCHRONOUS']),
+        ('cache_size', int(config['SQLITE_CACHE_SIZE'])),
+        ('mmap_size', int(config['SQLITE_MMAP_SIZE'])),
+        ('temp_store', 'MEMORY'),
+    ]
+    return [(name, value) for name, value in pragmas if value is not None]
+
+def init_sqlite_tuning(app, engine):
+    """Applique le profil de performance SQLite à chaque nouvelle connexion
+
+    Sans effet si SQLITE_TUNING_ENABLED est faux ou si la base n'est pas SQLite.
+    Le mode WAL permet aux lectures de continuer pendant une écriture et
+    busy_timeout fait attendre les écrivains au lieu d'échouer en « database is locked ».
+    """
+    if not app.config.get('SQLITE_TUNING_ENABLED') or engine.dialect.name != 'sqlite':
+        return False
+
+    pragmas = sqlite_pragmas(app.config)
+    in_memory = engine.url.database in (None, '', ':memory:')
+    if in_memory:
+        # WAL et mmap n'ont pas de sens pour une base en mémoire
+        pragmas = [(name, value) for name, value in pragmas if name not in ('journal_mode', 'mmap_size')]
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+    logger.info('Profil SQLite actif: %s', ', '.join(f'{name}={value}' for name, value in pragmas))
+    return True
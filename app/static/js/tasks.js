@@ -1,7 +1,58 @@
 // Gestion des tâches côté client
+const PAGE_SIZE = 50;
+
+// État de la liste : pagination (défilement infini) et synchronisation différentielle
+const taskList = {
+    status: '',
+    items: [],
+    nextCursor: null,
+    cursorTask: null,
+    syncToken: null,
+    // ETag de la liste à la révision du jeton (If-Match des modifications)
+    etag: null,
+    // ETag renvoyé par nos propres modifications, plus récent que celui de la liste
+    taskEtags: new Map(),
+    loading: false,
+    syncing: false,
+    syncPending: false,
+    generation: 0
+};
+
+// Réponses déjà reçues, revalidées par ETag (If-None-Match)
+const etagCache = new Map();
+const ETAG_CACHE_SIZE = 100;
+
+async function fetchJson(url) {
+    const cached = etagCache.get(url);
+    const headers = cached ? { 'If-None-Match': cached.etag } : {};
+    
+    // Le cache HTTP du navigateur est contourné : la revalidation est gérée ici
+    const response = await fetch(url, { headers, cache: 'no-store' });
+    
+    if (response.status === 304 && cached) {
+        return cached.data;
+    }
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+    }
+    
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+    if (etag) {
+        etagCache.delete(url);
+        etagCache.set(url, { etag, data });
+        if (etagCache.size > ETAG_CACHE_SIZE) {
+            etagCache.delete(etagCache.keys().next().value);
+        }
+    }
+    return data;
+}
+
 document.addEventListener('DOMContentLoaded', function() {
     loadTasks();
     setupEventListeners();
+    setupInfiniteScroll();
+    setupLiveUpdates();
 });
 
 function setupEventListeners() {
@@ -21,27 +72,171 @@ function setupEventListeners() {
     });
 }
 
-async function loadTasks(status = '') {
+function setupInfiniteScroll() {
+    const sentinel = document.getElementById('tasks-sentinel');
+    if (!sentinel || !('IntersectionObserver' in window)) return;
+    
+    // Charger la page suivante quand le bas de la liste devient visible
+    const observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) {
+            loadMoreTasks();
+        }
+    }, { rootMargin: '200px' });
+    observer.observe(sentinel);
+}
+
+// Délai avant de rouvrir un flux refusé (503, serveur arrêté), doublé à chaque échec
+const STREAM_RETRY_MIN_MS = 5000;
+const STREAM_RETRY_MAX_MS = 60000;
+
+function setupLiveUpdates(retryDelay = STREAM_RETRY_MIN_MS, reopened = false) {
+    if (!('EventSource' in window)) return;
+    
+    // Changements faits depuis un autre onglet ou appareil ; EventSource
+    // se reconnecte seul quand le serveur ferme le flux
+    const source = new EventSource('/api/tasks/stream');
+    source.addEventListener('open', () => {
+        retryDelay = STREAM_RETRY_MIN_MS;
+        if (reopened) {
+            // Changements manqués pendant l'interruption
+            reopened = false;
+            syncChanges();
+        }
+    });
+    source.addEventListener('tasks', event => {
+        const { revision } = JSON.parse(event.data);
+        if (taskList.syncToken === null || revision > Number(taskList.syncToken)) {
+            syncChanges();
+        }
+    });
+    source.addEventListener('error', () => {
+        // Une réponse autre que 200 (trop de flux ouverts) ferme définitivement
+        // l'EventSource : le rouvrir après un délai aléatoire croissant
+        if (source.readyState !== EventSource.CLOSED) return;
+        const delay = retryDelay * (0.5 + Math.random() / 2);
+        setTimeout(() => setupLiveUpdates(Math.min(retryDelay * 2, STREAM_RETRY_MAX_MS), true), delay);
+    });
+}
+
+async function loadTasks(status = taskList.status) {
+    // Repartir de la première page
+    taskList.status = status;
+    taskList.items = [];
+    taskList.nextCursor = null;
+    taskList.cursorTask = null;
+    taskList.syncToken = null;
+    taskList.etag = null;
+    taskList.taskEtags.clear();
+    taskList.generation++;
+    await fetchTaskPage(false);
+}
+
+async function loadMoreTasks() {
+    if (!taskList.nextCursor || taskList.loading) return;
+    await fetchTaskPage(true);
+}
+
+async function fetchTaskPage(append) {
+    const generation = taskList.generation;
+    taskList.loading = true;
     try {
-        const url = status ? `/api/tasks?status=${status}` : '/api/tasks';
-        const response = await fetch(url);
+        const params = new URLSearchParams({ limit: PAGE_SIZE });
+        if (taskList.status) params.set('status', taskList.status);
+        if (append && taskList.nextCursor) params.set('cursor', taskList.nextCursor);
+        
+        const url = `/api/tasks?${params}`;
+        const page = await fetchJson(url);
+        // Ignorer une page arrivée après un rechargement de la liste
+        if (generation !== taskList.generation) return;
         
+        taskList.nextCursor = page.next_cursor;
+        taskList.cursorTask = page.tasks[page.tasks.length - 1] || taskList.cursorTask;
+        if (!append) {
+            // Le jeton de la première page est le plus ancien : rien ne peut manquer
+            taskList.syncToken = page.sync_token;
+            const cached = etagCache.get(url);
+            taskList.etag = cached ? cached.etag : null;
+        }
+        displayTasks(page.tasks, append);
+    } catch (error) {
+        console.error('Erreur:', error);
+        showAlert('Erreur lors du chargement des tâches', 'danger');
+    } finally {
+        taskList.loading = false;
+    }
+}
+
+async function syncChanges() {
+    // Appliquer uniquement les changements depuis le dernier jeton
+    if (taskList.syncToken === null) {
+        return loadTasks();
+    }
+    // Une seule synchronisation à la fois ; relancer ensuite si demandé entre-temps
+    if (taskList.syncing) {
+        taskList.syncPending = true;
+        return;
+    }
+    
+    const generation = taskList.generation;
+    taskList.syncing = true;
+    try {
+        const response = await fetch(`/api/tasks/changes?since=${encodeURIComponent(taskList.syncToken)}`, { cache: 'no-store' });
         if (!response.ok) {
-            throw new Error('Erreur lors du chargement des tâches');
+            throw new Error('Erreur lors de la synchronisation');
         }
         
-        const tasks = await response.json();
-        displayTasks(tasks);
+        const changes = await response.json();
+        if (generation !== taskList.generation) return;
+        
+        if (changes.resync) {
+            return loadTasks();
+        }
+        applyChanges(changes);
+        taskList.syncToken = changes.token;
+        taskList.etag = response.headers.get('ETag');
     } catch (error) {
         console.error('Erreur:', error);
-        showAlert('Erreur lors du chargement des tâches', 'danger');
+        loadTasks();
+    } finally {
+        taskList.syncing = false;
+        if (taskList.syncPending) {
+            taskList.syncPending = false;
+            syncChanges();
+        }
     }
 }
 
-function displayTasks(tasks) {
+function applyChanges(changes) {
+    const replaced = new Set(changes.deleted);
+    changes.changed.forEach(task => replaced.add(task.id));
+    // La liste reflète désormais ces tâches : l'ETag de la liste suffit
+    replaced.forEach(id => taskList.taskEtags.delete(id));
+    
+    const items = taskList.items.filter(task => !replaced.has(task.id));
+    changes.changed.forEach(task => {
+        if (taskList.status && task.status !== taskList.status) return;
+        // Au-delà du curseur, la tâche arrivera avec les pages suivantes
+        if (taskList.nextCursor && taskList.cursorTask && compareTasks(task, taskList.cursorTask) > 0) return;
+        items.push(task);
+    });
+    
+    items.sort(compareTasks);
+    displayTasks(items);
+}
+
+function compareTasks(a, b) {
+    // Même ordre que l'API : priorité, date de création puis id décroissants
+    return (b.priority - a.priority)
+        || (a.created_at < b.created_at ? 1 : a.created_at > b.created_at ? -1 : 0)
+        || (b.id - a.id);
+}
+
+function displayTasks(tasks, append = false) {
     const container = document.getElementById('tasks-container');
     
-    if (tasks.length === 0) {
+    taskList.items = append ? taskList.items.concat(tasks) : tasks;
+    
+    if (taskList.items.length === 0) {
         container.innerHTML = `
             <div class="col-12">
                 <div class="alert alert-info text-center">
@@ -52,7 +247,16 @@ function displayTasks(tasks) {
         return;
     }
     
-    container.innerHTML = tasks.map(task => `
+    const html = tasks.map(renderTask).join('');
+    if (append) {
+        container.insertAdjacentHTML('beforeend', html);
+    } else {
+        container.innerHTML = html;
+    }
+}
+
+function renderTask(task) {
+    return `
         <div class="col-md-6 col-lg-4 mb-4">
             <div class="card task-card priority-${task.priority} h-100">
                 <div class="card-body">
@@ -87,7 +291,7 @@ function displayTasks(tasks) {
                 </div>
             </div>
         </div>
-    `).join('');
+    `;
 }
 
 function getStatusBadgeColor(status) {
@@ -119,18 +323,19 @@ async function handleTaskSubmit(event) {
     };
     
     const taskId = document.getElementById('taskId').value;
-    const url = taskId ? `/api/tasks/${taskId}` : '/api/tasks';
-    const method = taskId ? 'PUT' : 'POST';
     
     try {
-        const response = await fetch(url, {
-            method: method,
+        const response = taskId ? await patchTask(taskId, formData) : await fetch('/api/tasks', {
+            method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
             },
             body: JSON.stringify(formData)
         });
         
+        if (response.status === 412) {
+            return conflict();
+        }
         if (!response.ok) {
             throw new Error('Erreur lors de la sauvegarde');
         }
@@ -140,7 +345,11 @@ async function handleTaskSubmit(event) {
         modal.hide();
         
         resetForm();
-        loadTasks();
+        if (taskId) {
+            await applyPatchedTask(response);
+        } else {
+            syncChanges();
+        }
         
         showAlert('Tâche sauvegardée avec succès!', 'success');
     } catch (error) {
@@ -149,12 +358,52 @@ async function handleTaskSubmit(event) {
     }
 }
 
+async function patchTask(taskId, fields) {
+    // Une seule requête, sans lecture préalable : le serveur renvoie la tâche modifiée
+    const headers = { 'Content-Type': 'application/json' };
+    const etag = taskList.taskEtags.get(Number(taskId)) || taskList.etag;
+    if (etag) {
+        headers['If-Match'] = etag;
+    }
+    
+    const response = await fetch(`/api/tasks/${taskId}`, {
+        method: 'PATCH',
+        headers,
+        body: JSON.stringify(fields)
+    });
+    if (response.ok) {
+        taskList.taskEtags.set(Number(taskId), response.headers.get('ETag'));
+    }
+    return response;
+}
+
+async function applyPatchedTask(response) {
+    // La réponse du PATCH contient la tâche et la révision qu'elle a créée
+    // (ETag u<utilisateur>-r<révision>) : si c'est la révision suivant le
+    // jeton, aucun autre changement n'a eu lieu entre-temps, pas de /changes
+    const task = await response.json();
+    const etag = response.headers.get('ETag');
+    const match = etag && etag.match(/-r(\d+)"?$/);
+    if (!match || taskList.syncToken === null || taskList.syncing
+            || Number(match[1]) !== Number(taskList.syncToken) + 1) {
+        return syncChanges();
+    }
+    applyChanges({ changed: [task], deleted: [] });
+    taskList.syncToken = match[1];
+    taskList.etag = etag;
+}
+
+function conflict() {
+    // Modifiée ailleurs depuis l'affichage : montrer la version courante
+    syncChanges();
+    showAlert('La tâche a été modifiée entre-temps, la liste a été mise à jour', 'warning');
+}
+
 async function editTask(taskId) {
     try {
-        const response = await fetch(`/api/tasks/${taskId}`);
-        if (!response.ok) throw new Error('Tâche non trouvée');
-        
-        const task = await response.json();
+        // La tâche affichée est à jour (synchronisation) : pas de GET
+        const task = taskList.items.find(item => item.id === taskId)
+            || await fetchJson(`/api/tasks/${taskId}`);
         
         // Remplir le formulaire
         document.getElementById('taskId').value = task.id;
@@ -184,17 +433,14 @@ async function toggleTaskStatus(taskId, currentStatus) {
     const newStatus = currentStatus === 'completed' ? 'pending' : 'completed';
     
     try {
-        const response = await fetch(`/api/tasks/${taskId}`, {
-            method: 'PUT',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({ status: newStatus })
-        });
+        const response = await patchTask(taskId, { status: newStatus });
         
+        if (response.status === 412) {
+            return conflict();
+        }
         if (!response.ok) throw new Error('Erreur lors de la mise à jour');
         
-        loadTasks();
+        await applyPatchedTask(response);
         showAlert('Statut de la tâche mis à jour!', 'success');
     } catch (error) {
         console.error('Erreur:', error);
@@ -214,7 +460,7 @@ async function deleteTask(taskId) {
         
         if (!response.ok) throw new Error('Erreur lors de la suppression');
         
-        loadTasks();
+        syncChanges();
         showAlert('Tâche supprimée avec succès!', 'success');
     } catch (error) {
         console.error('Erreur:', error);
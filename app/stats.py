@@ -0,0 +1,86 @@
+from datetime import datetime
+from sqlalchemy import delete, func, insert, select, union_all
+from app.models import db, ArchivedTask, Task, TaskStat, TaskStatus
+
+def _stats_supported():
+    # Les compteurs sont maintenus par des triggers SQLite
+    return db.engine.dialect.name == 'sqlite'
+
+def counted_rows(user_id=None):
+    """Comptes (user_id, status, priority) -> nombre, calculés par GROUP BY complet
+
+    Les tâches archivées sont comptées, comme dans task_stats.
+    """
+    selects = []
+    for model in (Task, ArchivedTask):
+        statement = select(model.user_id, model.status, model.priority)
+        if user_id is not None:
+            statement = statement.where(model.user_id == user_id)
+        selects.append(statement)
+    rows = union_all(*selects).subquery()
+    # Mêmes clés que les triggers : nom du statut brut, '' ou 0 pour NULL
+    status = func.ifnull(rows.c.status, '', type_=db.String)
+    priority = func.ifnull(rows.c.priority, 0, type_=db.Integer)
+    statement = select(rows.c.user_id, status, priority, func.count()).group_by(rows.c.user_id, status, priority)
+    return {(row[0], row[1], row[2]): row[3] for row in db.session.execute(statement)}
+
+def stored_rows(user_id=None):
+    """Comptes (user_id, status, priority) -> nombre lus dans task_stats"""
+    statement = select(TaskStat.user_id, TaskStat.status, TaskStat.priority, TaskStat.count).where(TaskStat.count != 0)
+    if user_id is not None:
+        statement = statement.where(TaskStat.user_id == user_id)
+    return {(row[0], row[1], row[2]): row[3] for row in db.session.execute(statement)}
+
+def user_stats(user_id, now=None):
+    """Statistiques des tâches d'un utilisateur : par statut, par priorité, en retard
+
+    Les comptes viennent des compteurs pré-calculés ; le nombre de tâches en
+    retard dépend de l'heure et reste une requête COUNT servie par l'index
+    (user_id, due_date).
+    """
+    now = now or datetime.utcnow()
+    rows = stored_rows(user_id) if _stats_supported() else counted_rows(user_id)
+    
+    by_status = {status.value: 0 for status in TaskStatus}
+    by_priority = {}
+    for (_, status, priority), count in rows.items():
+        if status in TaskStatus.__members__:
+            by_status[TaskStatus[status].value] += count
+        by_priority[str(priority)] = by_priority.get(str(priority), 0) + count
+    
+    overdue = db.session.scalar(
+        select(func.count()).select_from(Task).where(
+            Task.user_id == user_id,
+            Task.due_date < now,
+            Task.status != TaskStatus.COMPLETED
+        )
+    )
+    
+    return {
+        'total': sum(rows.values()),
+        'by_status': by_status,
+        'by_priority': dict(sorted(by_priority.items())),
+        'overdue': overdue
+    }
+
+def compare_stats():
+    """Écarts entre les compteurs stockés et un GROUP BY complet: {clé: (stocké, réel)}"""
+    stored = stored_rows()
+    actual = counted_rows()
+    return {
+        key: (stored.get(key, 0), actual.get(key, 0))
+        for key in stored.keys() | actual.keys()
+        if stored.get(key, 0) != actual.get(key, 0)
+    }
+
+def rebuild_stats():
+    """Recalcule entièrement les compteurs à partir des tables tasks et archived_tasks"""
+    db.session.execute(delete(TaskStat))
+    rows = counted_rows()
+    if rows:
+        db.session.execute(insert(TaskStat), [
+            {'user_id': user_id, 'status': status, 'priority': priority, 'count': count}
+            for (user_id, status, priority), count in rows.items()
+        ])
+    db.session.commit()
+    return len(rows)
@@ -0,0 +1,43 @@
+from sqlalchemy import select
+from app.models import db, User, Task, TaskTombstone
+
+def changes_since(user_id, since, max_changes):
+    """Changements des tâches d'un utilisateur après la révision `since`
+
+    Renvoie None si le jeton est dans le futur, et demande un rechargement
+    complet si des suppressions postérieures au jeton ont été purgées. La
+    révision courante est lue avant les lignes : un changement concurrent peut
+    être renvoyé deux fois, jamais perdu (le client applique les changements
+    de façon idempotente).
+    """
+    revision, horizon = db.session.execute(
+        select(User.task_revision, User.tombstone_horizon).where(User.id == user_id)
+    ).one_or_none() or (0, 0)
+    if since > revision:
+        return None
+    token = str(revision)
+    if since < horizon:
+        return {'resync': True, 'token': token}
+    if since == revision:
+        return {'changed': [], 'deleted': [], 'token': token}
+    
+    changed = Task.query.filter(
+        Task.user_id == user_id, Task.revision > since
+    ).order_by(Task.revision).limit(max_changes + 1).all()
+    
+    deleted = list(db.session.scalars(
+        select(TaskTombstone.task_id).where(
+            TaskTombstone.user_id == user_id, TaskTombstone.revision > since
+        ).order_by(TaskTombstone.revision).limit(max_changes + 1)
+    ))
+    
+    if len(changed) + len(deleted) > max_changes:
+        return {'resync': True, 'token': token}
+    
+    # Un identifiant réutilisé après suppression appartient à la tâche vivante
+    changed_ids = {task.id for task in changed}
+    return {
+        'changed': [task.to_dict() for task in changed],
+        'deleted': sorted(set(deleted) - changed_ids),
+        'token': token
+    }
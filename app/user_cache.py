@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+from app.models import db, User
+
+# Colonnes conservées en cache : le hash du mot de passe reste en base ;
+# task_revision et tombstone_horizon changent sans passer par l'ORM
+CACHED_COLUMNS = [
+    attr.key for attr in User.__mapper__.column_attrs
+    if attr.key not in ('password_hash', 'task_revision', 'tombstone_horizon')
+]
+
+class UserCache:
+    """Cache LRU à durée de vie limitée des utilisateurs chargés par Flask-Login
+
+    Conserve un instantané des colonnes de l'utilisateur par processus ; les
+    compteurs hits/misses mesurent les SELECT économisés.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id):
+        """Renvoie l'instantané en cache ou None (expiré ou absent)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id, snapshot):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id):
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Compteurs du cache pour le monitoring"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+    def load(self, user_id):
+        """Charge un utilisateur, depuis le cache si possible"""
+        snapshot = self.get(user_id)
+        if snapshot is None:
+            user = db.session.get(User, user_id)
+            if user is not None:
+                self.put(user_id, {key: getattr(user, key) for key in CACHED_COLUMNS})
+            return user
+
+        # Rattacher une instance détachée à la session sans requête SQL
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+def init_user_cache(app):
+    """Crée le cache utilisateur de l'application (None si désactivé)"""
+    cache = None
+    if app.config.get('USER_CACHE_ENABLED'):
+        cache = UserCache(
+            maxsize=app.config['USER_CACHE_SIZE'],
+            ttl=app.config['USER_CACHE_TTL']
+        )
+    app.extensions['user_cache'] = cache
+    return cache
+
+def get_user_cache():
+    """Cache utilisateur de l'application courante"""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('user_cache')
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_cached_user(mapper, connection, target):
+    """Invalide l'entrée dès qu'un utilisateur est modifié ou supprimé"""
+    cache = get_user_cache()
+    if cache is not None:
+        cache.invalidate(target.id)
+        # Une requête concurrente a pu remettre l'ancienne ligne en cache
+        # avant le commit : invalider une seconde fois après celui-ci
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault('stale_user_ids', set()).add(target.id)
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_after_commit(session):
+    stale = session.info.pop('stale_user_ids', None)
+    cache = get_user_cache()
+    if stale and cache is not None:
+        for user_id in stale:
+            cache.invalidate(user_id)
@@ -0,0 +1,46 @@
+from datetime import datetime
+from app.models import TaskStatus
+
+class TaskValidationError(ValueError):
+    """Données de tâche invalides (message destiné au client)"""
+
+def parse_due_date(value):
+    """Convertit une date ISO 8601 (avec 'Z' éventuel) en datetime"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        raise TaskValidationError('Format de date invalide')
+
+def task_values(data, partial=False):
+    """Valide un payload de tâche et renvoie les valeurs de colonnes
+
+    En mode `partial` (mise à jour), seuls les champs présents sont renvoyés ;
+    sinon le titre est obligatoire et les valeurs par défaut sont appliquées.
+    """
+    if not isinstance(data, dict):
+        raise TaskValidationError('Données invalides')
+    
+    values = {}
+    if not partial or 'title' in data:
+        if not data.get('title'):
+            raise TaskValidationError('Le titre est requis')
+        values['title'] = data['title']
+    if not partial or 'description' in data:
+        values['description'] = data.get('description', '')
+    if not partial or 'priority' in data:
+        priority = data.get('priority', 1)
+        # Entier JSON (pas un booléen) : la priorité entre dans les curseurs de pagination
+        if isinstance(priority, bool) or not isinstance(priority, int):
+            raise TaskValidationError('Priorité invalide')
+        values['priority'] = priority
+    if 'status' in data:
+        try:
+            values['status'] = TaskStatus(data['status'])
+        except ValueError:
+            raise TaskValidationError('Statut invalide')
+    if not partial or 'due_date' in data:
+        values['due_date'] = parse_due_date(data.get('due_date'))
+    
+    return values
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latence des accès courants de l'API avant et après archivage des tâches terminées
+
+Historique de plusieurs années (N utilisateurs × M tâches, 5 millions de
+lignes par défaut) : les tâches de plus de --days jours sont terminées à 95 %.
+Mesure chaque requête via le client de test (session connectée), archive
+avec archive_completed, puis mesure à nouveau.
+
+Utilisation: python -m benchmarks.bench_archive [--users 50] [--tasks 100000] [--years 5] [--repeat 10]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert, select, text
+from app import create_app
+from app.archive import archive_completed
+from app.models import db, Task, TaskStatus, User
+from app.schema import init_schema
+from benchmarks.common import summarize
+from benchmarks.datagen import task_rows
+from config import Config
+
+ENDPOINTS = [
+    ('première page', '/api/tasks?limit=50'),
+    ('page à faire', '/api/tasks?status=pending&limit=50'),
+    ('page terminées', '/api/tasks?status=completed&limit=50'),
+    ('liste complète', '/api/tasks'),
+    ('statistiques', '/api/tasks/stats'),
+    ('recherche', '/api/tasks/search?q=budget'),
+]
+
+def history_rows(user_id, count, rng, now, years, days):
+    """Tâches de datagen réparties sur `years` ans ; les anciennes presque toutes terminées"""
+    for row in task_rows(user_id, count, rng, now):
+        created_at = now - timedelta(seconds=rng.randint(0, int(years * 365 * 86400)))
+        row['due_date'] = row['due_date'] and created_at + (row['due_date'] - row['created_at'])
+        row['created_at'] = row['updated_at'] = created_at
+        if now - created_at > timedelta(days=days):
+            row['status'] = TaskStatus.COMPLETED if rng.random() < 0.95 else row['status']
+        yield row
+
+def populate(users, tasks_per_user, years, days, seed, chunk_size=10000):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    accounts = [User(username=f'archive{i}', email=f'archive{i}@example.com', password_hash='x')
+                for i in range(users)]
+    db.session.add_all(accounts)
+    db.session.commit()
+    user_ids = [user.id for user in accounts]
+    for user_id in user_ids:
+        chunk = []
+        for row in history_rows(user_id, tasks_per_user, rng, now, years, days):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                db.session.execute(insert(Task), chunk)
+                chunk = []
+        if chunk:
+            db.session.execute(insert(Task), chunk)
+        db.session.commit()
+    return user_ids
+
+def analyze():
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+
+def measure(client, repeat):
+    """Résumés (common.summarize) de chaque requête de ENDPOINTS"""
+    results = {}
+    for name, url in ENDPOINTS:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get(url)
+            samples.append(time.perf_counter() - start)
+            assert response.status_code == 200, (url, response.status_code)
+        results[name] = summarize(samples)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--tasks', type=int, default=100_000, help='tâches par utilisateur')
+    parser.add_argument('--years', type=float, default=5)
+    parser.add_argument('--days', type=int, default=90, help='ancienneté des tâches archivées')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'archive.db')}"
+            METRICS_ENABLED = False
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            init_schema()
+            start = time.perf_counter()
+            user_ids = populate(args.users, args.tasks, args.years, args.days, args.seed)
+            analyze()
+            total = args.users * args.tasks
+            print(f"{total} tâches insérées en {time.perf_counter() - start:.1f}s")
+
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['_user_id'] = str(user_ids[0])
+                session['_fresh'] = True
+
+            before = measure(client, args.repeat)
+
+            start = time.perf_counter()
+            archived = archive_completed(datetime.utcnow() - timedelta(days=args.days), args.batch_size)
+            elapsed = time.perf_counter() - start
+            analyze()
+            hot = db.session.scalar(select(func.count()).select_from(Task))
+            print(f"{archived} tâches archivées en {elapsed:.1f}s ({archived / elapsed:.0f} lignes/s), "
+                  f"{hot} restent actives")
+
+            after = measure(client, args.repeat)
+            db.engine.dispose()
+
+    print(f"\n{'requête':<18}{'avant p50':>12}{'après p50':>12}{'avant p95':>12}{'après p95':>12}{'gain':>8}")
+    for name, _ in ENDPOINTS:
+        b, a = before[name], after[name]
+        print(f"{name:<18}{b['p50_ms']:>12.2f}{a['p50_ms']:>12.2f}{b['p95_ms']:>12.2f}{a['p95_ms']:>12.2f}"
+              f"{b['p50_ms'] / a['p50_ms']:>7.1f}x")
+    print('(ms)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latence des connexions et de /api/tasks pendant une rafale de connexions
+
+Compare le hachage dans le thread de la requête (workers=0) et le pool borné,
+derrière un serveur Waitress réel.
+
+Utilisation: python -m benchmarks.bench_login_storm [--logins 16] [--readers 2] [--duration 5]
+"""
+import argparse
+import http.client
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from waitress import create_server
+from werkzeug.security import generate_password_hash
+from app import create_app
+from app.models import db, User, Task
+from benchmarks.common import percentile
+from config import Config
+
+PASSWORD = 'bench-password'
+
+def build_app(db_path, method, workers, max_pending):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+        SQLITE_TUNING_ENABLED = True
+        PASSWORD_HASH_METHOD = method
+        PASSWORD_HASH_WORKERS = workers
+        PASSWORD_HASH_MAX_PENDING = max_pending
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com',
+                    password_hash=generate_password_hash(PASSWORD, method))
+        db.session.add(user)
+        db.session.commit()
+        db.session.add_all([Task(title=f'Tâche {i}', priority=i % 5 + 1, user_id=user.id) for i in range(200)])
+        db.session.commit()
+    return app
+
+def login(conn):
+    """POST /auth/login ; renvoie (statut, cookie de session)"""
+    body = urlencode({'username': 'bench', 'password': PASSWORD})
+    conn.request('POST', '/auth/login', body=body,
+                 headers={'Content-Type': 'application/x-www-form-urlencoded'})
+    response = conn.getresponse()
+    response.read()
+    cookie = response.getheader('Set-Cookie', '').split(';', 1)[0]
+    return response.status, cookie
+
+def login_worker(port, stop, samples, statuses):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    while not stop.is_set():
+        start = time.perf_counter()
+        status, _ = login(conn)
+        samples.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+        if status == 503:
+            time.sleep(0.05)  # le client respecte (brièvement) Retry-After
+    conn.close()
+
+def api_worker(port, cookie, stop, samples):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    while not stop.is_set():
+        start = time.perf_counter()
+        conn.request('GET', '/api/tasks', headers={'Cookie': cookie})
+        conn.getresponse().read()
+        samples.append(time.perf_counter() - start)
+    conn.close()
+
+def serve(server):
+    try:
+        server.run()
+    except OSError:
+        pass  # socket fermée par server.close() en fin de mesure
+
+def run(label, args, workers):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(os.path.join(tmp, 'bench.db'), args.method, workers, args.max_pending)
+        server = create_server(app, host='127.0.0.1', port=0, threads=args.threads)
+        server_thread = threading.Thread(target=serve, args=(server,), daemon=True)
+        server_thread.start()
+        port = server.effective_port
+
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        _, cookie = login(conn)
+        conn.close()
+
+        stop = threading.Event()
+        login_samples, api_samples, statuses = [], [], {}
+        threads = [threading.Thread(target=login_worker, args=(port, stop, login_samples, statuses))
+                   for _ in range(args.logins)]
+        threads += [threading.Thread(target=api_worker, args=(port, cookie, stop, api_samples))
+                    for _ in range(args.readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        server.close()
+        with app.app_context():
+            db.engine.dispose()
+
+    print(f"{label:<14}"
+          f"{percentile(login_samples, 0.5) * 1000:>12.0f}"
+          f"{percentile(login_samples, 0.99) * 1000:>12.0f}"
+          f"{statuses.get(302, 0):>8}{statuses.get(503, 0):>8}"
+          f"{percentile(api_samples, 0.5) * 1000:>12.1f}"
+          f"{percentile(api_samples, 0.99) * 1000:>12.1f}"
+          f"{len(api_samples) / args.duration:>10.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logins', type=int, default=16, help='clients en rafale de connexion')
+    parser.add_argument('--readers', type=int, default=2, help='clients /api/tasks')
+    parser.add_argument('--threads', type=int, default=8, help='threads Waitress')
+    parser.add_argument('--workers', type=int, default=Config.PASSWORD_HASH_WORKERS)
+    parser.add_argument('--max-pending', type=int, default=Config.PASSWORD_HASH_MAX_PENDING)
+    parser.add_argument('--method', default=Config.PASSWORD_HASH_METHOD)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+    # Waitress signale chaque requête en attente d'un thread : attendu ici
+    logging.getLogger('waitress').setLevel(logging.CRITICAL)
+
+    print(f"{'hachage':<14}{'login p50':>12}{'login p99':>12}{'302':>8}{'503':>8}"
+          f"{'api p50':>12}{'api p99':>12}{'api/s':>10}   (ms)")
+    run('en ligne', args, workers=0)
+    run(f'pool {args.workers}+{args.max_pending}', args, workers=args.workers)
+
+if __name__ == '__main__':
+    main()
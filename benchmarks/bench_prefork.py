@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark: débit de run.py selon le nombre de workers (mode multi-processus)
+
+Génère une base synthétique, puis pour chaque nombre de workers lance run.py
+en production (WEB_WORKERS=N) et rejoue la charge de benchmarks.loadtest.
+Le gain attendu est borné par le nombre de cœurs : le GIL limite un
+processus Waitress à un cœur pour le travail Python (JSON, Jinja, hachage).
+
+Utilisation: python -m benchmarks.bench_prefork [--workers 1 2 4] [--clients 16] [--duration 10]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.loadtest import generate_database, start_server, run_load
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=16, help='clients virtuels simultanés')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--users', type=int, default=16)
+    parser.add_argument('--tasks', type=int, default=1000, help='tâches par compte')
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    if cpus < max(args.workers):
+        print(f'⚠️ {cpus} cœur(s) : au-delà, les workers se partagent les mêmes cœurs')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = generate_database(tmp, args.users, args.tasks)
+        print(f"\n{'workers':>8}{'req/s':>10}{'gain':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'erreurs':>9}   (ms)")
+        reference = None
+        for workers in args.workers:
+            server, port = start_server(tmp, database, workers)
+            try:
+                results, errors = run_load('127.0.0.1', port, args)
+            finally:
+                server.terminate()
+                server.wait(timeout=60)
+            total = results['total']
+            reference = reference or total['throughput']
+            print(f"{workers:>8}{total['throughput']:>10.1f}{total['throughput'] / reference:>7.2f}x"
+                  f"{total['p50_ms']:>9.1f}{total['p95_ms']:>9.1f}{total['p99_ms']:>9.1f}{errors:>9}")
+
+if __name__ == '__main__':
+    main()
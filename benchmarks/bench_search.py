@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: recherche FTS5 contre LIKE '%terme%' sur un grand volume de tâches
+
+Utilisation: python -m benchmarks.bench_search [--rows 1000000] [--users 1] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.models import db, User
+from app.search import search_tasks, like_search
+from config import Config
+
+SYLLABLES = ['ba', 'cho', 'di', 'fra', 'gu', 'lo', 'mer', 'no', 'pa', 'ri', 'sta', 'tu', 've', 'zon']
+
+def vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+def populate(rows, users, rng):
+    """Crée les utilisateurs et insère les tâches via executemany"""
+    for i in range(users):
+        db.session.add(User(username=f'user{i}', email=f'user{i}@example.com', password_hash='x'))
+    db.session.commit()
+    
+    words = vocabulary(5000, rng)
+    connection = db.session.connection().connection
+    batch = []
+    for i in range(rows):
+        title = ' '.join(rng.choices(words, k=rng.randint(2, 6)))
+        description = ' '.join(rng.choices(words, k=rng.randint(5, 30)))
+        batch.append((title, description, 'PENDING', rng.randint(1, 5), i % users + 1))
+        if len(batch) >= 10000:
+            connection.executemany(
+                "INSERT INTO tasks (title, description, status, priority, user_id, revision, created_at) "
+                "VALUES (?, ?, ?, ?, ?, 0, '2024-01-01 00:00:00.000000')", batch
+            )
+            batch = []
+    if batch:
+        connection.executemany(
+            "INSERT INTO tasks (title, description, status, priority, user_id, revision, created_at) "
+            "VALUES (?, ?, ?, ?, ?, 0, '2024-01-01 00:00:00.000000')", batch
+        )
+    db.session.commit()
+    return words
+
+def timed(function, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'search.db')}"
+        
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+            start = time.perf_counter()
+            words = populate(args.rows, args.users, rng)
+            print(f"{args.rows} tâches insérées et indexées en {time.perf_counter() - start:.1f}s")
+            
+            queries = [rng.choice(words), rng.choice(words)[:4], ' '.join(rng.sample(words, 2))]
+            print(f"{'requête':<28}{'FTS5 (ms)':>12}{'LIKE (ms)':>12}{'gain':>8}")
+            for query in queries:
+                fts = timed(lambda: search_tasks(1, query, 50), args.repeat)
+                like = timed(lambda: like_search(1, query, 50), args.repeat)
+                print(f"{query:<28}{fts:>12.1f}{like:>12.1f}{like / fts:>7.0f}x")
+            db.engine.dispose()
+
+if __name__ == '__main__':
+    main()
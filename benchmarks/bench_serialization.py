@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: liste de tâches en JSON, objets ORM + to_dict contre colonnes + encodeur rapide
+
+Mesure la lecture et l'encodage complets (requête, construction, JSON) de la
+liste d'un utilisateur, comme GET /api/tasks sans pagination.
+
+Utilisation: python -m benchmarks.bench_serialization [--sizes 10000 100000] [--repeat 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.models import db, Task
+from app.schema import init_schema
+from app.serialization import TASK_COLUMNS, row_to_dict, make_encoder, orjson
+from benchmarks.datagen import generate
+from config import Config
+
+ORDERING = (Task.priority.desc(), Task.created_at.desc(), Task.id.desc())
+
+def legacy(app, user_id):
+    tasks = Task.query.filter_by(user_id=user_id).order_by(*ORDERING).all()
+    return app.json.dumps([task.to_dict() for task in tasks], separators=(',', ':')).encode('ascii')
+
+def columns(encoder, user_id):
+    rows = db.session.query(*TASK_COLUMNS).filter(Task.user_id == user_id).order_by(*ORDERING).all()
+    return encoder.dumps([row_to_dict(row) for row in rows])
+
+def measure(function, repeat):
+    durations = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    variants = [('json', make_encoder('json'))]
+    if orjson is not None:
+        variants.append(('orjson', make_encoder('orjson')))
+
+    header = f"{'tâches':>8}{'ORM+to_dict':>14}" + ''.join(f"{'colonnes+' + name:>18}" for name, _ in variants)
+    print(header + '   (ms, médiane)')
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            class BenchConfig(Config):
+                SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'serialization.db')}"
+
+            app = create_app(BenchConfig)
+            with app.app_context():
+                init_schema()
+                user_id = generate(1, size)[0]
+                reference = legacy(app, user_id)
+                line = f"{size:>8}{measure(lambda: legacy(app, user_id), args.repeat):>14.1f}"
+                for name, encoder in variants:
+                    assert columns(encoder, user_id) == reference, f'sortie différente ({name})'
+                    duration = measure(lambda: columns(encoder, user_id), args.repeat)
+                    line += f"{duration:>18.1f}"
+                print(line)
+                db.session.remove()
+                db.engine.dispose()
+
+if __name__ == '__main__':
+    main()
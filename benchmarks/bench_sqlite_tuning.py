@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: débit lecture/écriture concurrent avec et sans le profil SQLite
+
+Utilisation: python -m benchmarks.bench_sqlite_tuning [--readers 8] [--writers 2] [--duration 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import OperationalError
+from app import create_app
+from app.models import db, User, Task
+from config import Config
+
+def build_app(db_path, tuned):
+    """Application sur une base fichier dédiée, profil SQLite actif ou non"""
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+        SQLITE_TUNING_ENABLED = tuned
+    
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        db.session.add_all([Task(title=f'Seed {i}', priority=i % 5 + 1, user_id=user.id) for i in range(2000)])
+        db.session.commit()
+        user_id = user.id
+    return app, user_id
+
+def worker(app, user_id, kind, stop, stats, lock):
+    """Boucle de lecture (page de 50 tâches) ou d'écriture (insert + commit)"""
+    ops = errors = 0
+    with app.app_context():
+        while not stop.is_set():
+            try:
+                if kind == 'read':
+                    Task.query.filter_by(user_id=user_id).order_by(
+                        Task.priority.desc(), Task.created_at.desc()
+                    ).limit(50).all()
+                else:
+                    db.session.add(Task(title='Bench write', user_id=user_id))
+                    db.session.commit()
+                ops += 1
+            except OperationalError:
+                db.session.rollback()
+                errors += 1
+        db.session.remove()
+    with lock:
+        stats[kind]['ops'] += ops
+        stats[kind]['errors'] += errors
+
+def run(tuned, readers, writers, duration):
+    with tempfile.TemporaryDirectory() as tmp:
+        app, user_id = build_app(os.path.join(tmp, 'bench.db'), tuned)
+        stats = {'read': {'ops': 0, 'errors': 0}, 'write': {'ops': 0, 'errors': 0}}
+        stop = threading.Event()
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(target=worker, args=(app, user_id, kind, stop, stats, lock))
+            for kind in ['read'] * readers + ['write'] * writers
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        with app.app_context():
+            db.engine.dispose()
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+    
+    print(f"{'profil':<10}{'lectures/s':>14}{'écritures/s':>14}{'verrous':>10}")
+    for tuned in (False, True):
+        stats = run(tuned, args.readers, args.writers, args.duration)
+        errors = stats['read']['errors'] + stats['write']['errors']
+        print(f"{'WAL' if tuned else 'défaut':<10}"
+              f"{stats['read']['ops'] / args.duration:>14.0f}"
+              f"{stats['write']['ops'] / args.duration:>14.0f}"
+              f"{errors:>10}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: temps de démarrage d'un processus (imports + create_app) selon SCHEMA_ON_STARTUP
+
+Chaque mesure lance un interpréteur neuf, comme un worker qui démarre, sur une
+base fichier déjà initialisée. 'create' correspond à l'ancien create_all
+systématique.
+
+Utilisation: python -m benchmarks.bench_startup [--runs 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+from app import create_app
+from config import Config
+imported = time.perf_counter()
+app = create_app(Config)
+done = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (done - imported) * 1000,
+    'phases_ms': app.extensions['startup']['phases_ms'],
+}))
+"""
+
+def measure(mode, database_url, runs):
+    env = dict(os.environ, DATABASE_URL=database_url, SCHEMA_ON_STARTUP=mode)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return samples
+
+def median(samples, key):
+    return statistics.median(sample[key] for sample in samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'startup.db')}"
+        env = dict(os.environ, DATABASE_URL=database_url, FLASK_APP='app:create_app')
+        subprocess.run([sys.executable, '-m', 'flask', 'db', 'init-schema'], cwd=ROOT, env=env,
+                       capture_output=True, check=True)
+
+        print(f"{'mode':<8}{'imports':>10}{'create_app':>12}{'schéma':>10}   (ms, médiane sur {args.runs})")
+        for mode in ('create', 'check', 'skip'):
+            samples = measure(mode, database_url, args.runs)
+            schema = statistics.median(sample['phases_ms']['schema'] for sample in samples)
+            print(f"{mode:<8}{median(samples, 'import_ms'):>10.1f}"
+                  f"{median(samples, 'create_app_ms'):>12.1f}{schema:>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Outils partagés des benchmarks : percentiles, résumé des mesures, fichier de référence JSON
+"""
+import json
+import os
+import platform
+import statistics
+import sys
+from datetime import datetime
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+def percentile(samples, fraction):
+    """Percentile par rang le plus proche (samples non triés)"""
+    if not samples:
+        return float('nan')
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def summarize(samples, duration=None):
+    """Résumé en millisecondes d'une liste de durées en secondes"""
+    summary = {
+        'count': len(samples),
+        'p50_ms': round(percentile(samples, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 0.99) * 1000, 3),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3) if samples else float('nan'),
+    }
+    if duration:
+        summary['throughput'] = round(len(samples) / duration, 1)
+    return summary
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+    }
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def run_parameters(args, names):
+    """Paramètres de charge d'une exécution (attributs `names` de l'argparse)"""
+    return {name: getattr(args, name) for name in names}
+
+def save_results(section, results, parameters, path=BASELINE_PATH):
+    """Enregistre les résultats d'une suite (micro, load) et ses paramètres dans le fichier de référence"""
+    baseline = load_baseline(path)
+    baseline[section] = {'environment': environment(), 'parameters': parameters, 'results': results}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write('\n')
+
+def check_parameters(section, parameters, path=BASELINE_PATH):
+    """Quitte (code 2) si la référence a été mesurée avec d'autres paramètres
+
+    Un autre volume de données ou de clients change les latences à lui seul :
+    la comparaison n'aurait aucun sens.
+    """
+    baseline = load_baseline(path).get(section)
+    if baseline is None:
+        return
+    reference = baseline.get('parameters')
+    if reference is None:
+        sys.exit(f"Référence '{section}' sans paramètres enregistrés : la ré-enregistrer (--save-baseline)")
+    differences = [(name, reference.get(name), parameters.get(name))
+                   for name in sorted(set(reference) | set(parameters))
+                   if reference.get(name) != parameters.get(name)]
+    if differences:
+        print(f"\n!!! Paramètres différents de la référence '{section}', comparaison refusée !!!")
+        print(f"{'paramètre':<16}{'référence':>14}{'actuel':>14}")
+        for name, before, after in differences:
+            print(f"{name:<16}{before!s:>14}{after!s:>14}")
+        sys.exit(2)
+
+def compare(section, results, tolerance, parameters, path=BASELINE_PATH, metric='p50_ms', min_delta_ms=0.5):
+    """Compare `metric` à la référence ; renvoie les régressions au-delà de `tolerance` (0.2 = +20 %)
+
+    Refuse la comparaison si `parameters` diffère de ceux de la référence
+    (check_parameters). Un écart de moins de `min_delta_ms` n'est jamais une
+    régression : le bruit de mesure dépasse vite 20 % sur une opération d'une
+    milliseconde.
+    """
+    check_parameters(section, parameters, path)
+    reference = load_baseline(path).get(section, {}).get('results', {})
+    regressions = []
+    print(f"\n{'mesure':<32}{'référence':>12}{'actuel':>12}{'écart':>9}   ({metric})")
+    for name, current in sorted(results.items()):
+        if name not in reference:
+            print(f"{name:<32}{'-':>12}{current[metric]:>12.3f}{'nouveau':>9}")
+            continue
+        before, after = reference[name][metric], current[metric]
+        change = (after - before) / before if before else 0.0
+        regressed = change > tolerance and after - before >= min_delta_ms
+        print(f"{name:<32}{before:>12.3f}{after:>12.3f}{change:>+8.0%}{' !' if regressed else ''}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+def exit_on_regressions(regressions):
+    if regressions:
+        print(f"\n{len(regressions)} régression(s): {', '.join(regressions)}")
+        sys.exit(1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Générateur de données synthétiques : N utilisateurs × M tâches
+
+Répartitions réalistes : statuts (50 % à faire, 20 % en cours, 30 % terminées),
+priorités surtout basses, 40 % sans échéance, échéances passées pour une partie
+des tâches ouvertes, dates de création sur un an. Les insertions passent par
+SQLAlchemy Core : triggers FTS et statistiques à jour.
+
+Utilisation: python -m benchmarks.datagen DATABASE [--users 10] [--tasks 1000] [--seed 42]
+Chaque utilisateur bench<i> a le mot de passe BENCH_PASSWORD.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from app.models import db, User, Task, TaskStatus
+
+BENCH_PASSWORD = 'bench-password'
+# Coût faible : le générateur crée beaucoup de comptes
+BENCH_HASH_METHOD = 'pbkdf2:sha256:1000'
+
+STATUS_WEIGHTS = [(TaskStatus.PENDING, 50), (TaskStatus.IN_PROGRESS, 20), (TaskStatus.COMPLETED, 30)]
+PRIORITY_WEIGHTS = [(1, 30), (2, 25), (3, 25), (4, 12), (5, 8)]
+WORDS = ['rapport', 'client', 'facture', 'réunion', 'budget', 'projet', 'revue', 'code', 'tests',
+         'déploiement', 'courrier', 'planning', 'audit', 'contrat', 'maquette', 'formation']
+
+def _weighted(rng, weights):
+    values, counts = zip(*weights)
+    return rng.choices(values, weights=counts)[0]
+
+def task_rows(user_id, count, rng, now):
+    """Lignes de tâches d'un utilisateur pour un INSERT en executemany"""
+    for _ in range(count):
+        status = _weighted(rng, STATUS_WEIGHTS)
+        created_at = now - timedelta(seconds=rng.randint(0, 365 * 86400))
+        due_date = None
+        if rng.random() >= 0.4:
+            # Échéance dans les 90 jours suivant la création : dépassée pour les tâches anciennes
+            due_date = created_at + timedelta(days=rng.randint(1, 90))
+        title = ' '.join(rng.choices(WORDS, k=rng.randint(2, 5))).capitalize()
+        yield {
+            'title': title,
+            'description': ' '.join(rng.choices(WORDS, k=rng.randint(0, 20))) or None,
+            'status': status,
+            'priority': _weighted(rng, PRIORITY_WEIGHTS),
+            'due_date': due_date,
+            'created_at': created_at,
+            'updated_at': created_at,
+            'revision': 0,
+            'user_id': user_id,
+        }
+
+def generate(users, tasks_per_user, seed=42, chunk_size=5000):
+    """Crée les utilisateurs bench<i> et leurs tâches ; renvoie les ids utilisateurs"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    password_hash = generate_password_hash(BENCH_PASSWORD, BENCH_HASH_METHOD)
+    start = User.query.filter(User.username.like('bench%')).count()
+    accounts = [User(username=f'bench{start + i}', email=f'bench{start + i}@example.com',
+                     password_hash=password_hash) for i in range(users)]
+    db.session.add_all(accounts)
+    db.session.commit()
+
+    user_ids = [user.id for user in accounts]
+    for user_id in user_ids:
+        chunk = []
+        for row in task_rows(user_id, tasks_per_user, rng, now):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                db.session.execute(insert(Task), chunk)
+                chunk = []
+        if chunk:
+            db.session.execute(insert(Task), chunk)
+        db.session.commit()
+    return user_ids
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('database', help='fichier SQLite à créer ou compléter')
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--tasks', type=int, default=1000, help='tâches par utilisateur')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    from app import create_app
+    from app.schema import init_schema
+    from config import Config
+
+    class DataConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.abspath(args.database)}'
+
+    app = create_app(DataConfig)
+    with app.app_context():
+        init_schema()
+        start = time.perf_counter()
+        generate(args.users, args.tasks, args.seed)
+        print(f"{args.users} utilisateur(s) × {args.tasks} tâches générés en {time.perf_counter() - start:.1f}s "
+              f"dans {args.database}")
+
+if __name__ == '__main__':
+    main()
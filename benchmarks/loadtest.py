@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test de charge HTTP de l'API tâches contre le serveur Waitress de run.py
+
+Sans --url, génère une base synthétique, lance `run.py` en mode production
+(Waitress) sur un port libre et l'arrête à la fin. Chaque client virtuel se
+connecte avec son propre compte puis enchaîne un mélange pondéré de lectures
+et d'écritures. Rapporte le débit et les p50/p95/p99 par opération.
+
+Utilisation: python -m benchmarks.loadtest [--clients 8] [--duration 10] [--users 8] [--tasks 1000]
+             [--workers 1] [--url http://127.0.0.1:8000] [--save-baseline | --compare [--tolerance 0.3]]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.common import (summarize, run_parameters, save_results, check_parameters, compare,
+                               exit_on_regressions)
+from benchmarks.datagen import BENCH_PASSWORD
+
+# (opération, poids) : surtout des lectures paginées, comme l'interface
+WORKLOAD = [
+    ('get_tasks_page', 55),
+    ('get_tasks_full', 10),
+    ('get_stats', 5),
+    ('create_task', 15),
+    ('update_task', 10),
+    ('delete_task', 5),
+]
+
+# Paramètres de charge enregistrés avec la référence (--url : serveur et
+# données inconnus, seule l'URL les identifie)
+PARAMETERS = ('clients', 'duration', 'users', 'tasks', 'workers', 'url')
+
+class VirtualClient:
+    """Client HTTP keep-alive connecté avec un compte bench<i>"""
+
+    def __init__(self, host, port, username):
+        self.conn = http.client.HTTPConnection(host, port, timeout=60)
+        self.cookie = ''
+        self.created = []
+        self.login(username)
+
+    def request(self, method, path, body=None, content_type='application/json'):
+        headers = {'Cookie': self.cookie}
+        if body is not None:
+            headers['Content-Type'] = content_type
+        self.conn.request(method, path, body=body, headers=headers)
+        response = self.conn.getresponse()
+        data = response.read()
+        return response, data
+
+    def login(self, username):
+        response, _ = self.request('POST', '/auth/login',
+                                   urlencode({'username': username, 'password': BENCH_PASSWORD}),
+                                   'application/x-www-form-urlencoded')
+        self.cookie = response.getheader('Set-Cookie', '').split(';', 1)[0]
+        if response.status != 302 or not self.cookie:
+            raise RuntimeError(f'Connexion impossible pour {username} ({response.status})')
+
+    def run(self, operation, rng):
+        """Exécute une opération ; renvoie le statut HTTP"""
+        if operation == 'get_tasks_page':
+            return self.request('GET', '/api/tasks?limit=50')[0].status
+        if operation == 'get_tasks_full':
+            return self.request('GET', '/api/tasks')[0].status
+        if operation == 'get_stats':
+            return self.request('GET', '/api/tasks/stats')[0].status
+        if operation == 'create_task':
+            body = json.dumps({'title': f'Charge {rng.random():.6f}', 'priority': rng.randint(1, 5)})
+            response, data = self.request('POST', '/api/tasks', body)
+            if response.status == 201:
+                self.created.append(json.loads(data)['id'])
+            return response.status
+        if operation == 'update_task':
+            if not self.created:
+                return self.run('create_task', rng)
+            task_id = rng.choice(self.created)
+            body = json.dumps({'status': rng.choice(['pending', 'in_progress', 'completed'])})
+            return self.request('PUT', f'/api/tasks/{task_id}', body)[0].status
+        if operation == 'delete_task':
+            if not self.created:
+                return self.run('create_task', rng)
+            task_id = self.created.pop(rng.randrange(len(self.created)))
+            return self.request('DELETE', f'/api/tasks/{task_id}')[0].status
+        raise ValueError(operation)
+
+def client_loop(client, seed, stop, samples, errors, lock):
+    rng = random.Random(seed)
+    operations, weights = zip(*WORKLOAD)
+    local = {operation: [] for operation in operations}
+    failures = 0
+    while not stop.is_set():
+        operation = rng.choices(operations, weights=weights)[0]
+        start = time.perf_counter()
+        status = client.run(operation, rng)
+        local[operation].append(time.perf_counter() - start)
+        if status >= 400:
+            failures += 1
+    with lock:
+        for operation, durations in local.items():
+            samples.setdefault(operation, []).extend(durations)
+        errors[0] += failures
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_until_ready(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('Le serveur ne répond pas')
+
+def generate_database(tmp, users, tasks):
+    """Base synthétique de comptes bench<i> ; renvoie son chemin"""
+    database = os.path.join(tmp, 'load.db')
+    subprocess.run([sys.executable, '-m', 'benchmarks.datagen', database,
+                    '--users', str(users), '--tasks', str(tasks)], cwd=ROOT, check=True)
+    return database
+
+def start_server(tmp, database, workers=1):
+    """Lance run.py (Waitress, `workers` processus) sur la base ; renvoie (processus, port)"""
+    port = free_port()
+    env = dict(os.environ, FLASK_ENV='production', PORT=str(port),
+               DATABASE_URL=f'sqlite:///{database}', SQLITE_TUNING='1', WEB_WORKERS=str(workers),
+               LOG_FILE=os.path.join(tmp, 'app.log'), SCHEMA_ON_STARTUP='skip')
+    server = subprocess.Popen([sys.executable, 'run.py'], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_until_ready('127.0.0.1', port)
+    return server, port
+
+def run_load(host, port, args):
+    clients = [VirtualClient(host, port, f'bench{i % args.users}') for i in range(args.clients)]
+    stop = threading.Event()
+    samples, errors, lock = {}, [0], threading.Lock()
+    threads = [threading.Thread(target=client_loop, args=(client, i, stop, samples, errors, lock))
+               for i, client in enumerate(clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    results = {operation: summarize(durations, args.duration) for operation, durations in sorted(samples.items())}
+    results['total'] = summarize([d for durations in samples.values() for d in durations], args.duration)
+    return results, errors[0]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=8, help='clients virtuels simultanés')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--users', type=int, default=8, help='comptes générés (sans --url)')
+    parser.add_argument('--tasks', type=int, default=1000, help='tâches par compte (sans --url)')
+    parser.add_argument('--workers', type=int, default=1, help='processus Waitress (sans --url)')
+    parser.add_argument('--url', help='serveur existant (comptes bench<i> déjà générés)')
+    parser.add_argument('--save-baseline', action='store_true', help='enregistrer dans benchmarks/baseline.json')
+    parser.add_argument('--compare', action='store_true', help='comparer à benchmarks/baseline.json')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='régression tolérée sur le p95')
+    args = parser.parse_args()
+    parameters = run_parameters(args, PARAMETERS)
+    if args.compare:
+        # Avant la charge : inutile de mesurer pour refuser ensuite
+        check_parameters('load', parameters)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = None
+        if args.url:
+            parts = urlsplit(args.url)
+            host, port = parts.hostname, parts.port or 80
+        else:
+            server, port = start_server(tmp, generate_database(tmp, args.users, args.tasks), args.workers)
+            host = '127.0.0.1'
+        try:
+            results, errors = run_load(host, port, args)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+
+    print(f"{'opération':<18}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}   (ms, {args.clients} clients)")
+    for operation, summary in results.items():
+        print(f"{operation:<18}{summary['throughput']:>9.1f}{summary['p50_ms']:>9.1f}"
+              f"{summary['p95_ms']:>9.1f}{summary['p99_ms']:>9.1f}")
+    print(f"erreurs HTTP: {errors}")
+
+    if args.compare:
+        exit_on_regressions(compare('load', results, args.tolerance, parameters, metric='p95_ms'))
+    if args.save_baseline:
+        save_results('load', results, parameters)
+        print('Référence enregistrée dans benchmarks/baseline.json')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks : sérialisation, requêtes et endpoints de l'API tâches (en processus)
+
+Chaque mesure est répétée après un échauffement ; les résultats (p50/p95/p99)
+peuvent être enregistrés comme référence puis comparés d'une exécution à l'autre.
+
+Utilisation: python -m benchmarks.micro [--tasks 1000] [--repeat 50]
+             [--save-baseline | --compare [--tolerance 0.2]]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.models import db, Task
+from app.schema import init_schema
+from app.stats import user_stats
+from benchmarks.common import (summarize, run_parameters, save_results, check_parameters, compare,
+                               exit_on_regressions)
+from benchmarks.datagen import generate
+from config import Config
+
+ORDERING = (Task.priority.desc(), Task.created_at.desc(), Task.id.desc())
+
+# Paramètres de charge enregistrés avec la référence
+PARAMETERS = ('tasks', 'repeat')
+
+def measure(function, repeat, warmup=3):
+    for _ in range(warmup):
+        function()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+def cases(app, user_id, client):
+    """Mesures nommées : fonctions sans argument"""
+    tasks = Task.query.filter_by(user_id=user_id).order_by(*ORDERING).all()
+    dicts = [task.to_dict() for task in tasks]
+
+    def query_full():
+        db.session.expunge_all()
+        Task.query.filter_by(user_id=user_id).order_by(*ORDERING).all()
+
+    def query_page():
+        db.session.expunge_all()
+        Task.query.filter_by(user_id=user_id).order_by(*ORDERING).limit(51).all()
+
+    def create_task():
+        response = client.post('/api/tasks', json={'title': 'Tâche de mesure', 'priority': 3})
+        assert response.status_code == 201
+
+    return {
+        'serialize.to_dict': lambda: [task.to_dict() for task in tasks],
+        'serialize.json_dumps': lambda: app.json.dumps(dicts),
+        'query.list_full': query_full,
+        'query.page_50': query_page,
+        'query.stats': lambda: user_stats(user_id),
+        'http.get_tasks_full': lambda: client.get('/api/tasks'),
+        'http.get_tasks_page_50': lambda: client.get('/api/tasks?limit=50'),
+        'http.create_task': create_task,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=1000, help='tâches de l\'utilisateur mesuré')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--save-baseline', action='store_true', help='enregistrer dans benchmarks/baseline.json')
+    parser.add_argument('--compare', action='store_true', help='comparer à benchmarks/baseline.json')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='régression tolérée sur le p50')
+    args = parser.parse_args()
+    parameters = run_parameters(args, PARAMETERS)
+    if args.compare:
+        # Avant la mesure : inutile de mesurer pour refuser ensuite
+        check_parameters('micro', parameters)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class MicroConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'micro.db')}"
+            SQLITE_TUNING_ENABLED = True
+            USER_CACHE_ENABLED = True
+
+        app = create_app(MicroConfig)
+        with app.app_context():
+            init_schema()
+            user_id = generate(1, args.tasks)[0]
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['_user_id'] = str(user_id)
+                session['_fresh'] = True
+
+            results = {}
+            print(f"{'mesure':<28}{'p50':>10}{'p95':>10}{'p99':>10}   (ms, {args.tasks} tâches)")
+            for name, function in cases(app, user_id, client).items():
+                results[name] = measure(function, args.repeat)
+                print(f"{name:<28}{results[name]['p50_ms']:>10.3f}"
+                      f"{results[name]['p95_ms']:>10.3f}{results[name]['p99_ms']:>10.3f}")
+            db.session.remove()
+            db.engine.dispose()
+
+    if args.compare:
+        exit_on_regressions(compare('micro', results, args.tolerance, parameters))
+    if args.save_baseline:
+        save_results('micro', results, parameters)
+        print('Référence enregistrée dans benchmarks/baseline.json')
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,142 @@ class Config:
     
     # Temps de session
     PERMANENT_SESSION_LIFETIME = timedelta(days=1)
+    
+    # Profil de performance SQLite (WAL, pragmas), désactivé par défaut
+    SQLITE_TUNING_ENABLED = os.environ.get('SQLITE_TUNING', '').lower() in ('1', 'true', 'yes')
+    SQLITE_JOURNAL_MODE = 'WAL'
+    SQLITE_SYNCHRONOUS = 'NORMAL'
+    SQLITE_BUSY_TIMEOUT = 5000  # millisecondes
+    SQLITE_CACHE_SIZE = -64000  # négatif = en Kio (64 Mo)
+    SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+    
+    # Pool de connexions (voir app.pool) : 'queue', 'thread' (une connexion
+    # SQLite par thread) ou 'static' (une seule connexion partagée).
+    # DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW doit couvrir les threads Waitress,
+    # sinon run.py le signale au démarrage
+    DB_POOL_PROFILE = os.environ.get('DB_POOL_PROFILE', 'queue')
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_POOL_MAX_OVERFLOW = int(os.environ.get('DB_POOL_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = 10  # secondes d'attente d'une connexion, puis erreur
+    DB_POOL_RECYCLE = 1800  # secondes ; -1 = jamais
+    DB_POOL_PRE_PING = None  # None = activé hors SQLite
+    DB_POOL_WAIT_WARNING_MS = 100  # attente journalisée au-delà
+    
+    # Cache du user_loader de Flask-Login (par processus)
+    USER_CACHE_ENABLED = True
+    USER_CACHE_SIZE = 1024
+    USER_CACHE_TTL = 60  # secondes
+    
+    # Pagination de l'API tâches
+    TASKS_PAGE_SIZE = 50
+    TASKS_MAX_PAGE_SIZE = 200
+    
+    # Encodeur JSON des listes de tâches : 'auto' (orjson s'il est installé), 'orjson' ou 'json'
+    JSON_ENCODER = os.environ.get('JSON_ENCODER', 'auto')
+    
+    # Au-delà, /api/tasks/changes demande un rechargement complet
+    TASKS_SYNC_MAX_CHANGES = 500
+    
+    # Flux Server-Sent Events (/api/tasks/stream) : chaque flux occupe un
+    # thread Waitress, d'où un nombre borné de flux et une durée limitée
+    SSE_MAX_STREAMS = 8
+    SSE_QUEUE_SIZE = 16
+    SSE_HEARTBEAT = 15  # secondes
+    SSE_STREAM_TIMEOUT = 300  # secondes, puis reconnexion du client
+    SSE_RETRY_AFTER = 5  # secondes
+    
+    # Threads Waitress réservés aux requêtes classiques (hors flux SSE)
+    WAITRESS_THREADS = 4
+    
+    # Mode multi-processus de run.py en production (Linux) : chaque worker a
+    # ses threads Waitress, son moteur SQLAlchemy et ses caches en mémoire
+    WEB_WORKERS = int(os.environ.get('WEB_WORKERS', 1))
+    WEB_GRACEFUL_TIMEOUT = 30  # secondes pour finir les requêtes en cours
+    # Avec plusieurs workers, le bus SSE ne voit que les écritures de son
+    # processus : les flux relisent alors la révision en base
+    SSE_POLL_INTERVAL = 2  # secondes
+    
+    # Tâches de fond (app.jobs), persistées dans la table `jobs` : exécutées par
+    # `flask jobs worker`, ou par un thread de chaque processus run.py si
+    # JOBS_IN_PROCESS ; les baux évitent qu'une tâche s'exécute deux fois
+    JOBS_IN_PROCESS = os.environ.get('JOBS_IN_PROCESS', '').lower() in ('1', 'true', 'yes')
+    JOBS_POLL_INTERVAL = 5  # secondes
+    JOBS_LEASE_SECONDS = 600  # doit dépasser la plus longue exécution (ou un lot, si le bail est prolongé)
+    JOBS_MAX_ATTEMPTS = 5
+    JOBS_RETRY_BACKOFF = 30  # secondes, doublées à chaque nouvel échec
+    JOBS_BATCH_SIZE = 500  # lignes lues ou supprimées par transaction
+    # Tâches périodiques : nom -> intervalle en secondes (None = désactivée)
+    JOBS_SCHEDULE = {
+        'due_reminders': 60,
+        'purge_tombstones': 3600,
+        'analyze': 24 * 3600,
+        'vacuum': None,
+        'archive_tasks': 24 * 3600,
+    }
+    REMINDER_DUE_SOON = 24 * 3600  # rappel « bientôt due », secondes avant l'échéance
+    # Au-delà, les suppressions ne sont plus transmises par /api/tasks/changes
+    # (les jetons plus anciens reçoivent {'resync': true})
+    TOMBSTONE_RETENTION_DAYS = 30
+    # Tâches terminées déplacées vers `archived_tasks` après ce délai (jours,
+    # depuis la dernière modification) par la tâche de fond `archive_tasks` ou
+    # `flask tasks archive` ; None : jamais
+    ARCHIVE_AFTER_DAYS = 90
+    
+    # Taille des lots lus par le curseur de /api/tasks/export
+    TASKS_EXPORT_BATCH_SIZE = 1000
+    
+    # Lignes insérées par transaction lors d'un import
+    TASKS_IMPORT_CHUNK_SIZE = 1000
+    
+    # Nombre maximal d'opérations par appel à /api/tasks/batch
+    TASKS_BATCH_MAX_OPERATIONS = 1000
+    
+    # Hachage des mots de passe (méthode Werkzeug, ex. 'pbkdf2:sha256:600000')
+    # dans un pool borné ; au-delà de la file, /auth répond 503
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'scrypt'
+    PASSWORD_HASH_WORKERS = 2
+    PASSWORD_HASH_MAX_PENDING = 4
+    PASSWORD_HASH_TIMEOUT = 10  # secondes
+    PASSWORD_HASH_RETRY_AFTER = 2  # secondes
+    
+    # Instrumentation des requêtes (Server-Timing, requêtes lentes, cProfile)
+    INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION', '').lower() in ('1', 'true', 'yes')
+    SLOW_REQUEST_THRESHOLD_MS = 500
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))  # 0 = désactivé
+    PROFILE_DIR = None  # défaut: instance/profiles
+    
+    # Métriques Prometheus en mémoire (/metrics) et sonde SQL de /health
+    METRICS_ENABLED = True
+    HEALTH_DB_TIMEOUT = 2  # secondes
+    # /health/details (erreur de la base, pool, caches) : accès interne uniquement
+    HEALTH_DETAILS_ENABLED = os.environ.get('HEALTH_DETAILS_ENABLED', '').lower() in ('1', 'true', 'yes')
+    
+    # Journalisation asynchrone (file bornée, rotation, JSON) ; voir app.logging_setup
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_FILE = os.environ.get('LOG_FILE', 'app.log')
+    LOG_FORMAT = 'json'  # 'json' ou 'text'
+    LOG_ROTATION = 'size'  # 'size' ou 'time'
+    LOG_MAX_BYTES = 10 * 1024 * 1024
+    LOG_ROTATE_WHEN = 'midnight'
+    LOG_BACKUP_COUNT = 5
+    LOG_QUEUE_SIZE = 10000  # au-delà, les enregistrements sont abandonnés
+    
+    # Compression des réponses dynamiques (gzip, brotli s'il est installé)
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_SIZE = 1024  # octets ; en dessous, l'en-tête coûte plus qu'il ne rapporte
+    COMPRESSION_MIMETYPES = None  # défaut: app.compression.DEFAULT_MIMETYPES
+    COMPRESSION_GZIP_LEVEL = 6
+    COMPRESSION_BROTLI_QUALITY = 5
+    
+    # Fichiers statiques fingerprintés et précompressés par `flask assets build`
+    STATIC_FINGERPRINTS = True
+    STATIC_DIST_DIR = 'dist'
+    STATIC_IMMUTABLE_MAX_AGE = 365 * 24 * 3600  # secondes
+    
+    # Travail de schéma dans create_app : 'skip', 'check' (tête Alembic, sinon
+    # refus de démarrer) ou 'create' (create_all) ; `flask db upgrade` initialise
+    # une base neuve ou applique les migrations manquantes
+    SCHEMA_ON_STARTUP = os.environ.get('SCHEMA_ON_STARTUP', 'skip')
 
 class ProductionConfig(Config):
     """Configuration production"""
@@ -28,6 +164,7 @@ class ProductionConfig(Config):
     PROD_DB_DIR = "C:\\apps\\python-task-manager\\instance"
     PROD_DB_PATH = os.path.join(PROD_DB_DIR, 'tasks.db')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or f'sqlite:///{PROD_DB_PATH}'
+    SCHEMA_ON_STARTUP = os.environ.get('SCHEMA_ON_STARTUP', 'check')
 
 class DevelopmentConfig(Config):
     """Configuration développement"""
@@ -35,9 +172,14 @@ class DevelopmentConfig(Config):
     DEVELOPMENT = True
     # Utiliser le chemin relatif pour le développement
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///tasks.db'
+    SCHEMA_ON_STARTUP = os.environ.get('SCHEMA_ON_STARTUP', 'create')
+    # Fichiers d'origine : une modification est visible sans relancer le build
+    STATIC_FINGERPRINTS = False
 
 class TestingConfig(Config):
     """Configuration tests"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
-    WTF_CSRF_ENABLED = False
\ No newline at end of file
+    WTF_CSRF_ENABLED = False
+    # Hachage peu coûteux : les tests d'inscription n'évaluent pas la robustesse
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
\ No newline at end of file
@@ -46,16 +46,24 @@ ssh_cmd "
     pip install -r requirements.txt
 "
 
-# 4. Démarrer l'application
-echo "4. Démarrage application..."
+# 4. Migrer la base de données
+echo "4. Migration base de données..."
+ssh_cmd "
+    cd '$LIVE'
+    python -c 'from run import upgrade_database; upgrade_database()'
+    exit \$LASTEXITCODE
+"
+
+# 5. Démarrer l'application
+echo "5. Démarrage application..."
 ssh_cmd "
     cd '$LIVE'
     Start-Process -NoNewWindow -FilePath 'python' \`
         -ArgumentList '-m waitress --port=8000 --call ""run:main""'
 "
 
-# 5. Vérification
-echo "5. Vérification..."
+# 6. Vérification
+echo "6. Vérification..."
 sleep 5
 if ssh_cmd "Invoke-WebRequest 'http://localhost:8000/health' -UseBasicParsing" | grep -q "healthy"; then
     echo "Déploiement réussi!"
@@ -94,21 +94,15 @@ if [ $? -ne 0 ]; then
 fi
 log "   Dépendances installées"
 
-# Initialisation de la base de données
-log "5. Initialisation de la base de données..."
+# Migration de la base de données (SCHEMA_ON_STARTUP='check' refuse de
+# démarrer sur une base en retard sur les migrations)
+log "5. Migration de la base de données..."
 run_powershell "
     cd '$LIVE_PATH'
-    try {
-        \$output = & $PYTHON_EXE -c \`
-            \\\"from app import create_app; \\
-             from config import ProductionConfig; \\
-             app = create_app(ProductionConfig); \\
-             print('Base de données initialisée')\\\" 2>&1
-        Write-Host \$output
-    } catch {
-        Write-Host 'Note: Base de données déjà initialisée'
-    }
+    & $PYTHON_EXE -c 'from run import upgrade_database; upgrade_database()'
+    exit \$LASTEXITCODE
 "
+log "   Schéma à jour"
 
 # Démarrage de l'application
 log "6. Démarrage de l'application..."
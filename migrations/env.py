@@ -16,14 +16,23 @@ from config import Config
 # access to the values within the .ini file in use.
 config = context.config
 
-# Interpret the config file for Python logging.
-# This line sets up loggers basically.
-fileConfig(config.config_file_name)
-logger = logging.getLogger('alembic.env')
+# Connexion fournie par app.schema.upgrade_schema : l'application est déjà
+# configurée (journalisation comprise)
+app_connection = config.attributes.get('connection')
+
+if app_connection is None:
+    # Interpret the config file for Python logging.
+    # This line sets up loggers basically.
+    fileConfig(config.config_file_name)
 
-# Créer l'application Flask pour avoir le contexte
-app = create_app(Config)
-app.app_context().push()
+    # Créer l'application Flask pour avoir le contexte ; pas de vérification
+    # du schéma au démarrage, c'est justement lui qu'on met à jour
+    class MigrationConfig(Config):
+        SCHEMA_ON_STARTUP = 'skip'
+
+    app = create_app(MigrationConfig)
+    app.app_context().push()
+logger = logging.getLogger('alembic.env')
 
 def get_engine():
     return db.engine
@@ -31,7 +40,8 @@ def get_engine():
 def get_engine_url():
     return str(get_engine().url)
 
-config.set_main_option('sqlalchemy.url', get_engine_url())
+if app_connection is None:
+    config.set_main_option('sqlalchemy.url', get_engine_url())
 target_metadata = db.metadata
 
 def run_migrations_offline():
@@ -46,6 +56,12 @@ def run_migrations_offline():
 
 def run_migrations_online():
     """Run migrations in 'online' mode."""
+    if app_connection is not None:
+        context.configure(connection=app_connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = get_engine()
 
     with connectable.connect() as connection:
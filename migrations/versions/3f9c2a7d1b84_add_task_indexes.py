@@ -0,0 +1,41 @@
+"""Index composites sur la table tasks
+
+Revision ID: 3f9c2a7d1b84
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2a7d1b84'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    'ix_tasks_user_priority_created': ['user_id', 'priority', 'created_at'],
+    'ix_tasks_user_status_priority_created': ['user_id', 'status', 'priority', 'created_at'],
+}
+
+
+def _existing_indexes():
+    # create_all() a pu créer les index avant la première migration
+    inspector = sa.inspect(op.get_bind())
+    return {index['name'] for index in inspector.get_indexes('tasks')}
+
+
+def upgrade():
+    existing = _existing_indexes()
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'tasks', columns)
+
+
+def downgrade():
+    existing = _existing_indexes()
+    for name in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='tasks')
@@ -0,0 +1,55 @@
+"""Compteurs de statistiques par utilisateur et index sur l'échéance
+
+Revision ID: 5a0d2e7c8f41
+Revises: e2a6f83b9c15
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.models import TASK_STATS_DDL
+
+
+# revision identifiers, used by Alembic.
+revision = '5a0d2e7c8f41'
+down_revision = 'e2a6f83b9c15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_all() a pu créer la table et l'index avant la migration
+    inspector = sa.inspect(op.get_bind())
+    
+    if 'ix_tasks_user_due' not in {index['name'] for index in inspector.get_indexes('tasks')}:
+        op.create_index('ix_tasks_user_due', 'tasks', ['user_id', 'due_date'])
+    
+    if not inspector.has_table('task_stats'):
+        op.create_table(
+            'task_stats',
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('status', sa.String(length=11), nullable=False),
+            sa.Column('priority', sa.Integer(), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('user_id', 'status', 'priority')
+        )
+    
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in TASK_STATS_DDL:
+        op.execute(statement)
+    # Initialiser les compteurs à partir des tâches existantes
+    op.execute('DELETE FROM task_stats')
+    op.execute(
+        "INSERT INTO task_stats(user_id, status, priority, count) "
+        "SELECT user_id, IFNULL(status, ''), IFNULL(priority, 0), COUNT(*) FROM tasks "
+        "GROUP BY user_id, IFNULL(status, ''), IFNULL(priority, 0)"
+    )
+
+
+def downgrade():
+    for trigger in ('task_stats_insert', 'task_stats_delete', 'task_stats_update'):
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.drop_table('task_stats')
+    op.drop_index('ix_tasks_user_due', table_name='tasks')
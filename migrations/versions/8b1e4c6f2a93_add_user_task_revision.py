@@ -0,0 +1,36 @@
+"""Compteur de révision des tâches par utilisateur
+
+Revision ID: 8b1e4c6f2a93
+Revises: 3f9c2a7d1b84
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1e4c6f2a93'
+down_revision = '3f9c2a7d1b84'
+branch_labels = None
+depends_on = None
+
+
+def _has_column():
+    # create_all() a pu créer la colonne avant la migration
+    inspector = sa.inspect(op.get_bind())
+    return any(column['name'] == 'task_revision' for column in inspector.get_columns('users'))
+
+
+def upgrade():
+    if _has_column():
+        return
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('task_revision', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    if not _has_column():
+        return
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('task_revision')
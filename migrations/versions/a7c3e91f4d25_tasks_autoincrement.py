@@ -0,0 +1,53 @@
+"""Identifiants de tâches jamais réattribués (AUTOINCREMENT)
+
+Revision ID: a7c3e91f4d25
+Revises: f3b8d26a91c4
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.models import TASKS_FTS_DDL, TASK_STATS_DDL
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e91f4d25'
+down_revision = 'f3b8d26a91c4'
+branch_labels = None
+depends_on = None
+
+
+def autoincrement(bind):
+    table_sql = bind.scalar(sa.text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'"))
+    return 'AUTOINCREMENT' in table_sql.upper()
+
+
+def rebuild_tasks(enabled):
+    # La table est recopiée : ses triggers (index plein texte, compteurs)
+    # disparaissent avec l'ancienne et sont recréés ; les rowid, donc
+    # l'index tasks_fts, sont conservés
+    with op.batch_alter_table('tasks', recreate='always', table_kwargs={'sqlite_autoincrement': enabled}):
+        pass
+    for statement in TASKS_FTS_DDL + TASK_STATS_DDL:
+        op.execute(statement)
+
+
+def upgrade():
+    bind = op.get_bind()
+    # Ailleurs que sous SQLite, les séquences ne réattribuent pas les identifiants
+    if bind.dialect.name != 'sqlite':
+        return
+    # create_all() a pu créer la table directement en AUTOINCREMENT
+    if not autoincrement(bind):
+        rebuild_tasks(True)
+    # La séquence part au-delà des identifiants archivés, déjà réattribuables
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'tasks'")
+    op.execute("INSERT INTO sqlite_sequence(name, seq) SELECT 'tasks', MAX("
+               "(SELECT IFNULL(MAX(id), 0) FROM tasks), (SELECT IFNULL(MAX(id), 0) FROM archived_tasks))")
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite' or not autoincrement(bind):
+        return
+    rebuild_tasks(False)
@@ -0,0 +1,49 @@
+"""Révision par tâche et pierres tombales pour la synchronisation différentielle
+
+Revision ID: c4d7a19e5b02
+Revises: 8b1e4c6f2a93
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d7a19e5b02'
+down_revision = '8b1e4c6f2a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_all() a pu créer tout ou partie du schéma avant la migration
+    inspector = sa.inspect(op.get_bind())
+    
+    if not any(column['name'] == 'revision' for column in inspector.get_columns('tasks')):
+        with op.batch_alter_table('tasks') as batch_op:
+            batch_op.add_column(sa.Column('revision', sa.Integer(), nullable=False, server_default='0'))
+    
+    if 'ix_tasks_user_revision' not in {index['name'] for index in inspector.get_indexes('tasks')}:
+        op.create_index('ix_tasks_user_revision', 'tasks', ['user_id', 'revision'])
+    
+    if not inspector.has_table('task_tombstones'):
+        op.create_table(
+            'task_tombstones',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('task_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('revision', sa.Integer(), nullable=False),
+            sa.Column('deleted_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_task_tombstones_user_revision', 'task_tombstones', ['user_id', 'revision'])
+
+
+def downgrade():
+    op.drop_index('ix_task_tombstones_user_revision', table_name='task_tombstones')
+    op.drop_table('task_tombstones')
+    op.drop_index('ix_tasks_user_revision', table_name='tasks')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('revision')
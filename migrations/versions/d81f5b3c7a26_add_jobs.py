@@ -0,0 +1,79 @@
+"""Tâches de fond, rappels d'échéance et purge des pierres tombales
+
+Revision ID: d81f5b3c7a26
+Revises: 5a0d2e7c8f41
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81f5b3c7a26'
+down_revision = '5a0d2e7c8f41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_all() a pu créer tout ou partie du schéma avant la migration
+    inspector = sa.inspect(op.get_bind())
+    
+    if not any(column['name'] == 'tombstone_horizon' for column in inspector.get_columns('users')):
+        with op.batch_alter_table('users') as batch_op:
+            batch_op.add_column(sa.Column('tombstone_horizon', sa.Integer(), nullable=False, server_default='0'))
+    
+    if 'ix_tasks_due' not in {index['name'] for index in inspector.get_indexes('tasks')}:
+        op.create_index('ix_tasks_due', 'tasks', ['due_date'])
+    
+    tombstone_indexes = {index['name'] for index in inspector.get_indexes('task_tombstones')}
+    if 'ix_task_tombstones_deleted_at' not in tombstone_indexes:
+        op.create_index('ix_task_tombstones_deleted_at', 'task_tombstones', ['deleted_at'])
+    
+    if not inspector.has_table('jobs'):
+        op.create_table(
+            'jobs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=80), nullable=False),
+            sa.Column('key', sa.String(length=80), nullable=True),
+            sa.Column('payload', sa.Text(), nullable=False),
+            sa.Column('interval', sa.Integer(), nullable=True),
+            sa.Column('status', sa.String(length=10), nullable=False),
+            sa.Column('run_at', sa.DateTime(), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('max_attempts', sa.Integer(), nullable=False),
+            sa.Column('lease_owner', sa.String(length=80), nullable=True),
+            sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('key')
+        )
+        op.create_index('ix_jobs_status_run_at', 'jobs', ['status', 'run_at'])
+    
+    if not inspector.has_table('task_reminders'):
+        op.create_table(
+            'task_reminders',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('task_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('kind', sa.String(length=10), nullable=False),
+            sa.Column('due_date', sa.DateTime(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('task_id', 'kind', 'due_date', name='uq_task_reminders_task_kind_due')
+        )
+        op.create_index('ix_task_reminders_user_created', 'task_reminders', ['user_id', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_task_reminders_user_created', table_name='task_reminders')
+    op.drop_table('task_reminders')
+    op.drop_index('ix_jobs_status_run_at', table_name='jobs')
+    op.drop_table('jobs')
+    op.drop_index('ix_task_tombstones_deleted_at', table_name='task_tombstones')
+    op.drop_index('ix_tasks_due', table_name='tasks')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('tombstone_horizon')
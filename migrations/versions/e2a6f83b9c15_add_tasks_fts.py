@@ -0,0 +1,35 @@
+"""Index plein texte FTS5 sur les tâches
+
+Revision ID: e2a6f83b9c15
+Revises: c4d7a19e5b02
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.models import TASKS_FTS_DDL
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a6f83b9c15'
+down_revision = 'c4d7a19e5b02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    # Les instructions sont idempotentes (IF NOT EXISTS)
+    for statement in TASKS_FTS_DDL:
+        op.execute(statement)
+    # Indexer les tâches existantes
+    op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for trigger in ('tasks_fts_insert', 'tasks_fts_delete', 'tasks_fts_update'):
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS tasks_fts')
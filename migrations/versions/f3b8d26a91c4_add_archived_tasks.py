@@ -0,0 +1,64 @@
+"""Archive des tâches terminées
+
+Revision ID: f3b8d26a91c4
+Revises: d81f5b3c7a26
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.models import ARCHIVED_TASKS_DDL
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d26a91c4'
+down_revision = 'd81f5b3c7a26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_all() a pu créer tout ou partie du schéma avant la migration
+    inspector = sa.inspect(op.get_bind())
+
+    if 'ix_tasks_status_updated' not in {index['name'] for index in inspector.get_indexes('tasks')}:
+        op.create_index('ix_tasks_status_updated', 'tasks', ['status', 'updated_at'])
+
+    if not inspector.has_table('archived_tasks'):
+        op.create_table(
+            'archived_tasks',
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('title', sa.String(length=200), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('status', sa.Enum('PENDING', 'IN_PROGRESS', 'COMPLETED', name='taskstatus'), nullable=True),
+            sa.Column('priority', sa.Integer(), nullable=True),
+            sa.Column('due_date', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.Column('revision', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('archived_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_archived_tasks_user_priority_created', 'archived_tasks',
+                        ['user_id', 'priority', 'created_at'])
+
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in ARCHIVED_TASKS_DDL:
+        op.execute(statement)
+
+
+def downgrade():
+    # Les tâches archivées redeviennent actives (compteurs ajustés par les triggers)
+    columns = 'id, title, description, status, priority, due_date, created_at, updated_at, revision, user_id'
+    op.execute(f'INSERT INTO tasks ({columns}) SELECT {columns} FROM archived_tasks '
+               'WHERE id NOT IN (SELECT id FROM tasks)')
+    op.execute('DELETE FROM archived_tasks')
+    for trigger in ('archived_tasks_insert', 'archived_tasks_delete'):
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS archived_tasks_fts')
+    op.drop_index('ix_archived_tasks_user_priority_created', table_name='archived_tasks')
+    op.drop_table('archived_tasks')
+    op.drop_index('ix_tasks_status_updated', table_name='tasks')
@@ -1,36 +1,117 @@
+import atexit
+import logging
 import os
 from app import create_app
+from app.logging_setup import configure_logging, shutdown_logging
+from app.pool import check_pool_capacity
+from app.schema import upgrade_schema
 from config import ProductionConfig, DevelopmentConfig
-import logging
 
-# Configuration du logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s %(levelname)s %(name)s %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
-)
+def waitress_threads(config):
+    """Threads Waitress d'un processus"""
+    # Threads supplémentaires pour les flux SSE et les connexions en
+    # attente de hachage, sans priver l'API
+    return (config['WAITRESS_THREADS'] + config['SSE_MAX_STREAMS']
+            + config['PASSWORD_HASH_WORKERS'] + config['PASSWORD_HASH_MAX_PENDING'])
+
+def logging_config(config_class, slot=None):
+    """Réglages LOG_* lus sur la classe de configuration
+
+    La journalisation s'installe avant create_app : les messages émis pendant
+    la construction (profil SQLite, durée de démarrage) sont ainsi conservés.
+    Avec `slot`, un fichier de journal par worker (la rotation n'est pas sûre
+    entre processus).
+    """
+    config = {name: getattr(config_class, name) for name in dir(config_class) if name.startswith('LOG_')}
+    if slot is not None and config.get('LOG_FILE'):
+        root, ext = os.path.splitext(config['LOG_FILE'])
+        config['LOG_FILE'] = f'{root}.{slot}{ext}'
+    return config
+
+def environment_config():
+    """Environnement (FLASK_ENV, développement par défaut) et sa configuration"""
+    env = os.environ.get('FLASK_ENV', 'development')
+    return env, DevelopmentConfig if env == 'development' else ProductionConfig
+
+def upgrade_database():
+    """Migre la base de l'environnement courant ; à lancer avant main() à chaque déploiement
+
+    En production, SCHEMA_ON_STARTUP='check' refuse de démarrer sur une base
+    en retard sur les migrations.
+    """
+    env, config_class = environment_config()
+    
+    class UpgradeConfig(config_class):
+        SCHEMA_ON_STARTUP = 'skip'
+    
+    logging.basicConfig(level=logging.INFO)
+    app = create_app(UpgradeConfig)
+    with app.app_context():
+        upgrade_schema()
+    print(f"✅ Schéma à jour ({env}) : {app.config['SQLALCHEMY_DATABASE_URI']}")
+
+def start_jobs(app):
+    """Thread des tâches de fond dans ce processus si JOBS_IN_PROCESS"""
+    # Sinon, un processus `flask jobs worker` s'en charge
+    if app.config['JOBS_IN_PROCESS']:
+        app.extensions['jobs'].start()
+
+def serve_prefork(host, port, workers):
+    """Mode multi-processus : un maître et `workers` processus Waitress (Linux)
+
+    L'application est construite dans chaque worker, après le fork.
+    SIGHUP au maître remplace les workers en douceur, SIGTERM les arrête.
+    """
+    from app.prefork import Supervisor, listen_socket, serve_waitress
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s [maître] %(message)s')
+    sock = listen_socket(host, port)
+    
+    def run_worker(slot):
+        # Le handler console du maître est hérité du fork : la file le remplace
+        logging.getLogger().handlers.clear()
+        log_config = logging_config(ProductionConfig, slot)
+        configure_logging(log_config)
+        app = create_app(ProductionConfig)
+        app.config['LOG_FILE'] = log_config['LOG_FILE']
+        threads = waitress_threads(app.config)
+        check_pool_capacity(app.config, threads)
+        start_jobs(app)
+        serve_waitress(app, sock, graceful_timeout=app.config['WEB_GRACEFUL_TIMEOUT'],
+                       on_exit=shutdown_logging, threads=threads)
+    
+    print(f"🎯 Mode production - {workers} workers Waitress (maître {os.getpid()})")
+    Supervisor(run_worker, workers=workers,
+               graceful_timeout=ProductionConfig.WEB_GRACEFUL_TIMEOUT).run()
 
 def main():
     """Point d'entrée de l'application"""
     # Déterminer l'environnement
-    env = os.environ.get('FLASK_ENV', 'development')  # Défaut: développement
+    env, config_class = environment_config()
     
     print(f"🔧 Environnement détecté: {env}")
     
+    port = int(os.environ.get('PORT', 8000))
+    workers = ProductionConfig.WEB_WORKERS
+    
+    if env == 'production' and workers > 1 and hasattr(os, 'fork'):
+        # Aucune application (ni moteur SQLAlchemy) dans le maître
+        print(f"🚀 Démarrage de l'application sur 0.0.0.0:{port}")
+        print(f"📊 Base de données: {ProductionConfig.SQLALCHEMY_DATABASE_URI}")
+        serve_prefork('0.0.0.0', port, workers)
+        return
+    
+    # Journalisation non bloquante : les requêtes ne font que remplir une file
+    configure_logging(logging_config(config_class))
+    atexit.register(shutdown_logging)
+    
+    app = create_app(config_class)
     if env == 'development':
-        app = create_app(DevelopmentConfig)
         debug = True
         host = '127.0.0.1'
     else:
-        app = create_app(ProductionConfig)
         debug = False
         host = '0.0.0.0'
     
-    port = int(os.environ.get('PORT', 8000))
-    
     print(f"🚀 Démarrage de l'application sur {host}:{port}")
     print(f"📊 Base de données: {app.config['SQLALCHEMY_DATABASE_URI']}")
     
@@ -39,7 +120,11 @@ def main():
         try:
             from waitress import serve
             print(f"🎯 Mode production - Serveur Waitress")
-            serve(app, host=host, port=port)
+            threads = waitress_threads(app.config)
+            # Chaque thread peut tenir une connexion : le pool doit suivre
+            check_pool_capacity(app.config, threads)
+            start_jobs(app)
+            serve(app, host=host, port=port, threads=threads)
         except ImportError:
             print("⚠️ Waitress non installé, utilisation du serveur de développement")
             app.run(host=host, port=port, debug=debug)
@@ -49,4 +134,4 @@ def main():
         app.run(host=host, port=port, debug=debug)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,5 +1,6 @@
 import pytest
 from app import create_app, db
+from app.models import User
 from config import TestingConfig
 
 @pytest.fixture
@@ -21,4 +22,24 @@ def client(app):
 @pytest.fixture
 def runner(app):
     """Runner pour les commandes CLI"""
-    return app.test_cli_runner()
\ No newline at end of file
+    return app.test_cli_runner()
+
+@pytest.fixture
+def api_user(app):
+    """Utilisateur persisté pour les tests de l'API"""
+    user = User(
+        username='apiuser',
+        email='api@example.com',
+        password_hash='hashed_password'
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+@pytest.fixture
+def auth_client(client, api_user):
+    """Client de test connecté en tant que api_user"""
+    with client.session_transaction() as session:
+        session['_user_id'] = str(api_user.id)
+        session['_fresh'] = True
+    return client
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+import pytest
+from app.archive import archive_completed
+from app.jobs import HANDLERS
+from app.models import db, ArchivedTask, Task, TaskStatus
+from app.stats import compare_stats
+
+@pytest.fixture
+def history(api_user):
+    """Identifiants de tâches anciennes et récentes, terminées ou non"""
+    old = datetime.utcnow() - timedelta(days=200)
+    tasks = []
+    for i in range(10):
+        status = TaskStatus.COMPLETED if i < 6 else TaskStatus.PENDING
+        stamp = old if i % 2 == 0 or i >= 6 else datetime.utcnow()
+        tasks.append(Task(title=f'Rapport {i}', description='budget annuel', status=status, priority=i % 3 + 1,
+                          created_at=stamp, updated_at=stamp, user_id=api_user.id))
+    # Terminée récemment : reste active
+    tasks.append(Task(title='Dernière', status=TaskStatus.COMPLETED, created_at=old, updated_at=datetime.utcnow(),
+                      user_id=api_user.id))
+    db.session.add_all(tasks)
+    db.session.commit()
+    return [task.id for task in tasks]
+
+def cutoff():
+    return datetime.utcnow() - timedelta(days=90)
+
+class TestArchive:
+    """Tests pour l'archivage des tâches terminées"""
+
+    def test_archive_in_batches(self, app, auth_client, history):
+        """Test le déplacement par lots et les compteurs de statistiques"""
+        stats = auth_client.get('/api/tasks/stats').get_json()
+        batches = []
+        assert archive_completed(cutoff(), batch_size=2, on_batch=lambda: batches.append(1)) == 3
+        assert len(batches) == 2
+        assert archive_completed(cutoff(), batch_size=2) == 0
+
+        archived = {task.id for task in ArchivedTask.query}
+        assert archived == {history[i] for i in (0, 2, 4)}
+        assert not Task.query.filter(Task.id.in_(archived)).count()
+        assert compare_stats() == {}
+        # Les statistiques comptent toujours les tâches archivées
+        assert auth_client.get('/api/tasks/stats').get_json() == stats
+
+    def test_job_uses_configured_age(self, app, history):
+        """Test la tâche de fond et sa désactivation"""
+        app.config['ARCHIVE_AFTER_DAYS'] = None
+        HANDLERS['archive_tasks']({})
+        assert ArchivedTask.query.count() == 0
+
+        app.config['ARCHIVE_AFTER_DAYS'] = 300
+        HANDLERS['archive_tasks']({})
+        assert ArchivedTask.query.count() == 0
+
+        app.config['ARCHIVE_AFTER_DAYS'] = 90
+        HANDLERS['archive_tasks']({})
+        assert ArchivedTask.query.count() == 3
+
+    def test_archive_command(self, runner, history):
+        """Test `flask tasks archive`"""
+        result = runner.invoke(args=['tasks', 'archive', '--days', '90'])
+        assert result.exit_code == 0, result.output
+        assert '3 tâche(s)' in result.output
+
+    def test_include_archived(self, auth_client, history):
+        """Test la liste avec et sans les tâches archivées"""
+        archive_completed(cutoff())
+        hot = auth_client.get('/api/tasks').get_json()
+        assert len(hot) == 8
+        full = auth_client.get('/api/tasks?include_archived=1').get_json()
+        assert {task['id'] for task in full} == set(history)
+
+        completed = auth_client.get('/api/tasks?status=completed&include_archived=true').get_json()
+        assert len(completed) == 7
+
+        # Pagination : mêmes lignes, même ordre que la liste complète
+        pages, cursor = [], None
+        while True:
+            url = '/api/tasks?include_archived=1&limit=4' + (f'&cursor={cursor}' if cursor else '')
+            page = auth_client.get(url).get_json()
+            pages.extend(page['tasks'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert pages == full
+
+        exported = auth_client.get('/api/tasks/export?include_archived=1').get_data(as_text=True)
+        assert len(exported.splitlines()) == 11
+
+    def test_archive_endpoints(self, auth_client, history):
+        """Test la lecture, la pagination et la recherche des tâches archivées"""
+        archive_completed(cutoff())
+        page = auth_client.get('/api/tasks/archive?limit=2').get_json()
+        assert len(page['tasks']) == 2 and page['next_cursor']
+        rest = auth_client.get(f"/api/tasks/archive?limit=2&cursor={page['next_cursor']}").get_json()
+        assert len(rest['tasks']) == 1 and rest['next_cursor'] is None
+
+        task_id = history[2]
+        task = auth_client.get(f'/api/tasks/archive/{task_id}').get_json()
+        assert task['title'] == 'Rapport 2' and task['archived_at']
+        assert auth_client.get(f'/api/tasks/archive/{history[1]}').status_code == 404
+
+        archived = {history[i] for i in (0, 2, 4)}
+        found = auth_client.get('/api/tasks/archive?q=rapp').get_json()['tasks']
+        assert {task['id'] for task in found} == archived
+        # L'index plein texte des tâches actives ne contient plus les tâches archivées
+        hot = auth_client.get('/api/tasks/search?q=rapport').get_json()
+        assert len(hot) == 7 and not archived & {task['id'] for task in hot}
+
+        assert auth_client.get('/api/tasks/archive?cursor=%%%').status_code == 400
+
+    def test_archived_tasks_read_only(self, auth_client, history):
+        """Test qu'une tâche archivée ne peut plus être modifiée par l'API des tâches"""
+        archive_completed(cutoff())
+        task_id = history[0]
+        assert auth_client.get(f'/api/tasks/{task_id}').status_code == 404
+        assert auth_client.put(f'/api/tasks/{task_id}', json={'title': 'x'}).status_code == 404
+        assert auth_client.patch(f'/api/tasks/{task_id}', json={'title': 'x'}).status_code == 404
+        assert auth_client.delete(f'/api/tasks/{task_id}').status_code == 404
+
+    def test_archiving_forces_resync(self, auth_client, history):
+        """Test que les jetons antérieurs à l'archivage demandent un rechargement"""
+        token = auth_client.get('/api/tasks?limit=1').get_json()['sync_token']
+        archive_completed(cutoff())
+        changes = auth_client.get(f'/api/tasks/changes?since={token}').get_json()
+        assert changes['resync'] is True
+
+        token = changes['token']
+        assert auth_client.get(f'/api/tasks/changes?since={token}').get_json()['changed'] == []
+
+    def test_archived_ids_never_reused(self, auth_client, history):
+        """Test qu'une tâche créée après suppression de la plus récente ne reprend pas un identifiant archivé"""
+        for task_id in history[-5:]:
+            assert auth_client.delete(f'/api/tasks/{task_id}').status_code == 200
+        assert archive_completed(cutoff()) == 3
+        newest = Task.query.order_by(Task.id.desc()).first()
+        assert auth_client.delete(f'/api/tasks/{newest.id}').status_code == 200
+
+        created = auth_client.post('/api/tasks', json={'title': 'Nouvelle'}).get_json()
+        assert created['id'] > max(history)
+        full = auth_client.get('/api/tasks?include_archived=1').get_json()
+        ids = [task['id'] for task in full]
+        assert len(ids) == len(set(ids))
@@ -0,0 +1,28 @@
+import pytest
+from benchmarks.common import compare, save_results
+
+RESULTS = {'query.stats': {'p50_ms': 10.0}}
+
+class TestBaseline:
+    """Tests pour le fichier de référence des benchmarks"""
+
+    def test_compare_same_parameters(self, tmp_path):
+        """Test la comparaison avec les paramètres de la référence"""
+        path = tmp_path / 'baseline.json'
+        save_results('micro', RESULTS, {'tasks': 1000, 'repeat': 50}, path=path)
+        slower = {'query.stats': {'p50_ms': 20.0}}
+        assert compare('micro', slower, 0.2, {'tasks': 1000, 'repeat': 50}, path=path) == ['query.stats']
+
+    def test_compare_refuses_other_parameters(self, tmp_path, capsys):
+        """Test le refus de comparer des exécutions de charges différentes"""
+        path = tmp_path / 'baseline.json'
+        save_results('micro', RESULTS, {'tasks': 1000, 'repeat': 50}, path=path)
+        with pytest.raises(SystemExit) as exit_info:
+            compare('micro', RESULTS, 0.2, {'tasks': 100, 'repeat': 50}, path=path)
+        assert exit_info.value.code == 2
+        assert 'tasks' in capsys.readouterr().out
+
+        # Référence sans paramètres (fichier antérieur) : à ré-enregistrer
+        path.write_text('{"micro": {"results": {}}}', encoding='utf-8')
+        with pytest.raises(SystemExit):
+            compare('micro', RESULTS, 0.2, {'tasks': 1000, 'repeat': 50}, path=path)
@@ -0,0 +1,111 @@
+import pytest
+from sqlalchemy import event
+from app.models import Task, TaskStatus, User, db
+
+def post_batch(client, operations):
+    return client.post('/api/tasks/batch', json={'operations': operations})
+
+class TestBatchEndpoint:
+    """Tests pour POST /api/tasks/batch"""
+    
+    def test_mixed_batch(self, auth_client, api_user):
+        """Test création, mise à jour et suppression dans un même lot"""
+        existing = Task(title='Existing', user_id=api_user.id)
+        doomed = Task(title='Doomed', user_id=api_user.id)
+        db.session.add_all([existing, doomed])
+        db.session.commit()
+        existing_id, doomed_id = existing.id, doomed.id
+        
+        response = post_batch(auth_client, [
+            {'op': 'create', 'data': {'title': 'New 1', 'priority': 4}},
+            {'op': 'update', 'id': existing_id, 'data': {'status': 'completed', 'title': 'Renamed'}},
+            {'op': 'create', 'data': {'title': 'New 2', 'due_date': '2025-01-01T10:00:00Z'}},
+            {'op': 'delete', 'id': doomed_id},
+        ])
+        assert response.status_code == 200
+        
+        results = response.get_json()['results']
+        assert [r['index'] for r in results] == [0, 1, 2, 3]
+        assert results[0]['status'] == 201
+        assert results[0]['task']['title'] == 'New 1'
+        assert results[0]['task']['priority'] == 4
+        assert results[1]['task']['status'] == 'completed'
+        assert results[1]['task']['title'] == 'Renamed'
+        assert results[2]['task']['due_date'].startswith('2025-01-01T10:00:00')
+        assert results[3] == {'index': 3, 'status': 200, 'id': doomed_id, 'deleted': True}
+        
+        assert db.session.get(Task, doomed_id) is None
+        assert Task.query.filter_by(user_id=api_user.id).count() == 3
+    
+    def test_invalid_batch_is_not_applied(self, auth_client, api_user):
+        """Test qu'une opération invalide annule tout le lot"""
+        response = post_batch(auth_client, [
+            {'op': 'create', 'data': {'title': 'Valid'}},
+            {'op': 'create', 'data': {'description': 'sans titre'}},
+            {'op': 'update', 'id': 9999, 'data': {'title': 'x'}},
+            {'op': 'frobnicate'},
+        ])
+        assert response.status_code == 400
+        
+        errors = response.get_json()['results']
+        assert [(e['index'], e['status']) for e in errors] == [(1, 400), (2, 404), (3, 400)]
+        assert Task.query.count() == 0
+    
+    def test_boolean_id_rejected(self, auth_client, api_user):
+        """Test qu'un identifiant booléen n'est pas pris pour la tâche 1"""
+        task = Task(title='First', user_id=api_user.id)
+        db.session.add(task)
+        db.session.commit()
+        assert task.id == 1
+        
+        response = post_batch(auth_client, [{'op': 'delete', 'id': True}])
+        assert response.status_code == 400
+        assert response.get_json()['results'][0]['status'] == 400
+        assert db.session.get(Task, 1) is not None
+    
+    def test_cannot_touch_other_users_tasks(self, auth_client, api_user):
+        """Test qu'un lot ne peut pas modifier les tâches d'un autre utilisateur"""
+        other = User(username='other', email='other@example.com', password_hash='x')
+        db.session.add(other)
+        db.session.commit()
+        task = Task(title='Not yours', user_id=other.id)
+        db.session.add(task)
+        db.session.commit()
+        
+        response = post_batch(auth_client, [{'op': 'delete', 'id': task.id}])
+        assert response.status_code == 400
+        assert response.get_json()['results'][0]['status'] == 404
+        assert db.session.get(Task, task.id) is not None
+    
+    def test_duplicate_target_and_limits(self, auth_client, api_user):
+        """Test les cibles en double, le lot vide et la taille maximale"""
+        task = Task(title='Twice', user_id=api_user.id)
+        db.session.add(task)
+        db.session.commit()
+        
+        response = post_batch(auth_client, [
+            {'op': 'update', 'id': task.id, 'data': {'title': 'a'}},
+            {'op': 'delete', 'id': task.id},
+        ])
+        assert response.status_code == 400
+        
+        assert post_batch(auth_client, []).status_code == 400
+        
+        max_ops = auth_client.application.config['TASKS_BATCH_MAX_OPERATIONS']
+        too_many = [{'op': 'create', 'data': {'title': 't'}}] * (max_ops + 1)
+        assert post_batch(auth_client, too_many).status_code == 400
+    
+    def test_large_batch_single_commit(self, auth_client, api_user):
+        """Test qu'un lot volumineux est écrit en une seule transaction"""
+        commits = []
+        listener = lambda conn: commits.append(conn)
+        event.listen(db.engine, 'commit', listener)
+        try:
+            operations = [{'op': 'create', 'data': {'title': f'Bulk {i}'}} for i in range(500)]
+            response = post_batch(auth_client, operations)
+        finally:
+            event.remove(db.engine, 'commit', listener)
+        
+        assert response.status_code == 200
+        assert len(commits) == 1
+        assert Task.query.filter_by(user_id=api_user.id, status=TaskStatus.PENDING).count() == 500
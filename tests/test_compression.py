@@ -0,0 +1,118 @@
+import gzip
+import os
+import shutil
+import pytest
+from app.models import db, Task
+from app.assets import build_assets, MANIFEST_NAME
+from app.compression import init_compression
+
+@pytest.fixture
+def many_tasks(api_user):
+    """Assez de tâches pour dépasser le seuil de compression"""
+    db.session.add_all(Task(title=f'Tâche {i}', description='Description ' * 5, user_id=api_user.id)
+                       for i in range(40))
+    db.session.commit()
+
+@pytest.fixture
+def static_copy(app, tmp_path):
+    """Copie des fichiers statiques de l'application, servie à la place de l'originale"""
+    folder = str(tmp_path / 'static')
+    shutil.copytree(app.static_folder, folder, ignore=shutil.ignore_patterns('dist'))
+    assets = app.extensions['static_assets']
+    assets.static_folder = folder
+    app.static_folder = folder
+    return folder
+
+class TestCompression:
+    """Tests pour la compression des réponses dynamiques"""
+
+    def test_gzip_json(self, auth_client, many_tasks):
+        """Test la compression de /api/tasks et l'ETag faible associé"""
+        plain = auth_client.get('/api/tasks')
+        response = auth_client.get('/api/tasks', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert gzip.decompress(response.get_data()) == plain.get_data()
+        assert int(response.headers['Content-Length']) < len(plain.get_data())
+        assert response.headers['ETag'] == 'W/' + plain.headers['ETag']
+
+        revalidated = auth_client.get('/api/tasks', headers={
+            'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+        assert revalidated.status_code == 304
+
+    def test_skipped_responses(self, app, auth_client, api_user, many_tasks):
+        """Test l'absence de compression sous le seuil, sans Accept-Encoding ou en flux"""
+        headers = {'Accept-Encoding': 'gzip'}
+        task_id = Task.query.first().id
+        small = auth_client.get(f'/api/tasks/{task_id}', headers=headers)
+        assert 'Content-Encoding' not in small.headers
+        assert 'Accept-Encoding' in small.headers['Vary']
+
+        assert 'Content-Encoding' not in auth_client.get('/api/tasks').headers
+        refused = auth_client.get('/api/tasks', headers={'Accept-Encoding': 'gzip;q=0'})
+        assert 'Content-Encoding' not in refused.headers
+
+        # L'export compresse lui-même son flux : le hook n'y touche pas
+        export = auth_client.get('/api/tasks/export', headers=headers)
+        assert export.is_streamed
+        export.close()
+        assert app.extensions['compression'].stats()['compressed'] == 0
+
+    def test_disabled(self, app):
+        """Test COMPRESSION_ENABLED = False"""
+        app.config['COMPRESSION_ENABLED'] = False
+        assert init_compression(app) is None
+        assert app.extensions['compression'] is None
+
+class TestStaticAssets:
+    """Tests pour les fichiers statiques fingerprintés et précompressés"""
+
+    def test_build(self, static_copy):
+        """Test le manifeste, les variantes compressées et la stabilité des noms"""
+        manifest = build_assets(static_copy)
+        hashed = manifest['js/tasks.js']
+        assert hashed.startswith('dist/js/tasks.') and hashed.endswith('.js')
+
+        target = os.path.join(static_copy, *hashed.split('/'))
+        with open(os.path.join(static_copy, 'js', 'tasks.js'), 'rb') as f:
+            original = f.read()
+        with open(target + '.gz', 'rb') as f:
+            assert gzip.decompress(f.read()) == original
+        assert os.path.exists(os.path.join(static_copy, 'dist', MANIFEST_NAME))
+        assert build_assets(static_copy) == manifest
+
+    def test_serve_fingerprinted(self, app, client, auth_client, static_copy):
+        """Test le service précompressé, immutable, et la référence dans le template"""
+        build_assets(static_copy)
+        assets = app.extensions['static_assets']
+        assets.load()
+        hashed = assets.manifest['js/tasks.js']
+
+        page = auth_client.get('/tasks').get_data(as_text=True)
+        assert f'/static/{hashed}' in page
+
+        response = client.get(f'/static/{hashed}', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+        assert response.mimetype in ('application/javascript', 'text/javascript')
+        assert gzip.decompress(response.get_data()) == client.get(f'/static/{hashed}').get_data()
+        response.close()
+
+    def test_without_manifest(self, app, auth_client):
+        """Test le repli sur les fichiers d'origine sans build"""
+        assets = app.extensions['static_assets']
+        assets.manifest, assets.variants = {}, {}
+        page = auth_client.get('/tasks').get_data(as_text=True)
+        assert '/static/js/tasks.js' in page
+        response = auth_client.get('/static/js/tasks.js')
+        assert response.status_code == 200
+        assert 'immutable' not in response.headers.get('Cache-Control', '')
+        response.close()
+
+    def test_build_command(self, runner, static_copy):
+        """Test la commande flask assets build"""
+        result = runner.invoke(args=['assets', 'build'])
+        assert result.exit_code == 0
+        assert 'js/tasks.js -> dist/js/tasks.' in result.output
@@ -0,0 +1,32 @@
+from werkzeug.security import check_password_hash
+from app.models import db, User, Task, TaskStatus
+from app.stats import compare_stats
+from benchmarks.datagen import generate, BENCH_PASSWORD
+
+class TestDataGenerator:
+    """Tests pour le générateur de données des benchmarks"""
+
+    def test_generate_users_and_tasks(self, app):
+        """Test le volume, la répartition et la cohérence des compteurs"""
+        user_ids = generate(3, 200, seed=1)
+
+        assert len(user_ids) == 3
+        assert Task.query.count() == 600
+        for user_id in user_ids:
+            assert Task.query.filter_by(user_id=user_id).count() == 200
+
+        statuses = {status: Task.query.filter_by(status=status).count() for status in TaskStatus}
+        assert all(count > 0 for count in statuses.values())
+        assert statuses[TaskStatus.PENDING] > statuses[TaskStatus.IN_PROGRESS]
+        assert Task.query.filter(Task.due_date.is_(None)).count() > 0
+
+        user = db.session.get(User, user_ids[0])
+        assert user.username == 'bench0'
+        assert check_password_hash(user.password_hash, BENCH_PASSWORD)
+        assert compare_stats() == {}
+
+    def test_generate_appends_accounts(self, app):
+        """Test qu'un second appel ajoute de nouveaux comptes"""
+        generate(2, 1)
+        generate(1, 1)
+        assert db.session.get(User, 3).username == 'bench2'
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import event
+from app.models import Task, db
+
+def task_selects(client, url, **kwargs):
+    """Exécute une requête GET et renvoie les SELECT émis sur la table tasks"""
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        response = client.get(url, **kwargs)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return response, [s for s in statements if 'FROM tasks' in s]
+
+class TestConditionalGet:
+    """Tests pour les ETags de l'API tâches"""
+    
+    def test_list_returns_304_without_loading_rows(self, auth_client, api_user):
+        """Test qu'un If-None-Match valide évite la lecture des tâches"""
+        auth_client.post('/api/tasks', json={'title': 'Cached'})
+        
+        first = auth_client.get('/api/tasks')
+        assert first.status_code == 200
+        etag = first.headers['ETag']
+        assert not etag.startswith('W/')
+        
+        response, selects = task_selects(auth_client, '/api/tasks', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert selects == []
+    
+    def test_writes_change_the_etag(self, auth_client, api_user):
+        """Test que création, modification et suppression invalident l'ETag"""
+        etags = [auth_client.get('/api/tasks').headers['ETag']]
+        
+        task_id = auth_client.post('/api/tasks', json={'title': 'A'}).get_json()['id']
+        etags.append(auth_client.get('/api/tasks').headers['ETag'])
+        
+        auth_client.put(f'/api/tasks/{task_id}', json={'title': 'B'})
+        etags.append(auth_client.get('/api/tasks').headers['ETag'])
+        
+        auth_client.post('/api/tasks/batch', json={'operations': [{'op': 'create', 'data': {'title': 'C'}}]})
+        etags.append(auth_client.get('/api/tasks').headers['ETag'])
+        
+        auth_client.delete(f'/api/tasks/{task_id}')
+        etags.append(auth_client.get('/api/tasks').headers['ETag'])
+        
+        assert len(set(etags)) == len(etags)
+        
+        response = auth_client.get('/api/tasks', headers={'If-None-Match': etags[0]})
+        assert response.status_code == 200
+        assert len(response.get_json()) == 1
+    
+    def test_single_task_get(self, auth_client, api_user):
+        """Test la lecture d'une tâche et sa revalidation"""
+        task_id = auth_client.post('/api/tasks', json={'title': 'One'}).get_json()['id']
+        
+        response = auth_client.get(f'/api/tasks/{task_id}')
+        assert response.status_code == 200
+        assert response.get_json()['title'] == 'One'
+        
+        etag = response.headers['ETag']
+        response, selects = task_selects(auth_client, f'/api/tasks/{task_id}', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert selects == []
+        
+        assert auth_client.get('/api/tasks/9999').status_code == 404
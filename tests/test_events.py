@@ -0,0 +1,90 @@
+import pytest
+from app.events import TaskEventBus, StreamCapacityError, event_stream
+
+def read_event(chunks):
+    """Lit le prochain bloc SSE qui n'est pas un battement de cœur"""
+    for chunk in chunks:
+        chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if not chunk.startswith(':'):
+            return chunk
+
+class TestEventBus:
+    """Tests pour le bus d'événements en mémoire"""
+    
+    def test_publish_to_user_subscribers_only(self):
+        """Test que seuls les abonnés de l'utilisateur reçoivent l'événement"""
+        bus = TaskEventBus()
+        mine = bus.subscribe(1)
+        other = bus.subscribe(2)
+        bus.publish(1, {'revision': 3})
+        assert mine.get(timeout=0) == {'revision': 3}
+        assert other.get(timeout=0) is None
+    
+    def test_bounded_queue_and_capacity(self):
+        """Test les files bornées et le nombre maximal d'abonnés"""
+        bus = TaskEventBus(max_subscribers=1, queue_size=2)
+        subscription = bus.subscribe(1)
+        for revision in range(5):
+            bus.publish(1, {'revision': revision})
+        assert subscription.dropped == 3
+        assert bus.dropped == 3
+        
+        with pytest.raises(StreamCapacityError):
+            bus.subscribe(2)
+        bus.unsubscribe(subscription)
+        assert bus.active() == 0
+        bus.subscribe(2)
+    
+    def test_stream_polls_other_processes(self):
+        """Test la relecture de la révision quand un autre worker a écrit"""
+        bus = TaskEventBus()
+        revisions = iter([0, 4, 4])
+        stream = event_stream(bus, bus.subscribe(1), current_revision=0, last_event_id=None,
+                              heartbeat=60, timeout=5, retry_ms=1000,
+                              poll=lambda: next(revisions), poll_interval=0.01)
+        assert next(stream).startswith('retry:')
+        message = next(stream)
+        assert message.startswith('id: 4\n')
+        
+        # Les écritures du processus arrivent toujours par le bus
+        bus.publish(1, {'revision': 5})
+        assert next(stream).startswith('id: 5\n')
+        stream.close()
+        assert bus.active() == 0
+
+class TestTaskStream:
+    """Tests pour /api/tasks/stream"""
+    
+    def test_stream_receives_commits(self, app, auth_client, api_user):
+        """Test qu'une écriture validée est poussée dans le flux"""
+        app.config['SSE_HEARTBEAT'] = 0.05
+        response = auth_client.get('/api/tasks/stream', buffered=False)
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        
+        chunks = iter(response.response)
+        assert read_event(chunks).startswith('retry:')
+        
+        auth_client.post('/api/tasks', json={'title': 'Pushed'})
+        message = read_event(chunks)
+        assert 'event: tasks' in message
+        assert '"revision": 1' in message
+        
+        response.close()
+        assert app.extensions['task_events'].active() == 0
+    
+    def test_reconnect_catches_up(self, app, auth_client, api_user):
+        """Test qu'une reconnexion avec Last-Event-ID rattrape les changements"""
+        auth_client.post('/api/tasks', json={'title': 'Missed'})
+        response = auth_client.get('/api/tasks/stream', headers={'Last-Event-ID': '0'}, buffered=False)
+        chunks = iter(response.response)
+        read_event(chunks)
+        assert 'id: 1' in read_event(chunks)
+        response.close()
+    
+    def test_stream_limit(self, app, auth_client, api_user):
+        """Test qu'au-delà de la limite le flux est refusé avec Retry-After"""
+        app.extensions['task_events'].max_subscribers = 0
+        response = auth_client.get('/api/tasks/stream')
+        assert response.status_code == 503
+        assert 'Retry-After' in response.headers
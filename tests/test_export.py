@@ -0,0 +1,103 @@
+import csv
+import gzip
+import io
+import json
+import os
+import pytest
+from app.models import Task, TaskStatus, db
+
+def insert_synthetic_tasks(user_id, count):
+    """Insère rapidement `count` tâches via executemany"""
+    statuses = [status.name for status in TaskStatus]
+    now = '2024-01-01 00:00:00.000000'
+    rows = (
+        {'title': f'Task {i}', 'description': 'x' * 40, 'status': statuses[i % 3],
+         'priority': i % 5 + 1, 'created_at': now, 'updated_at': now, 'user_id': user_id}
+        for i in range(count)
+    )
+    # executemany direct sur le curseur DB-API : sans surcoût SQLAlchemy par ligne.
+    # L'index plein texte n'intervient pas dans l'export : son trigger est retiré
+    # pour accélérer le remplissage de cette base de test jetable.
+    connection = db.session.connection().connection
+    connection.execute('DROP TRIGGER IF EXISTS tasks_fts_insert')
+    connection.executemany(
+        'INSERT INTO tasks (title, description, status, priority, created_at, updated_at, user_id, revision) '
+        'VALUES (:title, :description, :status, :priority, :created_at, :updated_at, :user_id, 0)',
+        rows
+    )
+    db.session.commit()
+
+def current_rss():
+    """RSS courant du processus en octets (Linux)"""
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+class TestExport:
+    """Tests pour /api/tasks/export"""
+    
+    def test_ndjson_export(self, auth_client, api_user):
+        """Test l'export NDJSON identique à to_dict"""
+        auth_client.post('/api/tasks', json={'title': 'Première', 'due_date': '2025-03-01T09:00:00'})
+        auth_client.post('/api/tasks', json={'title': 'Seconde'})
+        
+        response = auth_client.get('/api/tasks/export?format=ndjson')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        
+        rows = [json.loads(line) for line in response.data.decode().splitlines()]
+        expected = [task.to_dict() for task in Task.query.order_by(Task.id)]
+        assert rows == expected
+    
+    def test_csv_export_with_status_filter(self, auth_client, api_user):
+        """Test l'export CSV filtré par statut"""
+        auth_client.post('/api/tasks', json={'title': 'Open'})
+        done = auth_client.post('/api/tasks', json={'title': 'Done, really'}).get_json()
+        auth_client.put(f"/api/tasks/{done['id']}", json={'status': 'completed'})
+        
+        response = auth_client.get('/api/tasks/export?format=csv&status=completed')
+        rows = list(csv.DictReader(io.StringIO(response.data.decode())))
+        assert [row['title'] for row in rows] == ['Done, really']
+        assert rows[0]['status'] == 'completed'
+    
+    def test_gzip_and_invalid_parameters(self, auth_client, api_user):
+        """Test la compression gzip et les paramètres invalides"""
+        auth_client.post('/api/tasks', json={'title': 'Compressed'})
+        response = auth_client.get('/api/tasks/export', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.data))['title'] == 'Compressed'
+        
+        assert auth_client.get('/api/tasks/export?format=xml').status_code == 400
+        assert auth_client.get('/api/tasks/export?status=nope').status_code == 400
+    
+    def test_export_streamed_in_batches(self, app, auth_client, api_user):
+        """Test que l'export est émis bloc par bloc, sans matérialiser toutes les lignes"""
+        app.config['TASKS_EXPORT_BATCH_SIZE'] = 100
+        insert_synthetic_tasks(api_user.id, 250)
+        
+        response = auth_client.get('/api/tasks/export?format=ndjson', buffered=False)
+        chunks = list(response.response)
+        response.close()
+        assert [chunk.count(b'\n') for chunk in chunks] == [100, 100, 50]
+    
+    # Plusieurs dizaines de secondes : lancé seulement avec EXPORT_TEST_ROWS
+    # (par exemple EXPORT_TEST_ROWS=1000000)
+    @pytest.mark.skipif(not os.environ.get('EXPORT_TEST_ROWS'), reason='définir EXPORT_TEST_ROWS')
+    @pytest.mark.skipif(not os.path.exists('/proc/self/statm'), reason='mesure RSS Linux uniquement')
+    def test_large_export_constant_memory(self, auth_client, api_user):
+        """Test qu'un export volumineux garde une mémoire bornée"""
+        row_count = int(os.environ.get('EXPORT_TEST_ROWS', 0))
+        insert_synthetic_tasks(api_user.id, row_count)
+        db.session.expunge_all()
+        
+        baseline = current_rss()
+        peak = baseline
+        lines = 0
+        response = auth_client.get('/api/tasks/export?format=ndjson', buffered=False)
+        for chunk in response.response:
+            lines += chunk.count(b'\n')
+            peak = max(peak, current_rss())
+        response.close()
+        
+        assert lines == row_count
+        # Matérialiser l'export coûterait plusieurs centaines de Mo
+        assert peak - baseline < 64 * 1024 * 1024
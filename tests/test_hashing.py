@@ -0,0 +1,111 @@
+import threading
+import pytest
+from werkzeug.security import generate_password_hash, check_password_hash
+from app import hashing
+from app.hashing import PasswordHasher, HashingOverloaded
+from app.models import User, db
+
+FAST_METHOD = 'pbkdf2:sha256:1000'
+
+class TestPasswordHasher:
+    """Tests pour le pool de hachage des mots de passe"""
+
+    def test_hash_and_check(self):
+        """Test l'aller-retour hash / vérification dans le pool"""
+        hasher = PasswordHasher(FAST_METHOD, workers=1)
+        pwhash = hasher.hash('secret')
+        assert pwhash.startswith('pbkdf2:sha256:1000$')
+        assert hasher.check(pwhash, 'secret')
+        assert not hasher.check(pwhash, 'wrong')
+        assert hasher.stats()['completed'] == 3
+
+    def test_needs_rehash(self):
+        """Test la détection des hashs d'une autre méthode ou d'un autre coût"""
+        hasher = PasswordHasher(FAST_METHOD, workers=0)
+        assert not hasher.needs_rehash(generate_password_hash('x', FAST_METHOD))
+        assert hasher.needs_rehash(generate_password_hash('x', 'pbkdf2:sha256:500'))
+        assert hasher.needs_rehash(generate_password_hash('x', 'scrypt'))
+
+    def test_full_queue_rejects(self, monkeypatch):
+        """Test qu'une demande au-delà de la file est refusée sans attendre"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_hash(password, method):
+            started.set()
+            release.wait(5)
+            return 'hash'
+
+        monkeypatch.setattr(hashing, 'generate_password_hash', slow_hash)
+        hasher = PasswordHasher(FAST_METHOD, workers=1, max_pending=0)
+
+        results = []
+        thread = threading.Thread(target=lambda: results.append(hasher.hash('a')))
+        thread.start()
+        assert started.wait(5)
+        with pytest.raises(HashingOverloaded):
+            hasher.hash('b')
+        release.set()
+        thread.join()
+
+        assert results == ['hash']
+        stats = hasher.stats()
+        assert stats['rejected'] == 1
+        assert stats['in_flight'] == 0
+        # La place est libérée une fois le calcul terminé
+        monkeypatch.setattr(hashing, 'generate_password_hash', generate_password_hash)
+        assert hasher.hash('c').startswith('pbkdf2:sha256:1000$')
+
+class TestLoginHashing:
+    """Tests pour l'utilisation du pool par /auth"""
+
+    def test_login_upgrades_old_hash(self, app, client):
+        """Test qu'une connexion réussie remplace un hash obsolète"""
+        app.extensions['password_hasher'] = PasswordHasher(FAST_METHOD, workers=1)
+        user = User(
+            username='legacy',
+            email='legacy@example.com',
+            password_hash=generate_password_hash('password123', 'pbkdf2:sha256:500')
+        )
+        db.session.add(user)
+        db.session.commit()
+
+        response = client.post('/auth/login', data={
+            'username': 'legacy',
+            'password': 'password123'
+        })
+
+        assert response.status_code == 302
+        db.session.refresh(user)
+        assert user.password_hash.startswith('pbkdf2:sha256:1000$')
+        assert check_password_hash(user.password_hash, 'password123')
+
+    def test_login_overloaded_returns_503(self, app, client, api_user, monkeypatch):
+        """Test la réponse 503 avec Retry-After quand le pool est saturé"""
+        def overloaded(*args):
+            raise HashingOverloaded()
+
+        monkeypatch.setattr(app.extensions['password_hasher'], 'check', overloaded)
+        response = client.post('/auth/login', data={
+            'username': 'apiuser',
+            'password': 'password123'
+        })
+
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == str(app.config['PASSWORD_HASH_RETRY_AFTER'])
+
+    def test_register_overloaded_returns_503(self, app, client, monkeypatch):
+        """Test qu'aucun compte n'est créé quand le hachage est refusé"""
+        def overloaded(*args):
+            raise HashingOverloaded()
+
+        monkeypatch.setattr(app.extensions['password_hasher'], 'hash', overloaded)
+        response = client.post('/auth/register', data={
+            'username': 'newuser',
+            'email': 'new@example.com',
+            'password': 'password123',
+            'confirm_password': 'password123'
+        })
+
+        assert response.status_code == 503
+        assert User.query.filter_by(username='newuser').first() is None
@@ -0,0 +1,112 @@
+import io
+import json
+import pytest
+from app.models import Task, TaskStatus, db
+
+NDJSON = '\n'.join([
+    json.dumps({'title': 'Un', 'priority': 3}),
+    json.dumps({'title': 'Deux', 'due_date': '2025-06-01T08:00:00Z', 'status': 'completed'}),
+    '',
+    json.dumps({'description': 'sans titre'}),
+    '{pas du json',
+    json.dumps({'title': 'Date', 'due_date': 'demain'}),
+])
+
+CSV = (
+    'title,description,priority,due_date\n'
+    'Alpha,"multi\nligne",2,\n'
+    ',vide,1,\n'
+    'Beta,,x,\n'
+    'Gamma,,5,2025-01-01\n'
+)
+
+class TestImport:
+    """Tests pour l'import en masse"""
+    
+    def test_ndjson_upload(self, auth_client, api_user):
+        """Test un import NDJSON avec lignes rejetées"""
+        response = auth_client.post('/api/tasks/import', data={
+            'file': (io.BytesIO(NDJSON.encode()), 'tasks.ndjson')
+        })
+        assert response.status_code == 200
+        
+        summary = response.get_json()
+        assert summary['accepted'] == 2
+        assert summary['rejected'] == 3
+        assert [(e['line'], e['error']) for e in summary['errors']] == [
+            (4, 'Le titre est requis'),
+            (5, 'JSON invalide'),
+            (6, 'Format de date invalide'),
+        ]
+        
+        tasks = {task.title: task for task in Task.query.filter_by(user_id=api_user.id)}
+        assert tasks['Un'].priority == 3
+        assert tasks['Deux'].status == TaskStatus.COMPLETED
+        assert tasks['Deux'].revision > 0
+    
+    def test_csv_raw_body_in_chunks(self, app, auth_client, api_user):
+        """Test un import CSV en corps brut, inséré par petits lots"""
+        app.config['TASKS_IMPORT_CHUNK_SIZE'] = 1
+        response = auth_client.post('/api/tasks/import', data=CSV.encode(), content_type='text/csv')
+        
+        summary = response.get_json()
+        assert summary['accepted'] == 2
+        assert [e['line'] for e in summary['errors']] == [4, 5]
+        
+        alpha = Task.query.filter_by(title='Alpha').one()
+        assert alpha.description == 'multi\nligne'
+        # Un commit (et une révision) par lot
+        assert api_user.task_revision == 2
+    
+    def test_invalid_encoding_keeps_previous_chunks(self, app, auth_client, api_user):
+        """Test qu'une ligne non UTF-8 arrête l'import après les lots déjà enregistrés"""
+        app.config['TASKS_IMPORT_CHUNK_SIZE'] = 2
+        lines = [json.dumps({'title': f'T{i}'}).encode() for i in range(1, 4)]
+        lines += [b'{"title": "Caf\xe9"}', json.dumps({'title': 'T5'}).encode()]
+        response = auth_client.post('/api/tasks/import?format=ndjson', data=b'\n'.join(lines))
+        assert response.status_code == 400
+        
+        summary = response.get_json()
+        assert summary['accepted'] == 3
+        assert summary['aborted']['line'] == 4
+        assert 'UTF-8' in summary['error']
+        # Les lignes valides avant la ligne fautive sont enregistrées, aucune après
+        titles = {task.title for task in Task.query.filter_by(user_id=api_user.id)}
+        assert titles == {'T1', 'T2', 'T3'}
+    
+    def test_oversized_csv_field_keeps_previous_chunks(self, app, auth_client, api_user):
+        """Test qu'un champ CSV trop long arrête l'import avec le résumé des lots enregistrés"""
+        app.config['TASKS_IMPORT_CHUNK_SIZE'] = 2
+        content = f'title,description\nT1,\nT2,\n,sans titre\nT3,\nLong,{"x" * 200_000}\nT4,\n'
+        response = auth_client.post('/api/tasks/import?format=csv', data=content.encode())
+        assert response.status_code == 400
+        
+        summary = response.get_json()
+        assert summary['accepted'] == 3
+        assert summary['rejected'] == 1
+        assert summary['aborted']['line'] == 6
+        assert 'CSV invalide' in summary['error']
+        titles = {task.title for task in Task.query.filter_by(user_id=api_user.id)}
+        assert titles == {'T1', 'T2', 'T3'}
+    
+    def test_export_roundtrip(self, auth_client, api_user):
+        """Test qu'un export NDJSON se réimporte tel quel"""
+        auth_client.post('/api/tasks', json={'title': 'Roundtrip', 'priority': 4})
+        exported = auth_client.get('/api/tasks/export?format=ndjson').data
+        
+        summary = auth_client.post('/api/tasks/import?format=ndjson', data=exported).get_json()
+        assert summary == {'accepted': 1, 'rejected': 0, 'errors': [], 'errors_truncated': False}
+        assert Task.query.filter_by(title='Roundtrip', priority=4).count() == 2
+    
+    def test_cli_import(self, runner, api_user, tmp_path):
+        """Test la commande flask tasks import"""
+        source = tmp_path / 'tasks.csv'
+        source.write_text(CSV, encoding='utf-8')
+        
+        result = runner.invoke(args=['tasks', 'import', str(source), '--user', 'apiuser'])
+        assert result.exit_code == 0
+        assert '2 tâche(s) importée(s), 2 rejetée(s)' in result.output
+        assert Task.query.filter_by(user_id=api_user.id).count() == 2
+        
+        result = runner.invoke(args=['tasks', 'import', str(source), '--user', 'inconnu'])
+        assert result.exit_code != 0
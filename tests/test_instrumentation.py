@@ -0,0 +1,93 @@
+import logging
+import pstats
+import pytest
+from app import create_app
+from app.models import db, User, Task
+from config import TestingConfig
+
+@pytest.fixture
+def instrumented(tmp_path):
+    """Application instrumentée avec un utilisateur connecté"""
+    class InstrumentedConfig(TestingConfig):
+        INSTRUMENTATION_ENABLED = True
+        SLOW_REQUEST_THRESHOLD_MS = 10000
+        PROFILE_DIR = str(tmp_path / 'profiles')
+
+    app = create_app(InstrumentedConfig)
+    with app.app_context():
+        db.create_all()
+        user = User(username='apiuser', email='api@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        db.session.add_all([Task(title=f'Tâche {i}', user_id=user.id) for i in range(5)])
+        db.session.commit()
+
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user.id)
+            session['_fresh'] = True
+        yield app, client
+        db.session.remove()
+        db.drop_all()
+
+def server_timing(response):
+    """Métriques de l'en-tête Server-Timing : {nom: (durée, paramètres)}"""
+    metrics = {}
+    for metric in response.headers['Server-Timing'].split(', '):
+        name, *params = metric.split(';')
+        duration = float(params[0].split('=')[1])
+        metrics[name] = (duration, params[1:])
+    return metrics
+
+class TestInstrumentation:
+    """Tests pour l'instrumentation des requêtes"""
+
+    def test_disabled_by_default(self, app, auth_client):
+        """Test l'absence d'en-tête sans INSTRUMENTATION_ENABLED"""
+        response = auth_client.get('/api/tasks')
+        assert response.status_code == 200
+        assert 'Server-Timing' not in response.headers
+        assert app.extensions['instrumentation'] is None
+
+    def test_server_timing_header(self, instrumented):
+        """Test les durées app, db et serialize d'une liste de tâches"""
+        app, client = instrumented
+        response = client.get('/api/tasks')
+
+        assert response.status_code == 200
+        metrics = server_timing(response)
+        assert {'app', 'db', 'serialize'} <= set(metrics)
+        queries = int(metrics['db'][1][0].split('"')[1].split()[0])
+        assert queries >= 2  # révision de l'utilisateur + tâches
+        assert metrics['db'][0] <= metrics['app'][0]
+
+        stats = app.extensions['instrumentation'].stats()
+        assert stats['main.get_tasks']['count'] == 1
+
+    def test_render_timing(self, instrumented):
+        """Test la section render pour une page Jinja"""
+        app, client = instrumented
+        response = client.get('/tasks')
+        assert 'render' in server_timing(response)
+
+    def test_slow_request_logs_queries(self, instrumented, caplog):
+        """Test le journal d'une requête au-delà du seuil avec ses requêtes SQL"""
+        app, client = instrumented
+        app.extensions['instrumentation'].slow_threshold = 0
+
+        with caplog.at_level(logging.WARNING, logger='app.instrumentation'):
+            client.get('/api/tasks')
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert any('Requête lente GET /api/tasks' in m and 'FROM tasks' in m for m in messages)
+
+    def test_sampled_profile_dump(self, instrumented, tmp_path):
+        """Test l'écriture d'un fichier .pstats pour une requête échantillonnée"""
+        app, client = instrumented
+        app.extensions['instrumentation'].profile_rate = 1.0
+
+        client.get('/api/tasks')
+
+        dumps = list((tmp_path / 'profiles').glob('main.get_tasks-*.pstats'))
+        assert len(dumps) == 1
+        assert pstats.Stats(str(dumps[0])).total_calls > 0
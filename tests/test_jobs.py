@@ -0,0 +1,213 @@
+from datetime import datetime, timedelta
+import pytest
+from app.jobs import JobRunner, HANDLERS, LeaseLost, enqueue, job_handler, renew_current_lease, schedule_periodic
+from app.models import db, Job, Task, TaskStatus, TaskReminder, TaskTombstone
+
+@pytest.fixture
+def runner(app):
+    app.config['JOBS_SCHEDULE'] = {}
+    return JobRunner(app, owner='test')
+
+@pytest.fixture
+def flaky():
+    """Tâche de fond qui échoue tant que `failures` n'est pas épuisé"""
+    calls = []
+
+    @job_handler('flaky')
+    def run(state):
+        calls.append(state)
+        if len(calls) <= run.failures:
+            raise RuntimeError('panne')
+        return {'runs': state.get('runs', 0) + 1}
+    run.failures = 0
+    run.calls = calls
+    yield run
+    del HANDLERS['flaky']
+
+def make_due(job_id):
+    """Rend une tâche due immédiatement (délai de nouvel essai écoulé)"""
+    db.session.query(Job).filter_by(id=job_id).update({'run_at': datetime.utcnow() - timedelta(seconds=1)})
+    db.session.commit()
+
+class TestJobRunner:
+    """Tests pour l'exécuteur des tâches de fond"""
+
+    def test_lease_prevents_double_claim(self, app, runner, flaky):
+        """Test qu'une tâche réservée n'est pas reprise avant l'expiration du bail"""
+        job_id = enqueue('flaky').id
+        db.session.commit()
+
+        claimed = runner.claim()
+        assert claimed.id == job_id and claimed.attempts == 1
+        other = JobRunner(app, owner='other')
+        assert other.claim() is None
+
+        # Bail expiré (processus arrêté) : la tâche est reprise, et l'ancien propriétaire la perd
+        reclaimed = other.claim(now=datetime.utcnow() + timedelta(seconds=runner.lease_seconds + 1))
+        assert reclaimed.id == job_id and reclaimed.attempts == 2
+        runner.execute(claimed)
+        assert db.session.get(Job, job_id).lease_owner == 'other'
+        other.execute(reclaimed)
+        assert db.session.get(Job, job_id) is None
+
+    def test_expired_lease_counts_as_attempt(self, app, runner, flaky):
+        """Test qu'une tâche dont le processus meurt à chaque tentative finit en échec"""
+        app.config['JOBS_MAX_ATTEMPTS'] = 2
+        job_id = enqueue('flaky').id
+        db.session.commit()
+        later = datetime.utcnow()
+
+        for attempt in (1, 2):
+            later += timedelta(seconds=runner.lease_seconds + 1)
+            assert runner.claim(now=later).attempts == attempt
+        # Dernier bail expiré : plus reprise, marquée en échec
+        later += timedelta(seconds=runner.lease_seconds + 1)
+        assert runner.claim(now=later) is None
+        db.session.expire_all()
+        job = db.session.get(Job, job_id)
+        assert job.status == 'failed' and 'LeaseLost' in job.last_error and job.lease_owner is None
+        assert flaky.calls == []
+
+    def test_renew_lease(self, app, runner):
+        """Test qu'un bail prolongé pendant l'exécution n'est pas repris"""
+        seen = []
+
+        @job_handler('long')
+        def run(state):
+            renew_current_lease()
+            seen.append(JobRunner(app, owner='other').claim())
+
+        try:
+            job_id = enqueue('long', run_at=datetime.utcnow() - timedelta(hours=1)).id
+            db.session.commit()
+            # Bail réservé dans le passé, déjà expiré sans renouvellement
+            job = runner.claim(now=datetime.utcnow() - timedelta(seconds=runner.lease_seconds + 1))
+            assert runner.execute(job)
+            assert seen == [None] and db.session.get(Job, job_id) is None
+
+            # Bail repris par un autre processus : le renouvellement échoue
+            enqueue('long')
+            db.session.commit()
+            job = runner.claim()
+            JobRunner(app, owner='other').claim(now=datetime.utcnow() + timedelta(seconds=runner.lease_seconds + 1))
+            with pytest.raises(LeaseLost):
+                runner.renew_lease(job)
+        finally:
+            del HANDLERS['long']
+
+    def test_retry_then_failed(self, app, runner, flaky):
+        """Test les nouveaux essais espacés puis l'échec définitif"""
+        app.config['JOBS_MAX_ATTEMPTS'] = 2
+        flaky.failures = 5
+        job_id = enqueue('flaky').id
+        db.session.commit()
+
+        assert runner.run_pending() == 1
+        job = db.session.get(Job, job_id)
+        assert job.status == 'pending' and 'panne' in job.last_error
+        assert job.run_at > datetime.utcnow() + timedelta(seconds=runner.retry_backoff - 5)
+        assert runner.run_pending() == 0
+
+        make_due(job_id)
+        assert runner.run_pending() == 1
+        db.session.expire_all()
+        assert db.session.get(Job, job_id).status == 'failed'
+        assert runner.stats() == {'succeeded': 0, 'failed': 2}
+
+    def test_periodic_job_keeps_state(self, app, runner, flaky):
+        """Test la replanification et l'état conservé d'une tâche périodique"""
+        app.config['JOBS_SCHEDULE'] = {'flaky': 60}
+        assert runner.run_pending() == 1
+        assert runner.run_pending() == 0
+
+        job = Job.query.filter_by(key='flaky').one()
+        assert job.payload == '{"runs": 1}' and job.status == 'pending'
+        assert job.run_at > datetime.utcnow() + timedelta(seconds=55)
+
+        # Nouvel appel (autre processus) : intervalle mis à jour, état conservé
+        schedule_periodic({'flaky': 120})
+        make_due(job.id)
+        runner.run_pending()
+        db.session.expire_all()
+        assert Job.query.filter_by(key='flaky').one().payload == '{"runs": 2}'
+
+        schedule_periodic({'flaky': None})
+        assert Job.query.count() == 0
+
+    def test_worker_command(self, app, runner, flaky):
+        """Test `flask jobs enqueue` puis `flask jobs worker --once`"""
+        cli = app.test_cli_runner()
+        result = cli.invoke(args=['jobs', 'enqueue', 'flaky'])
+        assert result.exit_code == 0, result.output
+        result = cli.invoke(args=['jobs', 'worker', '--once'])
+        assert result.exit_code == 0, result.output
+        assert len(flaky.calls) == 1 and Job.query.count() == 0
+
+class TestMaintenanceJobs:
+    """Tests pour les rappels d'échéance et la maintenance"""
+
+    def test_due_reminders(self, app, runner, auth_client, api_user):
+        """Test les rappels par lots, sans doublon, visibles dans l'API"""
+        app.config['JOBS_BATCH_SIZE'] = 2
+        now = datetime.utcnow()
+        # Premier passage : aucun retard antérieur n'est rappelé
+        state = HANDLERS['due_reminders']({})
+        assert state == {'overdue_since': state['overdue_since']}
+
+        def add(title, due, status=TaskStatus.PENDING):
+            task = Task(title=title, due_date=due, status=status, user_id=api_user.id)
+            db.session.add(task)
+            db.session.commit()
+            return task
+
+        soon = [add(f'Soon {i}', now + timedelta(hours=i + 1)) for i in range(3)]
+        add('Done', now + timedelta(hours=2), TaskStatus.COMPLETED)
+        add('Later', now + timedelta(days=3))
+        late = add('Late', now + timedelta(seconds=1))
+
+        state = HANDLERS['due_reminders'](state)
+        kinds = {(r.task_id, r.kind) for r in TaskReminder.query}
+        assert kinds == {(task.id, 'due_soon') for task in soon + [late]}
+
+        # Retards : seule la plage écoulée depuis le passage précédent est lue ;
+        # l'échéance déplacée remplace le rappel précédent dans l'API
+        db.session.query(Task).filter_by(id=late.id).update({'due_date': now - timedelta(seconds=1)})
+        db.session.commit()
+        late_state = {'overdue_since': (now - timedelta(minutes=1)).isoformat()}
+        HANDLERS['due_reminders'](late_state)
+        HANDLERS['due_reminders'](late_state)
+        assert TaskReminder.query.filter_by(kind='overdue').count() == 1
+
+        reminders = auth_client.get('/api/tasks/reminders').get_json()['reminders']
+        assert {r['title'] for r in reminders} == {'Soon 0', 'Soon 1', 'Soon 2', 'Late'}
+        assert [r['kind'] for r in reminders if r['title'] == 'Late'] == ['overdue']
+
+    def test_purge_tombstones_forces_resync(self, app, runner, auth_client, api_user):
+        """Test la purge des pierres tombales et le rechargement des jetons trop anciens"""
+        task_ids = [auth_client.post('/api/tasks', json={'title': f'T{i}'}).get_json()['id'] for i in range(3)]
+        old_token = auth_client.get('/api/tasks?limit=1').get_json()['sync_token']
+        for task_id in task_ids[:2]:
+            auth_client.delete(f'/api/tasks/{task_id}')
+        recent_token = auth_client.get('/api/tasks?limit=1').get_json()['sync_token']
+        auth_client.delete(f'/api/tasks/{task_ids[2]}')
+
+        # Les deux premières suppressions dépassent la rétention
+        old = datetime.utcnow() - timedelta(days=app.config['TOMBSTONE_RETENTION_DAYS'] + 1)
+        db.session.query(TaskTombstone).filter(TaskTombstone.task_id.in_(task_ids[:2])).update(
+            {'deleted_at': old}, synchronize_session=False)
+        db.session.commit()
+        app.config['JOBS_BATCH_SIZE'] = 1
+        HANDLERS['purge_tombstones']({})
+        assert [t.task_id for t in TaskTombstone.query] == [task_ids[2]]
+
+        assert auth_client.get(f'/api/tasks/changes?since={old_token}').get_json()['resync'] is True
+        changes = auth_client.get(f'/api/tasks/changes?since={recent_token}').get_json()
+        assert changes['deleted'] == [task_ids[2]]
+
+    def test_analyze_and_vacuum(self, app, runner):
+        """Test ANALYZE et VACUUM planifiés comme tâches ponctuelles"""
+        enqueue('analyze')
+        enqueue('vacuum')
+        db.session.commit()
+        assert runner.run_pending() == 2
+        assert runner.stats() == {'succeeded': 2, 'failed': 0}
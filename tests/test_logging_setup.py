@@ -0,0 +1,97 @@
+import json
+import logging
+import os
+import queue
+import pytest
+from app.logging_setup import (configure_logging, shutdown_logging, dropped_log_records,
+                               DroppingQueueHandler)
+
+@pytest.fixture
+def log_config(app, tmp_path):
+    """Configuration de journalisation vers un fichier temporaire, retirée après le test"""
+    root = logging.getLogger()
+    level = root.level
+    config = dict(app.config, LOG_FILE=str(tmp_path / 'app.log'))
+    yield config
+    shutdown_logging()
+    root.setLevel(level)
+
+def read_entries(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class TestLoggingSetup:
+    """Tests pour la journalisation asynchrone"""
+
+    def test_json_lines_with_request_id(self, app, client, log_config):
+        """Test qu'un journal émis pendant une requête porte son identifiant"""
+        configure_logging(log_config)
+
+        @app.route('/_log')
+        def emit_log():
+            logging.getLogger('app.test').warning('tâche %s', 42)
+            return 'ok'
+
+        response = client.get('/_log', headers={'X-Request-ID': 'req-123'})
+        assert response.headers['X-Request-ID'] == 'req-123'
+        shutdown_logging()  # vide la file avant lecture
+
+        entries = [e for e in read_entries(log_config['LOG_FILE']) if e['logger'] == 'app.test']
+        assert entries == [{
+            'timestamp': entries[0]['timestamp'],
+            'level': 'WARNING',
+            'logger': 'app.test',
+            'message': 'tâche 42',
+            'request_id': 'req-123',
+            'thread': entries[0]['thread']
+        }]
+
+    def test_generated_request_id(self, client):
+        """Test la génération d'un identifiant lorsqu'aucun n'est fourni"""
+        first = client.get('/health').headers['X-Request-ID']
+        second = client.get('/health').headers['X-Request-ID']
+        assert len(first) == 32 and first != second
+
+    def test_overflow_drops_records(self):
+        """Test que la file pleine abandonne les enregistrements sans bloquer"""
+        handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+        logger = logging.getLogger('app.test.overflow')
+        logger.propagate = False
+        logger.addHandler(handler)
+        try:
+            for i in range(3):
+                logger.error('message %d', i)
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+
+        assert handler.dropped == 2
+        assert handler.queue.get_nowait().getMessage() == 'message 0'
+
+    def test_size_rotation(self, log_config):
+        """Test la rotation du fichier par taille"""
+        log_config.update(LOG_MAX_BYTES=500, LOG_BACKUP_COUNT=2)
+        configure_logging(log_config)
+        for i in range(50):
+            logging.getLogger('app.test').warning('ligne %d', i)
+        shutdown_logging()
+
+        path = log_config['LOG_FILE']
+        assert os.path.exists(path + '.1')
+        assert not os.path.exists(path + '.3')
+        assert dropped_log_records() == 0
+
+    def test_startup_messages_logged(self, log_config, tmp_path):
+        """Test que la journalisation de run.py précède create_app (durée de démarrage)"""
+        from app import create_app
+        from config import TestingConfig
+        from run import logging_config
+
+        config = logging_config(type('LogConfig', (TestingConfig,), {'LOG_FILE': log_config['LOG_FILE']}), slot=2)
+        assert config['LOG_FILE'] == str(tmp_path / 'app.2.log')
+        configure_logging(config)
+        create_app(TestingConfig)
+        shutdown_logging()
+
+        messages = [e['message'] for e in read_entries(config['LOG_FILE'])]
+        assert any(message.startswith('Application prête') for message in messages)
@@ -0,0 +1,86 @@
+import threading
+import pytest
+from app.metrics import Histogram, DatabaseProbe
+from app.models import db
+
+def metric_lines(response, name):
+    return [line for line in response.get_data(as_text=True).splitlines() if line.startswith(name)]
+
+class TestMetrics:
+    """Tests pour /metrics et /health"""
+
+    def test_histogram_exposition(self):
+        """Test les compteurs cumulés, la somme et le total d'un histogramme"""
+        histogram = Histogram('latency_seconds', 'Latence', ('endpoint',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value, 'main.index')
+
+        samples = {(name, labels): value for name, labels, value in histogram.samples()}
+        assert samples[('latency_seconds_bucket', ('main.index', '0.1'))] == 1
+        assert samples[('latency_seconds_bucket', ('main.index', '1.0'))] == 3
+        assert samples[('latency_seconds_bucket', ('main.index', '+Inf'))] == 4
+        assert samples[('latency_seconds_count', ('main.index',))] == 4
+        assert samples[('latency_seconds_sum', ('main.index',))] == pytest.approx(4.25)
+
+    def test_request_metrics(self, auth_client):
+        """Test les compteurs et histogrammes par endpoint"""
+        auth_client.get('/api/tasks')
+        auth_client.get('/api/tasks')
+        response = auth_client.get('/metrics')
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        assert 'http_requests_total{endpoint="main.get_tasks",method="GET",status="200"} 2' in metric_lines(response, 'http_requests_total')
+        assert 'http_request_duration_seconds_count{endpoint="main.get_tasks"} 2' in metric_lines(response, 'http_request_duration_seconds_count')
+        assert any(line.startswith('http_request_duration_seconds_bucket{endpoint="main.get_tasks",le="+Inf"} 2')
+                   for line in metric_lines(response, 'http_request_duration_seconds_bucket'))
+        # La requête /metrics elle-même est en cours pendant la collecte
+        assert metric_lines(response, 'http_requests_in_flight ') == ['http_requests_in_flight 1']
+        count = metric_lines(response, 'db_query_duration_seconds_count')
+        assert count and int(count[0].split()[-1]) >= 4
+
+    def test_metrics_disabled(self, app, client):
+        """Test le 404 quand les métriques sont désactivées"""
+        app.extensions['metrics'] = None
+        assert client.get('/metrics').status_code == 404
+
+    def test_health_runs_query(self, app, client):
+        """Test que /health interroge réellement la base, détails sur /health/details"""
+        response = client.get('/health')
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data['database'] == 'connected'
+        assert set(data) == {'status', 'timestamp', 'database'}
+
+        assert client.get('/health/details').status_code == 404
+        app.config['HEALTH_DETAILS_ENABLED'] = True
+        data = client.get('/health/details').get_json()
+        assert data['database_latency_ms'] >= 0
+        assert data['database_error'] is None
+
+    def test_health_deadline(self, app, client, monkeypatch):
+        """Test le 503 lorsque la base ne répond pas avant l'échéance"""
+        release = threading.Event()
+        probe = DatabaseProbe(db.engine, timeout=0.05)
+        monkeypatch.setattr(probe, '_select_one', lambda: release.wait(5))
+        app.extensions['database_probe'] = probe
+
+        response = client.get('/health')
+        release.set()
+
+        assert response.status_code == 503
+        data = response.get_json()
+        assert data['status'] == 'unhealthy'
+        assert data['database'] == 'disconnected'
+
+    def test_health_hides_database_error(self, app, client, monkeypatch, caplog):
+        """Test que l'erreur de la base est journalisée mais pas renvoyée par /health"""
+        def fail():
+            raise RuntimeError('unable to open database file C:\\apps\\instance\\tasks.db')
+        monkeypatch.setattr(app.extensions['database_probe'], '_select_one', fail)
+
+        response = client.get('/health')
+        assert response.status_code == 503
+        assert response.get_json()['error'] == 'Base de données indisponible'
+        assert b'tasks.db' not in response.data
+        assert 'tasks.db' in caplog.text
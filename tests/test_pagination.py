@@ -0,0 +1,113 @@
+import pytest
+from datetime import datetime, timedelta
+from app.models import Task, TaskStatus, db
+from app.pagination import encode_cursor, decode_cursor, InvalidCursor
+
+def make_tasks(user, count, **kwargs):
+    """Crée `count` tâches avec des dates de création distinctes"""
+    base = datetime(2024, 1, 1)
+    tasks = [
+        Task(
+            title=f'Task {i}',
+            priority=kwargs.get('priority', (i % 5) + 1),
+            status=kwargs.get('status', TaskStatus.PENDING),
+            created_at=base + timedelta(minutes=i),
+            user_id=user.id
+        )
+        for i in range(count)
+    ]
+    db.session.add_all(tasks)
+    db.session.commit()
+    return tasks
+
+class TestCursorPagination:
+    """Tests pour la pagination par curseur de /api/tasks"""
+    
+    def test_cursor_roundtrip(self, app):
+        """Test encodage/décodage d'un curseur"""
+        task = Task(id=42, priority=3, created_at=datetime(2024, 5, 1, 12, 30, 15, 123))
+        assert decode_cursor(encode_cursor(task)) == (3, datetime(2024, 5, 1, 12, 30, 15, 123), 42)
+    
+    def test_invalid_cursor(self, auth_client):
+        """Test qu'un curseur corrompu renvoie une erreur 400"""
+        with pytest.raises(InvalidCursor):
+            decode_cursor('pas-un-curseur')
+        
+        response = auth_client.get('/api/tasks?cursor=pas-un-curseur')
+        assert response.status_code == 400
+    
+    def test_pages_cover_all_tasks_in_order(self, auth_client, api_user):
+        """Test que le parcours des pages renvoie toutes les tâches dans l'ordre"""
+        make_tasks(api_user, 23)
+        expected = [task['id'] for task in auth_client.get('/api/tasks').get_json()]
+        
+        seen = []
+        cursor = None
+        while True:
+            url = '/api/tasks?limit=5' + (f'&cursor={cursor}' if cursor else '')
+            page = auth_client.get(url).get_json()
+            assert len(page['tasks']) <= 5
+            seen.extend(task['id'] for task in page['tasks'])
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        
+        assert seen == expected
+        assert len(seen) == 23
+    
+    def test_last_page_has_no_cursor(self, auth_client, api_user):
+        """Test qu'une page exactement remplie n'annonce pas de suite"""
+        make_tasks(api_user, 4)
+        page = auth_client.get('/api/tasks?limit=4').get_json()
+        assert len(page['tasks']) == 4
+        assert page['next_cursor'] is None
+    
+    def test_ties_are_broken_by_id(self, auth_client, api_user):
+        """Test qu'aucune tâche n'est perdue quand priorité et date sont identiques"""
+        created_at = datetime(2024, 1, 1)
+        db.session.add_all([
+            Task(title=f'Same {i}', priority=2, created_at=created_at, user_id=api_user.id)
+            for i in range(6)
+        ])
+        db.session.commit()
+        
+        first = auth_client.get('/api/tasks?limit=4').get_json()
+        second = auth_client.get(f"/api/tasks?limit=4&cursor={first['next_cursor']}").get_json()
+        ids = [t['id'] for t in first['tasks'] + second['tasks']]
+        assert len(set(ids)) == 6
+        assert ids == sorted(ids, reverse=True)
+    
+    def test_status_filter_and_limit_bounds(self, auth_client, api_user):
+        """Test le filtre de statut combiné à la pagination et les bornes de limit"""
+        make_tasks(api_user, 3)
+        make_tasks(api_user, 2, status=TaskStatus.COMPLETED)
+        
+        page = auth_client.get('/api/tasks?status=completed&limit=10').get_json()
+        assert [t['status'] for t in page['tasks']] == ['completed', 'completed']
+        
+        assert auth_client.get('/api/tasks?limit=0').status_code == 400
+        
+        app_max = auth_client.application.config['TASKS_MAX_PAGE_SIZE']
+        page = auth_client.get(f'/api/tasks?limit={app_max * 10}').get_json()
+        assert len(page['tasks']) == 5
+    
+    def test_non_integer_priority_rejected(self, auth_client, api_user):
+        """Test qu'une priorité non entière est refusée : tous les curseurs restent décodables"""
+        for priority in ('high', '3', 2.5, True, None):
+            response = auth_client.post('/api/tasks', json={'title': 'X', 'priority': priority})
+            assert response.status_code == 400
+        task_id = auth_client.post('/api/tasks', json={'title': 'Y', 'priority': 2}).get_json()['id']
+        assert auth_client.patch(f'/api/tasks/{task_id}', json={'priority': 'high'}).status_code == 400
+        make_tasks(api_user, 4)
+        
+        seen, cursor = [], None
+        while True:
+            url = '/api/tasks?limit=2' + (f'&cursor={cursor}' if cursor else '')
+            response = auth_client.get(url)
+            assert response.status_code == 200
+            page = response.get_json()
+            seen.extend(task['id'] for task in page['tasks'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert len(seen) == 5
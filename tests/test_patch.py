@@ -0,0 +1,93 @@
+from sqlalchemy import event
+from app.models import User, Task, db
+from app.stats import compare_stats
+
+def patch_statements(client, url, **kwargs):
+    """Exécute un PATCH et renvoie les requêtes SQL émises"""
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        response = client.patch(url, **kwargs)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return response, statements
+
+class TestPatchTask:
+    """Tests pour PATCH /api/tasks/<id>"""
+
+    def test_partial_update_in_one_statement(self, auth_client, api_user):
+        """Test la mise à jour sans lecture préalable de la tâche"""
+        task = auth_client.post('/api/tasks', json={'title': 'Toggle', 'priority': 3}).get_json()
+        token = auth_client.get('/api/tasks?limit=10').get_json()['sync_token']
+
+        response, statements = patch_statements(auth_client, f"/api/tasks/{task['id']}",
+                                                json={'status': 'completed'})
+        assert response.status_code == 200
+        assert response.get_json() == dict(task, status='completed')
+
+        task_statements = [s for s in statements if 'tasks' in s.split('RETURNING')[0]]
+        assert len(task_statements) == 1
+        assert task_statements[0].startswith('UPDATE tasks')
+
+        # Révision, synchronisation, ETag et compteurs restent cohérents
+        changes = auth_client.get(f'/api/tasks/changes?since={token}')
+        assert [t['status'] for t in changes.get_json()['changed']] == ['completed']
+        assert response.headers['ETag'] == changes.headers['ETag']
+        assert compare_stats() == {}
+        db.session.expire_all()
+        assert db.session.get(Task, task['id']).updated_at is not None
+
+    def test_if_match(self, auth_client, api_user):
+        """Test la concurrence optimiste via If-Match"""
+        task_id = auth_client.post('/api/tasks', json={'title': 'Shared'}).get_json()['id']
+        seen = auth_client.get('/api/tasks').headers['ETag']
+
+        first = auth_client.patch(f'/api/tasks/{task_id}', json={'title': 'Mine'},
+                                  headers={'If-Match': seen})
+        assert first.status_code == 200
+
+        # Écriture concurrente depuis la même lecture : refusée, rien n'est écrit
+        stale = auth_client.patch(f'/api/tasks/{task_id}', json={'title': 'Theirs'},
+                                  headers={'If-Match': seen})
+        assert stale.status_code == 412
+        assert auth_client.get(f'/api/tasks/{task_id}').get_json()['title'] == 'Mine'
+
+        # L'ETag de la réponse, même faible (compression), vaut pour la suite
+        again = auth_client.patch(f'/api/tasks/{task_id}', json={'priority': 4},
+                                  headers={'If-Match': 'W/' + first.headers['ETag']})
+        assert again.status_code == 200
+
+        # Une autre tâche modifiée depuis la lecture n'empêche rien
+        auth_client.post('/api/tasks', json={'title': 'Other'})
+        assert auth_client.patch(f'/api/tasks/{task_id}', json={'priority': 5},
+                                 headers={'If-Match': again.headers['ETag']}).status_code == 200
+
+        assert auth_client.patch(f'/api/tasks/{task_id}', json={'priority': 1},
+                                 headers={'If-Match': '*'}).status_code == 200
+        for invalid in ('"nope"', f'"u{api_user.id + 1}-r999"'):
+            response = auth_client.patch(f'/api/tasks/{task_id}', json={'priority': 2},
+                                         headers={'If-Match': invalid})
+            assert response.status_code == 412
+
+    def test_errors(self, auth_client, api_user):
+        """Test les tâches absentes ou d'un autre utilisateur et les données invalides"""
+        other = User(username='other', email='other@example.com', password_hash='x')
+        db.session.add(other)
+        db.session.commit()
+        theirs = Task(title='Not yours', user_id=other.id)
+        db.session.add(theirs)
+        db.session.commit()
+        revision = auth_client.get('/api/tasks?limit=1').get_json()['sync_token']
+
+        assert auth_client.patch(f'/api/tasks/{theirs.id}', json={'title': 'Stolen'}).status_code == 404
+        assert auth_client.patch('/api/tasks/9999', json={'title': 'Ghost'},
+                                 headers={'If-Match': f'"u{api_user.id}-r{revision}"'}).status_code == 404
+        db.session.expire_all()
+        assert db.session.get(Task, theirs.id).title == 'Not yours'
+        # Les échecs n'incrémentent pas la révision
+        assert auth_client.get('/api/tasks?limit=1').get_json()['sync_token'] == revision
+
+        task_id = auth_client.post('/api/tasks', json={'title': 'Mine'}).get_json()['id']
+        for payload in ({}, {'title': ''}, {'status': 'done'}, None):
+            assert auth_client.patch(f'/api/tasks/{task_id}', json=payload).status_code == 400
@@ -0,0 +1,116 @@
+import logging
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool, SingletonThreadPool, StaticPool
+from app import create_app, db
+from app.pool import engine_options, check_pool_capacity
+from config import TestingConfig
+
+def make_app(tmp_path, **overrides):
+    """Application sur un fichier SQLite temporaire"""
+    config = type('PoolConfig', (TestingConfig,), dict(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'pool.db'}", **overrides))
+    return create_app(config)
+
+def settings(uri='sqlite:////tmp/tasks.db', **overrides):
+    config = {name: getattr(TestingConfig, name) for name in dir(TestingConfig) if name.isupper()}
+    config.update(SQLALCHEMY_DATABASE_URI=uri, **overrides)
+    return config
+
+def options(uri, **overrides):
+    return engine_options(settings(uri, **overrides))
+
+class TestPoolProfiles:
+    """Tests pour les profils du pool de connexions"""
+
+    def test_engine_options(self):
+        """Test les options produites par chaque profil"""
+        queue = options('sqlite:////tmp/tasks.db', DB_POOL_SIZE=3, DB_POOL_MAX_OVERFLOW=2)
+        assert queue['poolclass'] is QueuePool
+        assert (queue['pool_size'], queue['max_overflow'], queue['pool_pre_ping']) == (3, 2, False)
+
+        thread = options('sqlite:////tmp/tasks.db', DB_POOL_PROFILE='thread')
+        assert thread['poolclass'] is SingletonThreadPool
+        assert thread['connect_args'] == {'check_same_thread': False}
+
+        static = options('sqlite:////tmp/tasks.db', DB_POOL_PROFILE='static')
+        assert static['poolclass'] is StaticPool and 'pool_size' not in static
+
+        # Base serveur : pre-ping par défaut ; base en mémoire : laissée à Flask-SQLAlchemy
+        assert options('postgresql://db/tasks')['pool_pre_ping'] is True
+        assert options('sqlite:///:memory:') == {}
+        with pytest.raises(ValueError):
+            options('sqlite:////tmp/tasks.db', DB_POOL_PROFILE='huge')
+
+    def test_profile_applied_to_engine(self, tmp_path):
+        """Test le pool du moteur et la priorité de SQLALCHEMY_ENGINE_OPTIONS"""
+        app = make_app(tmp_path, DB_POOL_PROFILE='thread')
+        with app.app_context():
+            assert isinstance(db.engine.pool, SingletonThreadPool)
+            db.engine.dispose()
+
+        app = make_app(tmp_path, DB_POOL_SIZE=2, SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 7})
+        with app.app_context():
+            assert isinstance(db.engine.pool, QueuePool)
+            assert db.engine.pool.size() == 7
+            db.engine.dispose()
+
+    def test_capacity_check(self, caplog):
+        """Test l'avertissement quand les threads dépassent le pool"""
+        config = settings(DB_POOL_SIZE=5, DB_POOL_MAX_OVERFLOW=5)
+        with caplog.at_level(logging.WARNING, logger='app.pool'):
+            assert check_pool_capacity(config, 10)
+            assert not caplog.records
+            assert not check_pool_capacity(config, 18)
+        assert '18 threads pour 10 connexions' in caplog.text
+        assert check_pool_capacity(dict(config, DB_POOL_PROFILE='thread'), 100)
+
+class TestPoolStats:
+    """Tests pour la mesure des emprunts de connexions"""
+
+    def test_exhaustion_counted_and_logged(self, tmp_path, caplog):
+        """Test les compteurs, l'histogramme et l'avertissement quand le pool est épuisé"""
+        app = make_app(tmp_path, DB_POOL_SIZE=1, DB_POOL_MAX_OVERFLOW=0, DB_POOL_TIMEOUT=0.05)
+        stats = app.extensions['db_pool']
+        with app.app_context():
+            held = db.engine.connect()
+            with caplog.at_level(logging.WARNING, logger='app.pool'):
+                with pytest.raises(exc.TimeoutError):
+                    db.engine.connect()
+            held.close()
+            with db.engine.connect():
+                pass
+
+            assert stats.stats() == {'checkouts': 2, 'slow': 0, 'exhausted': 1}
+            assert 'Pool de connexions épuisé' in caplog.text
+
+            metrics = app.extensions['metrics'].render()
+            assert 'db_pool_exhausted_total 1' in metrics
+            assert 'db_pool_checkouts_total 2' in metrics
+            assert 'db_pool_checkout_wait_seconds_count 3' in metrics
+
+            # Les compteurs survivent au remplacement du pool
+            db.engine.dispose()
+            with db.engine.connect():
+                pass
+            assert stats.stats()['checkouts'] == 3
+            db.engine.dispose()
+
+    def test_slow_checkout_warning_rate_limited(self, tmp_path, caplog):
+        """Test un seul avertissement par intervalle pour les emprunts lents"""
+        app = make_app(tmp_path, DB_POOL_WAIT_WARNING_MS=0)
+        stats = app.extensions['db_pool']
+        with app.app_context():
+            with caplog.at_level(logging.WARNING, logger='app.pool'):
+                for _ in range(3):
+                    with db.engine.connect():
+                        pass
+            db.engine.dispose()
+        assert stats.stats()['slow'] == 3
+        assert len(caplog.records) == 1
+
+    def test_health_reports_pool(self, app, client):
+        """Test la section db_pool de /health/details"""
+        app.config['HEALTH_DETAILS_ENABLED'] = True
+        data = client.get('/health/details').get_json()
+        assert set(data['db_pool']) == {'checkouts', 'slow', 'exhausted', 'status'}
@@ -0,0 +1,106 @@
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import time
+import pytest
+from benchmarks.loadtest import generate_database, free_port, wait_until_ready
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason='mode multi-processus réservé à Linux')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Maître minimal : chaque worker note "slot pid" puis attend SIGTERM
+SUPERVISOR_SCRIPT = textwrap.dedent('''
+    import os, signal, sys
+    from app.prefork import Supervisor
+
+    def run_worker(slot):
+        with open(sys.argv[1], 'a') as f:
+            f.write(f'{slot} {os.getpid()}\\n')
+        signal.pause()
+
+    Supervisor(run_worker, workers=2, graceful_timeout=2, min_uptime=0).run()
+''')
+
+def wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(0.05)
+    raise AssertionError('délai dépassé')
+
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+def started(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [tuple(map(int, line.split())) for line in f if line.strip()]
+
+class TestSupervisor:
+    """Tests pour le maître du mode multi-processus"""
+
+    def test_restart_reload_and_stop(self, tmp_path):
+        """Test la relance d'un worker tué, le rechargement (SIGHUP) et l'arrêt (SIGTERM)"""
+        log = str(tmp_path / 'workers.log')
+        master = subprocess.Popen([sys.executable, '-c', SUPERVISOR_SCRIPT, log], cwd=ROOT)
+        try:
+            first = wait_for(lambda: len(started(log)) >= 2 and started(log))
+            assert sorted(slot for slot, _ in first) == [0, 1]
+
+            # Un worker tué est remplacé dans le même emplacement
+            slot, pid = first[0]
+            os.kill(pid, signal.SIGKILL)
+            replacement = wait_for(lambda: len(started(log)) >= 3 and started(log)[2])
+            assert replacement[0] == slot and replacement[1] != pid
+
+            # SIGHUP : deux nouveaux workers, les anciens s'arrêtent
+            before = [pid for _, pid in started(log)[1:3]]
+            master.send_signal(signal.SIGHUP)
+            wait_for(lambda: len(started(log)) >= 5)
+            wait_for(lambda: not any(alive(pid) for pid in before))
+
+            current = [pid for _, pid in started(log)[3:5]]
+            assert all(alive(pid) for pid in current)
+            master.send_signal(signal.SIGTERM)
+            assert master.wait(timeout=10) == 0
+            assert not any(alive(pid) for pid in current)
+        finally:
+            if master.poll() is None:
+                master.kill()
+                master.wait()
+
+    def test_run_py_serves_with_workers(self, tmp_path):
+        """Test run.py en production avec deux workers Waitress"""
+        database = generate_database(str(tmp_path), 1, 1)
+        port = free_port()
+        env = dict(os.environ, FLASK_ENV='production', PORT=str(port), WEB_WORKERS='2',
+                   DATABASE_URL=f'sqlite:///{database}', SCHEMA_ON_STARTUP='skip',
+                   LOG_FILE=str(tmp_path / 'app.log'))
+        master = subprocess.Popen([sys.executable, 'run.py'], cwd=ROOT, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_ready('127.0.0.1', port)
+            master.send_signal(signal.SIGHUP)
+            for _ in range(20):
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+                conn.request('GET', '/health')
+                assert conn.getresponse().status == 200
+                conn.close()
+            master.send_signal(signal.SIGTERM)
+            assert master.wait(timeout=15) == 0
+            assert (tmp_path / 'app.0.log').exists() and (tmp_path / 'app.1.log').exists()
+        finally:
+            if master.poll() is None:
+                master.kill()
+                master.wait()
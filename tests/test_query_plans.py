@@ -0,0 +1,133 @@
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from app.archive import archive_completed
+from app.jobs import HANDLERS
+from app.models import Task, TaskStatus, User, db
+
+TASK_TABLES = ('tasks', 'task_tombstones', 'task_stats')
+
+@contextmanager
+def captured_task_statements():
+    """Capture les requêtes SQL émises sur tasks et ses tables annexes"""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if any(table in statement for table in TASK_TABLES) and not statement.lstrip().upper().startswith(('INSERT', 'EXPLAIN')):
+            statements.append((statement, parameters))
+    
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+def query_plan(statement, parameters):
+    """Exécute EXPLAIN QUERY PLAN et renvoie les lignes 'detail'"""
+    connection = db.session.connection().connection
+    rows = connection.execute(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+    return [row[3] for row in rows]
+
+def assert_indexed(statements):
+    """Échoue si une requête parcourt toute la table ou trie via un B-tree temporaire"""
+    assert statements, 'aucune requête capturée'
+    for statement, parameters in statements:
+        plan = query_plan(statement, parameters)
+        for detail in plan:
+            assert not detail.startswith(tuple(f'SCAN {table}' for table in TASK_TABLES)), \
+                f'scan complet: {statement}\n{plan}'
+            assert 'TEMP B-TREE' not in detail, f'tri temporaire: {statement}\n{plan}'
+
+@pytest.fixture
+def seeded_tasks(api_user):
+    """Jeu de tâches réparti sur plusieurs utilisateurs, statistiques à jour"""
+    base = datetime(2024, 1, 1)
+    statuses = list(TaskStatus)
+    tasks = [
+        Task(
+            title=f'Task {i}',
+            priority=(i % 5) + 1,
+            status=statuses[i % 3],
+            created_at=base + timedelta(minutes=i),
+            user_id=api_user.id if i % 2 else api_user.id + 1 + i % 10
+        )
+        for i in range(200)
+    ]
+    db.session.add_all(tasks)
+    db.session.commit()
+    db.session.execute(db.text('ANALYZE'))
+    return [task for task in tasks if task.user_id == api_user.id]
+
+class TestQueryPlans:
+    """Vérifie que les accès de l'API tâches restent indexés"""
+    
+    def test_list_queries_use_index(self, auth_client, seeded_tasks):
+        """Test liste complète, filtrée et paginée"""
+        with captured_task_statements() as statements:
+            auth_client.get('/api/tasks')
+            auth_client.get('/api/tasks?status=completed')
+            page = auth_client.get('/api/tasks?limit=10').get_json()
+            auth_client.get(f"/api/tasks?limit=10&cursor={page['next_cursor']}")
+            auth_client.get(f"/api/tasks?status=pending&limit=10&cursor={page['next_cursor']}")
+        
+        assert len(statements) == 5
+        assert_indexed(statements)
+    
+    def test_stats_queries_use_index(self, auth_client, seeded_tasks):
+        """Test les statistiques (compteurs et tâches en retard)"""
+        with captured_task_statements() as statements:
+            auth_client.get('/api/tasks/stats')
+        
+        assert len(statements) == 2
+        assert_indexed(statements)
+    
+    def test_changes_query_uses_index(self, auth_client, seeded_tasks):
+        """Test la synchronisation différentielle"""
+        auth_client.delete(f'/api/tasks/{seeded_tasks[0].id}')
+        auth_client.put(f'/api/tasks/{seeded_tasks[1].id}', json={'title': 'Changed'})
+        with captured_task_statements() as statements:
+            auth_client.get('/api/tasks/changes?since=0')
+        
+        assert len(statements) == 2
+        assert_indexed(statements)
+    
+    def test_update_and_delete_use_primary_key(self, auth_client, seeded_tasks):
+        """Test mise à jour et suppression"""
+        task_id = seeded_tasks[0].id
+        with captured_task_statements() as statements:
+            auth_client.put(f'/api/tasks/{task_id}', json={'status': 'completed'})
+            auth_client.delete(f'/api/tasks/{task_id}')
+        
+        assert_indexed(statements)
+    
+    def test_background_scans_use_index(self, app, auth_client, seeded_tasks):
+        """Test les parcours par lots des rappels d'échéance et de la purge"""
+        now = datetime.utcnow()
+        for i, task in enumerate(seeded_tasks[:20]):
+            task.due_date = now + timedelta(hours=i - 10)
+        db.session.commit()
+        auth_client.delete(f'/api/tasks/{seeded_tasks[-1].id}')
+        app.config['JOBS_BATCH_SIZE'] = 3
+        with captured_task_statements() as statements:
+            HANDLERS['due_reminders']({'overdue_since': (now - timedelta(days=1)).isoformat()})
+            HANDLERS['purge_tombstones']({})
+        
+        assert_indexed(statements)
+    
+    def test_archive_queries_use_index(self, auth_client, api_user, seeded_tasks):
+        """Test l'archivage par lots, la lecture des tâches archivées et include_archived"""
+        # Propriétaires des autres tâches du jeu (révision incrémentée à l'archivage)
+        owners = {user_id for (user_id,) in db.session.query(Task.user_id).distinct()}
+        db.session.add_all(User(id=user_id, username=f'owner{user_id}', email=f'owner{user_id}@example.com',
+                                password_hash='x') for user_id in owners - {api_user.id})
+        db.session.commit()
+        with captured_task_statements() as statements:
+            archive_completed(datetime(2030, 1, 1), batch_size=10)
+            page = auth_client.get('/api/tasks/archive?limit=5').get_json()
+            auth_client.get(f"/api/tasks/archive?limit=5&cursor={page['next_cursor']}")
+            auth_client.get(f"/api/tasks/archive/{page['tasks'][0]['id']}")
+            page = auth_client.get('/api/tasks?include_archived=1&limit=10').get_json()
+            auth_client.get(f"/api/tasks?include_archived=1&limit=10&cursor={page['next_cursor']}")
+        
+        assert_indexed(statements)
@@ -0,0 +1,96 @@
+import os
+import pytest
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import inspect
+from app import create_app, db
+from app.schema import MIGRATIONS_DIR, SchemaOutOfDate, migration_heads
+from config import TestingConfig
+
+def make_app(tmp_path, mode='skip'):
+    """Application sur un fichier SQLite temporaire vierge"""
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'schema.db'}"
+        SCHEMA_ON_STARTUP = mode
+    return create_app(FileConfig)
+
+def table_names(app):
+    with app.app_context():
+        names = set(inspect(db.engine).get_table_names())
+        db.engine.dispose()
+    return names
+
+class TestStartupSchema:
+    """Tests pour le travail de schéma au démarrage"""
+
+    def test_skip_does_not_touch_database(self, tmp_path):
+        """Test qu'aucune table n'est créée par défaut"""
+        app = make_app(tmp_path)
+        assert table_names(app) == set()
+
+    def test_create_mode(self, tmp_path):
+        """Test que le mode 'create' crée les tables"""
+        app = make_app(tmp_path, 'create')
+        assert {'users', 'tasks', 'task_stats'} <= table_names(app)
+
+    def test_invalid_mode(self, tmp_path):
+        """Test le refus d'un mode inconnu"""
+        with pytest.raises(ValueError):
+            make_app(tmp_path, 'auto')
+
+    def test_startup_breakdown(self, app):
+        """Test la durée des étapes conservée après create_app"""
+        startup = app.extensions['startup']
+        assert set(startup['phases_ms']) == {'config', 'database', 'extensions', 'blueprints', 'schema'}
+        assert startup['total_ms'] >= sum(startup['phases_ms'].values()) - 0.1
+
+    def test_init_schema_command(self, tmp_path):
+        """Test `flask db init-schema` puis `flask db check`"""
+        app = make_app(tmp_path)
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(args=['db', 'check'])
+        assert result.exit_code != 0
+
+        result = runner.invoke(args=['db', 'init-schema'])
+        assert result.exit_code == 0, result.output
+        assert {'users', 'tasks', 'tasks_fts', 'alembic_version'} <= table_names(app)
+
+        result = runner.invoke(args=['db', 'check'])
+        assert result.exit_code == 0, result.output
+        with app.app_context():
+            version = db.session.execute(db.text('SELECT version_num FROM alembic_version')).scalars().all()
+            db.session.remove()
+            db.engine.dispose()
+        assert set(version) == migration_heads()
+
+    def test_check_mode_refuses_outdated_database(self, tmp_path):
+        """Test que le mode 'check' empêche le démarrage sur une base non migrée"""
+        with pytest.raises(SchemaOutOfDate):
+            make_app(tmp_path, 'check')
+
+        result = make_app(tmp_path).test_cli_runner().invoke(args=['db', 'init-schema'])
+        assert result.exit_code == 0, result.output
+        make_app(tmp_path, 'check')
+
+    def test_upgrade_command(self, tmp_path):
+        """Test `flask db upgrade` sur une base vierge puis sur une base en retard"""
+        app = make_app(tmp_path)
+        runner = app.test_cli_runner()
+        result = runner.invoke(args=['db', 'upgrade'])
+        assert result.exit_code == 0, result.output
+        assert {'users', 'tasks', 'archived_tasks', 'alembic_version'} <= table_names(app)
+
+        # Retour à la révision précédant l'archivage
+        alembic_config = AlembicConfig(os.path.join(MIGRATIONS_DIR, 'alembic.ini'))
+        with app.app_context(), db.engine.begin() as connection:
+            alembic_config.attributes['connection'] = connection
+            command.downgrade(alembic_config, 'd81f5b3c7a26')
+        assert 'archived_tasks' not in table_names(app)
+        with pytest.raises(SchemaOutOfDate):
+            make_app(tmp_path, 'check')
+
+        result = runner.invoke(args=['db', 'upgrade'])
+        assert result.exit_code == 0, result.output
+        assert 'archived_tasks' in table_names(app)
+        make_app(tmp_path, 'check')
@@ -0,0 +1,54 @@
+import pytest
+from app.models import Task, User, db
+from app.search import fts_query
+
+def search(client, q, **params):
+    return client.get('/api/tasks/search', query_string=dict(q=q, **params))
+
+class TestSearch:
+    """Tests pour la recherche plein texte"""
+    
+    def test_ranked_prefix_search(self, auth_client, api_user):
+        """Test la recherche par préfixe et le classement titre > description"""
+        auth_client.post('/api/tasks', json={'title': 'Courses', 'description': 'Acheter du lait pour la réunion'})
+        auth_client.post('/api/tasks', json={'title': 'Préparer la réunion', 'description': 'Slides'})
+        auth_client.post('/api/tasks', json={'title': 'Sport'})
+        
+        titles = [task['title'] for task in search(auth_client, 'réun').get_json()]
+        assert titles == ['Préparer la réunion', 'Courses']
+        
+        # Accents ignorés
+        assert [t['title'] for t in search(auth_client, 'preparer').get_json()] == ['Préparer la réunion']
+    
+    def test_index_follows_writes(self, auth_client, api_user):
+        """Test que modifications, suppressions et lots mettent l'index à jour"""
+        task_id = auth_client.post('/api/tasks', json={'title': 'Ancien titre'}).get_json()['id']
+        auth_client.put(f'/api/tasks/{task_id}', json={'title': 'Nouveau titre'})
+        assert search(auth_client, 'ancien').get_json() == []
+        assert len(search(auth_client, 'nouveau').get_json()) == 1
+        
+        auth_client.post('/api/tasks/batch', json={'operations': [
+            {'op': 'create', 'data': {'title': 'Facture fournisseur'}},
+            {'op': 'delete', 'id': task_id},
+        ]})
+        assert search(auth_client, 'nouveau').get_json() == []
+        assert len(search(auth_client, 'factu').get_json()) == 1
+    
+    def test_scoped_to_user(self, auth_client, api_user):
+        """Test que les tâches des autres utilisateurs sont exclues"""
+        other = User(username='other', email='other@example.com', password_hash='x')
+        db.session.add(other)
+        db.session.commit()
+        db.session.add(Task(title='Secret budget', user_id=other.id))
+        db.session.commit()
+        
+        auth_client.post('/api/tasks', json={'title': 'Budget public'})
+        assert [t['title'] for t in search(auth_client, 'budget').get_json()] == ['Budget public']
+    
+    def test_query_sanitizing(self, auth_client, api_user):
+        """Test que la syntaxe FTS5 saisie ne provoque pas d'erreur"""
+        assert fts_query('foo" OR bar*') == '"foo"* "OR"* "bar"*'
+        auth_client.post('/api/tasks', json={'title': 'foo bar'})
+        assert search(auth_client, 'foo" NEAR(').status_code == 200
+        assert search(auth_client, '***').get_json() == []
+        assert search(auth_client, '').status_code == 400
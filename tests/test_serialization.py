@@ -0,0 +1,71 @@
+from datetime import datetime
+import pytest
+from app.models import db, Task, TaskStatus
+from app.serialization import TASK_COLUMNS, row_to_dict, make_encoder, StdlibEncoder, orjson
+
+TRICKY_TEXTS = [
+    'Réunion budget — équipe',
+    'Emoji 😀 et 中文',
+    'Guillemets "doubles" \\ barre / oblique',
+    'Contrôle \x00\x01\x1f\x7f\t\n\r\b\f',
+    'Séparateurs \u2028\u2029',
+    '',
+]
+
+ENCODERS = ['json'] + (['orjson'] if orjson is not None else [])
+
+@pytest.fixture
+def tricky_tasks(api_user):
+    """Tâches aux textes difficiles à encoder, avec et sans échéance"""
+    for i, text in enumerate(TRICKY_TEXTS):
+        db.session.add(Task(
+            title=text or 'Sans description',
+            description=text or None,
+            status=list(TaskStatus)[i % 3],
+            priority=i % 5 + 1,
+            due_date=datetime(2024, 5, i + 1, 12, 30, 15, 250) if i % 2 else None,
+            user_id=api_user.id
+        ))
+    db.session.commit()
+    return Task.query.order_by(Task.id).all()
+
+class TestSerialization:
+    """Tests pour le chemin de sérialisation rapide des listes de tâches"""
+
+    @pytest.mark.parametrize('name', ENCODERS)
+    def test_encoder_matches_jsonify(self, app, tricky_tasks, name):
+        """Test l'égalité octet pour octet avec jsonify(to_dict)"""
+        expected = app.json.response([task.to_dict() for task in tricky_tasks]).get_data()
+        rows = db.session.query(*TASK_COLUMNS).order_by(Task.id).all()
+        encoded = make_encoder(name).dumps([row_to_dict(row) for row in rows]) + b'\n'
+        assert encoded == expected
+
+    @pytest.mark.parametrize('name', ENCODERS)
+    def test_get_tasks_matches_legacy_output(self, app, auth_client, tricky_tasks, name):
+        """Test que /api/tasks renvoie exactement l'ancienne sérialisation"""
+        app.extensions['json_encoder'] = make_encoder(name)
+        ordered = sorted(tricky_tasks, key=lambda t: (t.priority, t.created_at, t.id), reverse=True)
+
+        response = auth_client.get('/api/tasks')
+        assert response.mimetype == 'application/json'
+        assert response.get_data() == app.json.response([task.to_dict() for task in ordered]).get_data()
+
+        page = auth_client.get('/api/tasks?limit=2').get_json()
+        assert page['tasks'] == [task.to_dict() for task in ordered[:2]]
+        assert page['next_cursor']
+
+    def test_debug_falls_back_to_flask_provider(self, app, auth_client, tricky_tasks):
+        """Test la sortie indentée de jsonify en mode debug"""
+        app.debug = True
+        try:
+            response = auth_client.get('/api/tasks')
+        finally:
+            app.debug = False
+        assert b'\n  {' in response.get_data()
+
+    def test_make_encoder(self):
+        """Test le choix de l'encodeur"""
+        assert isinstance(make_encoder('json'), StdlibEncoder)
+        assert make_encoder('auto').name == ('orjson' if orjson is not None else 'json')
+        with pytest.raises(ValueError):
+            make_encoder('ujson')
@@ -0,0 +1,45 @@
+import pytest
+from app import create_app, db
+from config import TestingConfig
+
+def make_app(tmp_path, enabled):
+    """Application sur un fichier SQLite temporaire"""
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'tuning.db'}"
+        SQLITE_TUNING_ENABLED = enabled
+        SQLITE_BUSY_TIMEOUT = 1234
+    return create_app(FileConfig)
+
+def pragma(name):
+    return db.session.execute(db.text(f'PRAGMA {name}')).scalar()
+
+class TestSQLiteTuning:
+    """Tests pour le profil de performance SQLite"""
+    
+    def test_pragmas_applied_when_enabled(self, tmp_path):
+        """Test que les PRAGMA sont appliqués à chaque connexion"""
+        app = make_app(tmp_path, enabled=True)
+        with app.app_context():
+            assert pragma('journal_mode') == 'wal'
+            assert pragma('busy_timeout') == 1234
+            assert pragma('synchronous') == 1  # NORMAL
+            assert pragma('cache_size') == app.config['SQLITE_CACHE_SIZE']
+            db.session.remove()
+            db.engine.dispose()
+    
+    def test_default_journal_when_disabled(self, tmp_path):
+        """Test que le profil est inactif sans configuration explicite"""
+        app = make_app(tmp_path, enabled=False)
+        with app.app_context():
+            assert pragma('journal_mode') == 'delete'
+            db.session.remove()
+            db.engine.dispose()
+    
+    def test_in_memory_database(self):
+        """Test que le profil tolère une base en mémoire"""
+        class MemoryConfig(TestingConfig):
+            SQLITE_TUNING_ENABLED = True
+        app = create_app(MemoryConfig)
+        with app.app_context():
+            assert pragma('journal_mode') == 'memory'
+            assert pragma('busy_timeout') == MemoryConfig.SQLITE_BUSY_TIMEOUT
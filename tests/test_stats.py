@@ -0,0 +1,54 @@
+import pytest
+from datetime import datetime, timedelta
+from app.models import Task, TaskStat, TaskStatus, db
+from app.stats import compare_stats
+
+class TestTaskStats:
+    """Tests pour /api/tasks/stats et les compteurs associés"""
+    
+    def test_counters_follow_every_write_path(self, auth_client, api_user):
+        """Test création, modification, suppression, lot et import"""
+        first = auth_client.post('/api/tasks', json={'title': 'A', 'priority': 2}).get_json()
+        second = auth_client.post('/api/tasks', json={'title': 'B', 'priority': 5}).get_json()
+        auth_client.put(f"/api/tasks/{first['id']}", json={'status': 'completed', 'priority': 3})
+        auth_client.delete(f"/api/tasks/{second['id']}")
+        auth_client.post('/api/tasks/batch', json={'operations': [
+            {'op': 'create', 'data': {'title': 'C', 'priority': 1}},
+            {'op': 'update', 'id': first['id'], 'data': {'status': 'in_progress'}},
+        ]})
+        auth_client.post('/api/tasks/import?format=ndjson', data=b'{"title": "D", "priority": 1}\n')
+        
+        stats = auth_client.get('/api/tasks/stats').get_json()
+        assert stats['total'] == 3
+        assert stats['by_status'] == {'pending': 2, 'in_progress': 1, 'completed': 0}
+        assert stats['by_priority'] == {'1': 2, '3': 1}
+        assert compare_stats() == {}
+    
+    def test_overdue(self, auth_client, api_user):
+        """Test le décompte des tâches en retard non terminées"""
+        past = (datetime.utcnow() - timedelta(days=2)).isoformat()
+        future = (datetime.utcnow() + timedelta(days=2)).isoformat()
+        auth_client.post('/api/tasks', json={'title': 'Late', 'due_date': past})
+        done = auth_client.post('/api/tasks', json={'title': 'Late but done', 'due_date': past}).get_json()
+        auth_client.put(f"/api/tasks/{done['id']}", json={'status': 'completed'})
+        auth_client.post('/api/tasks', json={'title': 'Later', 'due_date': future})
+        
+        assert auth_client.get('/api/tasks/stats').get_json()['overdue'] == 1
+    
+    def test_rebuild_command(self, runner, api_user):
+        """Test la vérification et la reconstruction des compteurs"""
+        db.session.add_all([Task(title=f'T{i}', priority=2, user_id=api_user.id) for i in range(3)])
+        db.session.commit()
+        
+        # Corrompre un compteur
+        TaskStat.query.filter_by(user_id=api_user.id).update({'count': 42})
+        db.session.commit()
+        
+        result = runner.invoke(args=['tasks', 'rebuild-stats', '--check'])
+        assert result.exit_code != 0
+        assert '42 stocké(s), 3 réel(s)' in result.output
+        
+        result = runner.invoke(args=['tasks', 'rebuild-stats'])
+        assert result.exit_code == 0
+        assert '1 corrigé(s)' in result.output
+        assert runner.invoke(args=['tasks', 'rebuild-stats', '--check']).exit_code == 0
@@ -0,0 +1,59 @@
+import pytest
+from app.models import Task, TaskTombstone, db
+
+def changes(client, token):
+    return client.get(f'/api/tasks/changes?since={token}')
+
+class TestDeltaSync:
+    """Tests pour /api/tasks/changes"""
+    
+    def test_changes_since_token(self, auth_client, api_user):
+        """Test créations, modifications et suppressions depuis un jeton"""
+        keep = auth_client.post('/api/tasks', json={'title': 'Keep'}).get_json()
+        gone = auth_client.post('/api/tasks', json={'title': 'Gone'}).get_json()
+        
+        token = auth_client.get('/api/tasks?limit=10').get_json()['sync_token']
+        
+        auth_client.put(f"/api/tasks/{keep['id']}", json={'status': 'completed'})
+        new = auth_client.post('/api/tasks', json={'title': 'New'}).get_json()
+        auth_client.delete(f"/api/tasks/{gone['id']}")
+        
+        data = changes(auth_client, token).get_json()
+        assert sorted(t['id'] for t in data['changed']) == sorted([keep['id'], new['id']])
+        assert data['deleted'] == [gone['id']]
+        assert int(data['token']) > int(token)
+        
+        # Plus rien à synchroniser avec le nouveau jeton
+        data = changes(auth_client, data['token']).get_json()
+        assert data == {'changed': [], 'deleted': [], 'token': data['token']}
+    
+    def test_batch_writes_are_tracked(self, auth_client, api_user):
+        """Test que les écritures par lot alimentent la synchronisation"""
+        task_id = auth_client.post('/api/tasks', json={'title': 'Batch target'}).get_json()['id']
+        token = changes(auth_client, 0).get_json()['token']
+        
+        auth_client.post('/api/tasks/batch', json={'operations': [
+            {'op': 'create', 'data': {'title': 'From batch'}},
+            {'op': 'delete', 'id': task_id},
+        ]})
+        
+        data = changes(auth_client, token).get_json()
+        assert [t['title'] for t in data['changed']] == ['From batch']
+        assert data['deleted'] == [task_id]
+        assert TaskTombstone.query.filter_by(task_id=task_id).count() == 1
+    
+    def test_invalid_and_future_tokens(self, auth_client, api_user):
+        """Test les jetons invalides"""
+        assert changes(auth_client, 'abc').status_code == 400
+        assert changes(auth_client, -1).status_code == 400
+        assert changes(auth_client, 10**6).status_code == 400
+    
+    def test_too_many_changes_requests_resync(self, app, auth_client, api_user):
+        """Test qu'un retard trop important demande un rechargement complet"""
+        app.config['TASKS_SYNC_MAX_CHANGES'] = 3
+        operations = [{'op': 'create', 'data': {'title': f'T{i}'}} for i in range(5)]
+        auth_client.post('/api/tasks/batch', json={'operations': operations})
+        
+        data = changes(auth_client, 0).get_json()
+        assert data['resync'] is True
+        assert data['token'] == '1'
@@ -0,0 +1,80 @@
+import pytest
+from flask import g
+from sqlalchemy import event
+from app.models import User, db
+from app.user_cache import UserCache
+
+def count_user_selects(app, client, url):
+    """Exécute une requête et renvoie les chargements complets d'utilisateur"""
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return response, [s for s in statements if 'users.username' in s]
+
+class TestUserCache:
+    """Tests pour le cache du user_loader"""
+    
+    def test_second_request_skips_user_select(self, app, auth_client):
+        """Test qu'une requête authentifiée répétée ne relit pas l'utilisateur"""
+        cache = app.extensions['user_cache']
+        
+        # Vider la session pour que le premier chargement passe par la base
+        db.session.expunge_all()
+        response, selects = count_user_selects(app, auth_client, '/api/tasks')
+        assert response.status_code == 200
+        assert len(selects) == 1
+        
+        # Le contexte d'application des tests est partagé : oublier l'utilisateur
+        # mémorisé par Flask-Login comme le ferait une nouvelle requête
+        db.session.expunge_all()
+        g.pop('_login_user', None)
+        response, selects = count_user_selects(app, auth_client, '/api/tasks')
+        assert response.status_code == 200
+        assert selects == []
+        assert cache.stats()['hits'] >= 1
+    
+    def test_cached_user_is_usable(self, app, auth_client, api_user):
+        """Test qu'un utilisateur servi par le cache fonctionne dans les vues"""
+        user_id = api_user.id
+        auth_client.get('/api/tasks')
+        db.session.expunge_all()
+        g.pop('_login_user', None)
+        response = auth_client.post('/api/tasks', json={'title': 'From cache'})
+        assert response.status_code == 201
+        assert response.get_json()['user_id'] == user_id
+        assert app.extensions['user_cache'].stats()['hits'] == 1
+        
+        response = auth_client.get('/tasks')
+        assert b'apiuser' in response.data
+    
+    def test_update_invalidates_entry(self, app, auth_client, api_user):
+        """Test qu'une désactivation est visible immédiatement"""
+        cache = app.extensions['user_cache']
+        auth_client.get('/api/tasks')
+        assert cache.stats()['size'] == 1
+        
+        api_user.is_active = False
+        db.session.commit()
+        
+        assert cache.stats()['size'] == 0
+        assert cache.stats()['invalidations'] >= 1
+    
+    def test_ttl_and_lru(self):
+        """Test l'expiration et l'éviction du cache"""
+        cache = UserCache(maxsize=2, ttl=60)
+        cache.put(1, {'id': 1})
+        cache.put(2, {'id': 2})
+        cache.get(1)
+        cache.put(3, {'id': 3})
+        assert cache.get(2) is None
+        assert cache.get(1) == {'id': 1}
+        assert cache.stats()['evictions'] == 1
+        
+        expired = UserCache(ttl=0)
+        expired.put(1, {'id': 1})
+        assert expired.get(1) is None
+        assert expired.stats()['misses'] == 1